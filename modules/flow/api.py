@@ -1,8 +1,11 @@
 from homer.api.core import HomerAPI, register_api
 from homer.utils.logger import get_module_logger
 
-from modules.flow.routes import shots, playlists, versions, tasks, actions, connection, schema, crud, files, activity, tools
+from modules.flow.routes import shots, playlists, versions, tasks, actions, connection, schema, crud, files, activity, tools, cache
 from modules.flow.routes.connection import get_server_info 
+from modules.flow.client import close_sg_pool
+from modules.flow.schema_cache import warm_schema_cache
+from modules.flow.entity_cache import start_entity_cache, stop_entity_cache
 from fastapi import HTTPException
 
 log = get_module_logger("flow-api")
@@ -36,3 +39,9 @@ class FlowAPI(HomerAPI):
         self.router.include_router(files.router, prefix="/files")
         self.router.include_router(activity.router, prefix="/activity")
         self.router.include_router(tools.router, prefix="/tools")
+        self.router.include_router(cache.router, prefix="/cache")
+
+        self.router.add_event_handler("startup", warm_schema_cache)
+        self.router.add_event_handler("startup", start_entity_cache)
+        self.router.add_event_handler("shutdown", stop_entity_cache)
+        self.router.add_event_handler("shutdown", close_sg_pool)
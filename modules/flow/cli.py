@@ -10,6 +10,7 @@ from modules.flow.logic import connection as conn_logic  # 🔗 Used for ping
 # 🌐 CLI groups
 from modules.flow.cli_functions.actions import actions_cmd
 from modules.flow.cli_functions.activity import activity_cmd
+from modules.flow.cli_functions.cache import cache_cmd
 from modules.flow.cli_functions.connection import connection_cmd
 from modules.flow.cli_functions.crud import crud_cmd
 from modules.flow.cli_functions.files import files_cmd
@@ -33,6 +34,7 @@ def cli():
 # 🔌 Register all subcommands
 cli.add_command(actions_cmd)
 cli.add_command(activity_cmd)
+cli.add_command(cache_cmd)
 cli.add_command(connection_cmd)
 cli.add_command(crud_cmd)
 cli.add_command(files_cmd)
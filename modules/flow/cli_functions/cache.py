@@ -0,0 +1,51 @@
+
+
+import click
+import json
+
+from homer.utils.logger import get_module_logger
+from modules.flow.entity_cache import get_entity_cache
+
+log = get_module_logger("flow.cache.cli")
+
+
+def _cache():
+    cache = get_entity_cache()
+    if cache is None:
+        raise click.ClickException("Entity cache is disabled (set SG_ENTITY_CACHE_DB)")
+    return cache
+
+
+@click.group(
+    name="cache",
+    help="🗄️ Local entity cache fed by EventLogEntry polling."
+)
+def cache_cmd():
+    pass
+
+
+@cache_cmd.command("status", help="Show cache freshness and row counts.")
+def cache_status():
+    click.echo(json.dumps(_cache().stats(), indent=2))
+
+
+@cache_cmd.command("sync", help="Load the cache if needed and apply pending events.")
+@click.option("--full", is_flag=True, help="Reload every entity type from scratch.")
+def cache_sync(full):
+    cache = _cache()
+    if full:
+        cache.resync()
+    cache.sync()
+    click.echo(json.dumps(cache.stats(), indent=2))
+
+
+@cache_cmd.command("run", help="Run the event-polling daemon in the foreground.")
+def cache_run():
+    cache = _cache()
+    click.echo(f"🗄️ Polling ShotGrid events every {cache.poll_interval}s (Ctrl+C to stop)")
+    cache.start()
+    try:
+        while cache._thread.is_alive():
+            cache._thread.join(1.0)
+    except KeyboardInterrupt:
+        cache.stop()
@@ -31,10 +31,16 @@ def create_entity(entity_type, data):
 @click.option("--fields", default='["id", "type"]', help="JSON list of fields to return.")
 @click.option("--order", default=None, help="Optional JSON list of ordering rules.")
 @click.option("--limit", default=0, type=int, help="Limit the number of results.")
-def find_entities(entity_type, filters, fields, order, limit):
+@click.option("--ndjson", is_flag=True, help="Print one entity per line as pages arrive.")
+def find_entities(entity_type, filters, fields, order, limit, ndjson):
     filters_list = json.loads(filters)
     fields_list = json.loads(fields)
     order_list = json.loads(order) if order else None
+    if ndjson:
+        for page in crud_logic.iter_entity_pages(entity_type, filters_list, fields_list, order_list, limit):
+            for entity in page:
+                click.echo(json.dumps(entity, default=str))
+        return
     results = crud_logic.find_entities(entity_type, filters_list, fields_list, order_list, limit)
     click.echo(json.dumps(results, indent=2))
 
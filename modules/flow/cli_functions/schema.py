@@ -36,3 +36,15 @@ def list_entity_fields(entity):
     except Exception as e:
         log.exception(f"❌ Failed to list fields for {entity}")
         click.echo(f"❌ Error: {e}")
+
+@schema_cmd.command("refresh", help="Re-read the schema from ShotGrid and update the local cache.")
+def refresh_schema():
+    try:
+        changes = schema_logic.refresh_schema()
+        click.echo("📘 Schema refreshed")
+        for kind in ("added", "removed", "changed"):
+            if changes[kind]:
+                click.echo(f"  {kind}: {', '.join(changes[kind])}")
+    except Exception as e:
+        log.exception("❌ Failed to refresh schema")
+        click.echo(f"❌ Error: {e}")
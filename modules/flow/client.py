@@ -1,15 +1,306 @@
-
-
 import os
-from shotgun_api3 import Shotgun
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from shotgun_api3 import AuthenticationFault, ProtocolError, Shotgun
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow-client")
 
+DEFAULT_POOL_SIZE = 8
+DEFAULT_POOL_TIMEOUT = 30.0        # seconds a request waits for a free connection
+DEFAULT_HEALTH_INTERVAL = 300.0    # idle seconds after which a connection is checked before reuse
+
 _client: Shotgun | None = None
+_pool: Optional["SGConnectionPool"] = None
+_pool_lock = threading.Lock()
+
+
+class PoolTimeout(TimeoutError):
+    """No pooled ShotGrid connection became free in time."""
+
+
+class _Pooled:
+    __slots__ = ("sg", "generation", "last_used")
+
+    def __init__(self, sg: Shotgun, generation: int):
+        self.sg = sg
+        self.generation = generation
+        self.last_used = time.monotonic()
+
+
+class SGConnectionPool:
+    """
+    Bounded pool of `Shotgun` connections. A `Shotgun` instance is not
+    thread-safe, so each request checks one out, uses it alone and returns it.
+
+    Only the first connection pays for the server-capabilities round-trip, and
+    the rest share its result. With `use_session_token`, one script login yields a
+    session token that every later connection reuses. If that token is
+    rejected, every connection holding it is replaced on its next checkout.
+    """
+
+    def __init__(
+        self,
+        site: str,
+        script_name: str,
+        api_key: str,
+        size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_POOL_TIMEOUT,
+        health_interval: float = DEFAULT_HEALTH_INTERVAL,
+        use_session_token: bool = True,
+    ):
+        self.site = site
+        self._script_name = script_name
+        self._api_key = api_key
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self.use_session_token = use_session_token
+
+        self._cond = threading.Condition()
+        self._auth_lock = threading.Lock()
+        self._idle: List[_Pooled] = []             # LIFO: the warmest connection goes out first
+        self._in_use: Dict[int, _Pooled] = {}
+        self._total = 0
+        self._server_caps: Any = None
+        self._session_token: Optional[str] = None
+        self._generation = 0
+
+        self.created = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.timeouts = 0
+        self.health_checks = 0
+        self.discarded = 0
+        self.token_refreshes = 0
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔌 Connections
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _connect(self) -> _Pooled:
+        with self._auth_lock:
+            generation = self._generation
+            bootstrap = self._server_caps is None or (self.use_session_token and self._session_token is None)
+            if bootstrap or not self.use_session_token:
+                sg = Shotgun(self.site, self._script_name, self._api_key, connect=False)
+            else:
+                sg = Shotgun(self.site, session_token=self._session_token, connect=False)
+            if self._server_caps is None:
+                self._server_caps = sg.server_caps  # the only info() round-trip the pool makes
+            else:
+                sg._server_caps = self._server_caps
+            if bootstrap and self.use_session_token:
+                self._session_token = sg.get_session_token()
+        self.created += 1
+        log.debug(f"🔗 Opened pooled ShotGrid connection #{self.created}")
+        return _Pooled(sg, generation)
+
+    def _close(self, item: _Pooled):
+        self.discarded += 1
+        try:
+            item.sg.close()
+        except Exception:
+            pass
+
+    def _healthy(self, item: _Pooled) -> bool:
+        if item.generation != self._generation:
+            return False  # holds a session token that has been rejected
+        if time.monotonic() - item.last_used < self.health_interval:
+            return True
+        self.health_checks += 1
+        try:
+            item.sg.info()
+            return True
+        except Exception as e:
+            log.warning(f"⚠️ Pooled ShotGrid connection failed its health check: {e}")
+            return False
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔄 Checkout / checkin
+    # ──────────────────────────────────────────────────────────────────────
+
+    def acquire(self, timeout: Optional[float] = None) -> Shotgun:
+        """Check out a connection, opening one if the pool isn't full; waits up to `timeout`."""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        waited = False
+        while True:
+            with self._cond:
+                while not self._idle and self._total >= self.size:
+                    remaining = started + timeout - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(f"No ShotGrid connection free after {timeout}s (pool size {self.size})")
+                    waited = True
+                    self._cond.wait(remaining)
+                item = self._idle.pop() if self._idle else None
+                if item is None:
+                    self._total += 1
+
+            if item is None:
+                try:
+                    item = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._healthy(item):
+                self._close(item)
+                with self._cond:
+                    self._total -= 1
+                continue
+
+            with self._cond:
+                self._in_use[id(item.sg)] = item
+                self.checkouts += 1
+                if waited:
+                    wait_ms = (time.monotonic() - started) * 1000
+                    self.waits += 1
+                    self.wait_ms_total += wait_ms
+                    self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            return item.sg
+
+    def release(self, sg: Shotgun, discard: bool = False):
+        """Return a connection; `discard=True` closes it instead (e.g. after a transport error)."""
+        with self._cond:
+            item = self._in_use.pop(id(sg), None)
+            if item is None:
+                return
+            if discard or item.generation != self._generation:
+                self._total -= 1
+            else:
+                item.last_used = time.monotonic()
+                self._idle.append(item)
+            self._cond.notify()
+        if discard or item.generation != self._generation:
+            self._close(item)
+
+    def _invalidate_token(self, generation: int):
+        with self._auth_lock:
+            # Only the token the failing connection used; a later fault from an older
+            # connection must not throw away the freshly bootstrapped one
+            if generation == self._generation and self._session_token is not None:
+                self._session_token = None
+                self._generation += 1
+                self.token_refreshes += 1
+                log.info("🔑 ShotGrid session token rejected; pooled connections will re-authenticate")
+
+    def _uses_token(self, sg: Shotgun) -> bool:
+        # Only a fault on a call made with the shared token says the token is bad
+        config = sg.config
+        return self.use_session_token and bool(config.session_token) and not (config.script_name or config.user_login)
+
+    def user_client(self, login: str, password: str, auth_token: Optional[str] = None) -> Shotgun:
+        """
+        A fresh, unpooled connection that authenticates as a HumanUser. Bad
+        credentials then fail on that connection alone and never touch the pool.
+        """
+        sg = Shotgun(self.site, login=login, password=password, auth_token=auth_token, connect=False)
+        if self._server_caps is not None:
+            sg._server_caps = self._server_caps
+        return sg
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Shotgun]:
+        """`with pool.connection() as sg:` — exclusive use of one connection for the block."""
+        sg = self.acquire(timeout)
+        with self._cond:
+            generation = self._in_use[id(sg)].generation
+        discard = False
+        try:
+            yield sg
+        except AuthenticationFault:
+            discard = True
+            if self._uses_token(sg):
+                self._invalidate_token(generation)
+            raise
+        except (ProtocolError, OSError):
+            discard = True
+            raise
+        finally:
+            self.release(sg, discard=discard)
+
+    def get_session_token(self) -> Optional[str]:
+        return self._session_token
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+        for item in idle:
+            self._close(item)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            idle, in_use = len(self._idle), len(self._in_use)
+        return {
+            "size": self.size,
+            "open": idle + in_use,
+            "idle": idle,
+            "in_use": in_use,
+            "created": self.created,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_ms_avg": round(self.wait_ms_total / self.waits, 2) if self.waits else 0.0,
+            "wait_ms_max": round(self.wait_ms_max, 2),
+            "timeouts": self.timeouts,
+            "health_checks": self.health_checks,
+            "discarded": self.discarded,
+            "session_token": self.use_session_token,
+            "token_refreshes": self.token_refreshes,
+        }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ♻️ Process-wide pool
+# ──────────────────────────────────────────────────────────────────────────────
+
+def get_sg_pool() -> SGConnectionPool:
+    """Return the shared connection pool, configured from SG_* environment variables."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SGConnectionPool(
+                    os.environ["SG_SITE"],
+                    os.environ["SG_SCRIPT_NAME"],
+                    os.environ["SG_API_KEY"],
+                    size=int(os.environ.get("SG_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                    timeout=float(os.environ.get("SG_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)),
+                    health_interval=float(os.environ.get("SG_POOL_HEALTH_INTERVAL", DEFAULT_HEALTH_INTERVAL)),
+                    use_session_token=os.environ.get("SG_USE_SESSION_TOKEN", "true").lower() in ("1", "true", "yes"),
+                )
+                log.info(f"✅ ShotGrid connection pool initialized (size {_pool.size})")
+    return _pool
+
+
+def sg_connection(timeout: Optional[float] = None):
+    """Check out a pooled connection: `with sg_connection() as sg: ...`."""
+    return get_sg_pool().connection(timeout)
+
+
+def close_sg_pool():
+    """Close idle pooled connections (API shutdown hook)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+        log.debug("🔌 Closed ShotGrid connection pool")
+
 
 def get_sg_client() -> Shotgun:
-    """Return a cached ShotGrid API client, initializing if needed."""
+    """
+    Return a cached, unpooled ShotGrid API client, initializing if needed.
+    It is not thread-safe; use `sg_connection()` for anything that can run concurrently.
+    """
     global _client
     if _client is None:
         try:
@@ -1,5 +1,6 @@
 
 
+from typing import Optional
 from pydantic import BaseModel, HttpUrl
 from pathlib import Path
 from homer.utils.config import register_module_env, write_env_example
@@ -12,6 +13,16 @@ class FlowEnv(BaseModel):
     SG_SITE: HttpUrl                   # e.g. https://yourstudio.shotgrid.autodesk.com
     SG_SCRIPT_NAME: str               # Your script name registered in ShotGrid
     SG_API_KEY: str                   # Your ShotGrid script API key
+    SG_POOL_SIZE: int = 8             # Max concurrent ShotGrid connections
+    SG_POOL_TIMEOUT: float = 30.0     # Seconds a request waits for a free connection
+    SG_POOL_HEALTH_INTERVAL: float = 300.0  # Idle seconds before a connection is re-checked
+    SG_USE_SESSION_TOKEN: bool = True # Share one session token across pooled connections
+    SG_PAGE_WORKERS: int = 4          # Pages fetched in parallel by paged finds
+    SG_SCHEMA_CACHE: str = ".homer_flow_schema.json"  # Persisted schema cache (JSON)
+    SG_SCHEMA_TTL: float = 3600.0     # Seconds before the cached schema is refreshed in the background
+    SG_ENTITY_CACHE_DB: Optional[str] = None  # SQLite entity cache; disabled if unset
+    SG_ENTITY_CACHE_POLL: float = 5.0 # Seconds between EventLogEntry polls
+    SG_ENTITY_CACHE_TYPES: Optional[str] = None  # JSON {"EntityType": [fields]} to override the cached set
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 🧩 Register this module's .env file and validation schema
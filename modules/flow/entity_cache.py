@@ -0,0 +1,533 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from modules.flow.client import sg_connection
+from modules.flow.logic.crud import iter_entity_pages
+from modules.flow.utils.query import find_by_ids
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("flow.entity_cache")
+
+DEFAULT_POLL_INTERVAL = 5.0
+EVENT_BATCH = 500
+BACKLOG_TIMEOUT = 300.0   # seconds a skipped event id is re-checked before it is given up
+
+# Entity types mirrored locally and the fields kept for each ("id"/"type" are implied).
+# Covers the linked fields read by tools, shots, tasks and playlists logic.
+DEFAULT_ENTITY_FIELDS: Dict[str, List[str]] = {
+    "Project": ["name"],
+    "Sequence": ["code", "project", "sg_status_list"],
+    "Shot": ["code", "project", "sg_sequence", "sg_status_list", "description"],
+    "Step": ["code", "short_name"],
+    "Task": ["content", "entity", "project", "step", "sg_status_list", "task_assignees"],
+    "Playlist": ["code", "project"],
+    "Version": ["code", "entity", "project", "sg_status_list", "user"],
+    "PlaylistVersionConnection": ["playlist", "version", "sg_sort_order"],
+}
+
+# Field ShotGrid shows as a link's "name" ("code" for most entity types)
+LINK_NAME_FIELDS: Dict[str, str] = {
+    "Project": "name",
+    "HumanUser": "name",
+    "ClientUser": "name",
+    "Group": "name",
+    "Department": "name",
+    "Task": "content",
+    "Note": "subject",
+}
+
+
+def _name_field(entity_type: str) -> str:
+    return LINK_NAME_FIELDS.get(entity_type, "code")
+
+
+class _Unsupported(Exception):
+    """The local evaluator can't answer this query; fall back to ShotGrid."""
+
+
+def _json_default(value: Any) -> Any:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _same(a: Any, b: Any) -> bool:
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.get("type") == b.get("type") and a.get("id") == b.get("id")
+    return a == b
+
+
+def _sort_key(value: Any) -> Tuple:
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("id")
+    return (value is None, str(type(value)), value if value is not None else 0)
+
+
+class EntityCache:
+    """
+    Local mirror of selected ShotGrid entity types, kept current by tailing
+    `EventLogEntry` (the classic ShotGrid event-daemon pattern).
+
+    First run: note the newest event id, bulk-load every configured type with
+    paged finds, then poll events after that id. Each poll collects the ids
+    named by `Shotgun_<Type>_New/Change/Revival/Retirement` events. It re-reads
+    those rows in batched `id in` finds and drops retired ones, so replaying
+    an event is harmless. Rows live in memory for reads and in SQLite so
+    restarts resume from the last processed event instead of reloading.
+
+    Event ids are allocated before their transactions commit, so a lower id can
+    appear after a higher one has been read. Ids skipped between events are kept
+    in a backlog and re-queried on every poll for `BACKLOG_TIMEOUT` seconds.
+    `sync()`, `resync()` and `poll()` are serialized, so an on-demand sync
+    waits for the daemon's current pass instead of racing it.
+
+    Link values carry the linked entity's display name, which a rename does not
+    refresh on the rows that point at it. Links to cached types take their
+    `name` from the cached row at read time; renames of other types (e.g.
+    HumanUser) refetch the cached rows that link to them.
+
+    `find()` answers simple queries (`is`/`is_not`/`in`/`not_in` and linked
+    paths such as `project.Project.name`) only when the last completed poll is
+    within `max_age` seconds. Anything else returns None so callers query
+    ShotGrid.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        entity_fields: Optional[Dict[str, List[str]]] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self.db_path = db_path
+        self.entity_fields = {t: sorted(set(f) - {"id", "type"}) for t, f in (entity_fields or DEFAULT_ENTITY_FIELDS).items()}
+        self.poll_interval = poll_interval
+        self.spec_hash = hashlib.sha256(json.dumps(self.entity_fields, sort_keys=True).encode()).hexdigest()
+        self._event_types = {f"Shotgun_{t}_{a}" for t in self.entity_fields for a in ("New", "Change", "Retirement", "Revival")}
+
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()   # one resync/poll at a time (daemon thread, routes, CLI)
+        self._rows: Dict[str, Dict[int, Dict[str, Any]]] = {t: {} for t in self.entity_fields}
+        self.last_event_id = 0
+        self.backlog: Dict[int, float] = {}   # skipped event id -> wall time first missed
+        self.synced_at = 0.0   # wall-clock start of the last poll that caught up
+        self.ready = False
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.polls = 0
+        self.events_applied = 0
+        self.errors = 0
+        self.hits = 0
+        self.fallbacks = 0
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS entities (type TEXT, id INTEGER, data TEXT, PRIMARY KEY (type, id))")
+        self._db.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+        self._load()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 💾 SQLite persistence
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _state(self) -> Dict[str, str]:
+        return dict(self._db.execute("SELECT key, value FROM state"))
+
+    def _load(self):
+        state = self._state()
+        if state.get("spec") != self.spec_hash or "last_event_id" not in state:
+            return  # entity types/fields changed: the next sync reloads everything
+        for entity_type, entity_id, data in self._db.execute("SELECT type, id, data FROM entities"):
+            if entity_type in self._rows:
+                self._rows[entity_type][entity_id] = json.loads(data)
+        self.last_event_id = int(state["last_event_id"])
+        self.synced_at = float(state.get("synced_at") or 0)
+        self.backlog = {int(k): v for k, v in json.loads(state.get("backlog") or "{}").items()}
+        self.ready = True
+        log.debug(f"🗄️ Loaded {sum(len(r) for r in self._rows.values())} cached entities (event {self.last_event_id})")
+
+    def _persist(self, upserts: Iterable[Dict[str, Any]], deletes: Iterable[Tuple[str, int]], replace: bool = False):
+        with self._lock:
+            if replace:
+                self._db.execute("DELETE FROM entities")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entities (type, id, data) VALUES (?, ?, ?)",
+                [(row["type"], row["id"], json.dumps(row, default=_json_default)) for row in upserts],
+            )
+            self._db.executemany("DELETE FROM entities WHERE type = ? AND id = ?", list(deletes))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                [
+                    ("last_event_id", str(self.last_event_id)),
+                    ("synced_at", str(self.synced_at)),
+                    ("backlog", json.dumps(self.backlog)),
+                    ("spec", self.spec_hash),
+                ],
+            )
+            self._db.commit()
+
+    def _normalize(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        # Store exactly what a JSON round-trip gives back, so reads match after a restart
+        return json.loads(json.dumps(row, default=_json_default))
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔄 Sync
+    # ──────────────────────────────────────────────────────────────────────
+
+    def resync(self):
+        """Reload every configured type from scratch and resume events from now."""
+        with self._sync_lock:
+            self._resync()
+
+    def _resync(self):
+        started = time.time()
+        with sg_connection() as sg:
+            latest = sg.find_one("EventLogEntry", [], ["id"], order=[{"field_name": "id", "direction": "desc"}])
+        start_id = latest["id"] if latest else 0
+
+        rows: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        for entity_type, fields in self.entity_fields.items():
+            rows[entity_type] = {
+                e["id"]: self._normalize(e)
+                for page in iter_entity_pages(entity_type, [], ["id", "type"] + fields)
+                for e in page
+            }
+            log.debug(f"🗄️ Loaded {len(rows[entity_type])} {entity_type} rows")
+
+        with self._lock:
+            self._rows = rows
+            self.last_event_id = start_id
+            self.backlog = {}
+            self.synced_at = started
+            self.ready = True
+            self._persist([r for by_id in rows.values() for r in by_id.values()], [], replace=True)
+        log.info(f"✅ Entity cache loaded {sum(len(r) for r in rows.values())} entities (event {start_id})")
+
+    def _refetch(self, entity_type: str, ids: Set[int]) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int]]]:
+        fields = ["id", "type"] + self.entity_fields[entity_type]
+        found = {e["id"]: self._normalize(e) for e in find_by_ids(entity_type, sorted(ids), fields)}
+        missing = [(entity_type, i) for i in ids if i not in found]
+        return list(found.values()), missing
+
+    def _fetch_events(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[int, float]]:
+        # Every event type is read so that a missing id is a real gap, not a filtered-out event
+        fields = ["id", "event_type", "attribute_name", "entity", "meta"]
+        with sg_connection() as sg:
+            events = sg.find(
+                "EventLogEntry",
+                [["id", ">", self.last_event_id]],
+                fields,
+                order=[{"field_name": "id", "direction": "asc"}],
+                limit=EVENT_BATCH,
+            )
+        now = time.time()
+        backlog = {i: seen for i, seen in self.backlog.items() if now - seen < BACKLOG_TIMEOUT}
+        if len(backlog) < len(self.backlog):
+            log.debug(f"🗄️ Gave up on {len(self.backlog) - len(backlog)} skipped event id(s)")
+        late = find_by_ids("EventLogEntry", list(backlog), fields) if backlog else []
+        for event in late:
+            backlog.pop(event["id"], None)
+
+        previous = self.last_event_id
+        for event in events:
+            backlog.update(dict.fromkeys(range(previous + 1, event["id"]), now))
+            previous = event["id"]
+        if late:
+            log.debug(f"🗄️ Picked up {len(late)} late event(s) from the backlog")
+        return events, late, backlog
+
+    def poll(self) -> int:
+        """Apply the next batch of events (plus late backlog ones); returns how many new ids were read."""
+        with self._sync_lock:
+            return self._poll()
+
+    def _poll(self) -> int:
+        started = time.time()
+        events, late, backlog = self._fetch_events()
+
+        ordered = sorted(late + events, key=lambda e: e["id"])
+        relevant = [e for e in ordered if e.get("event_type") in self._event_types]
+        touched: Dict[str, Set[int]] = {}
+        retired: Dict[str, Set[int]] = {}
+        for entity_type, entity_id in self._referrers(self._renamed(ordered)):
+            touched.setdefault(entity_type, set()).add(entity_id)
+        for event in relevant:
+            entity_type, action = event["event_type"][len("Shotgun_"):].rsplit("_", 1)
+            entity_id = (event.get("entity") or {}).get("id") or (event.get("meta") or {}).get("entity_id")
+            if entity_type not in self.entity_fields or not entity_id:
+                continue
+            # Later events win: a retire-then-revive in one batch ends up refetched
+            if action == "Retirement":
+                touched.get(entity_type, set()).discard(entity_id)
+                retired.setdefault(entity_type, set()).add(entity_id)
+            else:
+                retired.get(entity_type, set()).discard(entity_id)
+                touched.setdefault(entity_type, set()).add(entity_id)
+
+        upserts: List[Dict[str, Any]] = []
+        deletes: List[Tuple[str, int]] = [(t, i) for t, ids in retired.items() for i in ids]
+        for entity_type, ids in touched.items():
+            rows, missing = self._refetch(entity_type, ids)
+            upserts.extend(rows)
+            deletes.extend(missing)
+
+        with self._lock:
+            for row in upserts:
+                self._rows[row["type"]][row["id"]] = row
+            for entity_type, entity_id in deletes:
+                self._rows[entity_type].pop(entity_id, None)
+            if events:
+                self.last_event_id = events[-1]["id"]
+            self.backlog = backlog
+            if len(events) < EVENT_BATCH:
+                self.synced_at = started
+            self.polls += 1
+            self.events_applied += len(relevant)
+            self._persist(upserts, deletes)
+        if relevant:
+            log.debug(f"🗄️ Applied {len(relevant)} event(s): {len(upserts)} updated, {len(deletes)} removed")
+        return len(events)
+
+    def _resolves_names(self, entity_type: Optional[str]) -> bool:
+        return entity_type in self.entity_fields and _name_field(entity_type) in self.entity_fields[entity_type]
+
+    def _renamed(self, events: List[Dict[str, Any]]) -> Set[Tuple[str, int]]:
+        # Display-name changes that read-time resolution can't cover
+        renamed = set()
+        for event in events:
+            event_type = event.get("event_type") or ""
+            if not (event_type.startswith("Shotgun_") and event_type.endswith("_Change")):
+                continue
+            entity_type = event_type[len("Shotgun_"):-len("_Change")]
+            entity_id = (event.get("entity") or {}).get("id") or (event.get("meta") or {}).get("entity_id")
+            if entity_id and event.get("attribute_name") == _name_field(entity_type) and not self._resolves_names(entity_type):
+                renamed.add((entity_type, entity_id))
+        return renamed
+
+    def _referrers(self, links: Set[Tuple[str, int]]) -> List[Tuple[str, int]]:
+        """Cached rows with a field linking to any of `links`."""
+        if not links:
+            return []
+
+        def points_at(value: Any) -> bool:
+            if isinstance(value, list):
+                return any(points_at(v) for v in value)
+            return isinstance(value, dict) and (value.get("type"), value.get("id")) in links
+
+        with self._lock:
+            return [
+                (entity_type, entity_id)
+                for entity_type, rows in self._rows.items()
+                for entity_id, row in rows.items()
+                if any(points_at(row.get(f)) for f in self.entity_fields[entity_type])
+            ]
+
+    def sync(self):
+        """Load if needed, then poll until caught up."""
+        with self._sync_lock:
+            if not self.ready:
+                self._resync()
+            while self._poll() >= EVENT_BATCH:
+                pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                self.errors += 1
+                log.warning(f"⚠️ Entity cache sync failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sg-entity-cache", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._sync_lock, self._lock:
+            self._db.close()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔍 Local reads
+    # ──────────────────────────────────────────────────────────────────────
+
+    @property
+    def age(self) -> Optional[float]:
+        return time.time() - self.synced_at if self.ready else None
+
+    def _value(self, entity_type: str, row: Dict[str, Any], path: str) -> Any:
+        parts = path.split(".")
+        if parts[0] not in ("id", "type") and parts[0] not in self.entity_fields[entity_type]:
+            raise _Unsupported(f"{entity_type}.{parts[0]} is not cached")
+        value = row.get(parts[0])
+        for i in range(1, len(parts), 2):
+            if i + 1 >= len(parts):
+                raise _Unsupported(path)
+            link_type, field = parts[i], parts[i + 1]
+            if link_type not in self.entity_fields or (field not in ("id", "type") and field not in self.entity_fields[link_type]):
+                raise _Unsupported(f"{link_type}.{field} is not cached")
+            if value is None:
+                return None
+            if not isinstance(value, dict):
+                raise _Unsupported(f"{path} crosses a multi-entity field")
+            if value.get("type") != link_type:
+                return None
+            linked = self._rows[link_type].get(value.get("id"))
+            value = linked.get(field) if linked else None
+        return self._link(value)
+
+    def _link(self, value: Any) -> Any:
+        # Stored links keep the name from their last refetch; prefer the cached entity's current one
+        if isinstance(value, list):
+            return [self._link(v) for v in value]
+        if isinstance(value, dict) and "name" in value and self._resolves_names(value.get("type")):
+            linked = self._rows[value["type"]].get(value.get("id"))
+            if linked is not None:
+                return {**value, "name": linked.get(_name_field(value["type"]))}
+        return value
+
+    def _matches(self, entity_type: str, row: Dict[str, Any], filters: Any) -> bool:
+        operator = "all"
+        if isinstance(filters, dict):
+            operator = filters.get("filter_operator", "all")
+            filters = filters.get("filters") or []
+        results = []
+        for item in filters:
+            if isinstance(item, dict):
+                results.append(self._matches(entity_type, row, item))
+                continue
+            path, op, *values = item
+            value = self._value(entity_type, row, path)
+            target = values[0] if len(values) == 1 else values
+            if op in ("is", "is_not"):
+                options = [target]
+            elif op in ("in", "not_in"):
+                options = target if isinstance(target, list) else [target]
+            else:
+                raise _Unsupported(f"operator {op!r}")
+            if isinstance(value, list):
+                # Multi-entity field: ShotGrid matches when any linked entity does ("contains")
+                if any(option is None for option in options):
+                    raise _Unsupported(f"{path} compared to None")
+                hit = any(_same(v, option) for v in value for option in options)
+            else:
+                hit = any(_same(value, option) for option in options)
+            results.append(hit if op in ("is", "in") else not hit)
+        return any(results) if operator in ("any", "or") else all(results)
+
+    def find(
+        self,
+        entity_type: str,
+        filters: Any,
+        fields: Optional[List[str]] = None,
+        order: Optional[List[Dict[str, str]]] = None,
+        limit: int = 0,
+        max_age: Optional[float] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Answer a find locally, or None if the cache is too old or can't evaluate it."""
+        age = self.age
+        if entity_type not in self.entity_fields or age is None or (max_age is not None and age > max_age):
+            self.fallbacks += 1
+            return None
+        fields = fields or ["id", "type"]
+        try:
+            with self._lock:
+                matched = [r for r in self._rows[entity_type].values() if self._matches(entity_type, r, filters)]
+                for rule in reversed(order or []):  # stable sorts, last key first
+                    name = rule.get("field_name") or rule.get("column")
+                    matched.sort(key=lambda r: _sort_key(self._value(entity_type, r, name)), reverse=rule.get("direction") == "desc")
+                results = [
+                    {"type": entity_type, "id": row["id"], **{f: self._value(entity_type, row, f) for f in fields}}
+                    for row in matched
+                ]
+        except (_Unsupported, ValueError, TypeError) as e:
+            log.debug(f"🗄️ Cache can't answer {entity_type} query ({e}); using ShotGrid")
+            self.fallbacks += 1
+            return None
+        self.hits += 1
+        return results[:limit] if limit else results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {t: len(r) for t, r in self._rows.items()}
+        age = self.age
+        return {
+            "ready": self.ready,
+            "running": bool(self._thread and self._thread.is_alive()),
+            "age_seconds": round(age, 1) if age is not None else None,
+            "last_event_id": self.last_event_id,
+            "backlog": len(self.backlog),
+            "entities": counts,
+            "polls": self.polls,
+            "events_applied": self.events_applied,
+            "errors": self.errors,
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "db": self.db_path,
+        }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ♻️ Process-wide cache
+# ──────────────────────────────────────────────────────────────────────────────
+
+_cache: Optional[EntityCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_entity_cache() -> Optional[EntityCache]:
+    """The shared entity cache, or None when SG_ENTITY_CACHE_DB isn't set."""
+    global _cache
+    db_path = os.environ.get("SG_ENTITY_CACHE_DB")
+    if _cache is None and db_path:
+        with _cache_lock:
+            if _cache is None:
+                types = os.environ.get("SG_ENTITY_CACHE_TYPES")
+                _cache = EntityCache(
+                    db_path,
+                    json.loads(types) if types else None,
+                    float(os.environ.get("SG_ENTITY_CACHE_POLL", DEFAULT_POLL_INTERVAL)),
+                )
+    return _cache
+
+
+def cached_find(
+    entity_type: str,
+    filters: Any,
+    fields: Optional[List[str]] = None,
+    order: Optional[List[Dict[str, str]]] = None,
+    max_age: Optional[float] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Serve a find from the entity cache if the caller opted in with `max_age`
+    (seconds) and the cache is at least that fresh; otherwise None.
+    """
+    if max_age is None:
+        return None
+    cache = get_entity_cache()
+    return cache.find(entity_type, filters, fields, order, max_age=max_age) if cache else None
+
+
+def start_entity_cache():
+    """Start the event-polling thread when the cache is configured (API startup hook)."""
+    cache = get_entity_cache()
+    if cache is not None:
+        cache.start()
+        log.info(f"🗄️ Entity cache daemon started ({cache.db_path})")
+
+
+def stop_entity_cache():
+    global _cache
+    with _cache_lock:
+        cache, _cache = _cache, None
+    if cache is not None:
+        cache.stop()
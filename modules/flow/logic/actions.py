@@ -1,7 +1,7 @@
 
 
 from modules.flow.utils.shotgun_action import ShotgunAction
-from modules.flow.client import get_sg_client
+from modules.flow.utils.query import find_by_ids
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow.actions.logic")
@@ -13,7 +13,6 @@ def handle_action_menu(url: str) -> dict:
     Supports dispatching actions like 'package4client'.
     """
     action = ShotgunAction(url)
-    sg = get_sg_client()
     log.info(f"✅ Received AMI action: {action.action}")
 
     result = {
@@ -34,7 +33,7 @@ def handle_action_menu(url: str) -> dict:
             raise ValueError("No selected_ids provided.")
 
         fields = ["code", "sg_path_to_frames", "sg_status_list"]
-        versions = sg.find("Version", action.selected_ids_filter, fields)
+        versions = find_by_ids("Version", action.selected_ids, fields)
 
         result["versions"] = versions
         log.info(f"📦 Prepared {len(versions)} version(s) for packaging preview")
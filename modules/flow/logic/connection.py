@@ -1,6 +1,8 @@
 
 
-from modules.flow.client import get_sg_client
+from shotgun_api3 import AuthenticationFault
+
+from modules.flow.client import get_sg_pool, sg_connection
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow.connection.logic")
@@ -8,14 +10,14 @@ log = get_module_logger("flow.connection.logic")
 
 def get_server_info():
     """Return server metadata from ShotGrid."""
-    sg = get_sg_client()
-    return sg.info()
+    with sg_connection() as sg:
+        return sg.info()
 
 
 def get_session_token():
     """Return current API session token."""
-    sg = get_sg_client()
-    return sg.get_session_token()
+    with sg_connection() as sg:
+        return sg.get_session_token()
 
 
 def authenticate_user(user_login: str, user_password: str, auth_token: str = None):
@@ -25,8 +27,18 @@ def authenticate_user(user_login: str, user_password: str, auth_token: str = Non
     Returns the user entity dict if successful.
     Raises Exception if authentication fails.
     """
-    sg = get_sg_client()
-    result = sg.authenticate_human_user(user_login, user_password, auth_token)
+    # A dedicated connection: a bad password must not look like a rejected pool token
+    sg = get_sg_pool().user_client(user_login, user_password, auth_token)
+    try:
+        result = sg.find_one(
+            "HumanUser",
+            [["sg_status_list", "is", "act"], ["login", "is", user_login]],
+            ["id", "login"],
+        )
+    except AuthenticationFault:
+        result = None
+    finally:
+        sg.close()
     if result is None:
         raise Exception("Authentication failed")
     return result
@@ -1,56 +1,125 @@
 
 
-from typing import List, Dict, Any, Optional
-from modules.flow.client import get_sg_client
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional
+from modules.flow.client import get_sg_pool, sg_connection
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow.crud.logic")
 
+DEFAULT_PAGE_WORKERS = 4
+
 
 def create_entity(entity_type: str, data: Dict[str, Any]) -> dict:
-    sg = get_sg_client()
-    return sg.create(entity_type, data)
+    with sg_connection() as sg:
+        return sg.create(entity_type, data)
+
+
+def iter_entity_pages(entity_type: str, filters: List,
+                      fields: Optional[List[str]] = None,
+                      order: Optional[List[Dict[str, str]]] = None,
+                      limit: int = 0,
+                      page_size: Optional[int] = None,
+                      workers: Optional[int] = None) -> Iterator[List[dict]]:
+    """
+    Yield the results of a find one page at a time, in order.
+
+    Page 1 is read first. If it is full, up to `workers` further pages are
+    fetched in parallel, each on its own pooled connection. New requests stop
+    once a short page comes back or `limit` is reached, so at most `workers`
+    pages are held in memory. Without an explicit `order`, results are sorted by
+    id so page boundaries stay stable while pages are fetched.
+    """
+    fields = fields or ["id", "type"]
+    order = order or [{"field_name": "id", "direction": "asc"}]
+    workers = workers or int(os.environ.get("SG_PAGE_WORKERS", DEFAULT_PAGE_WORKERS))
+    workers = max(1, min(workers, get_sg_pool().size))
+
+    with sg_connection() as sg:
+        max_page = sg.config.records_per_page
+        page_size = min(page_size or max_page, max_page, limit or max_page)
+        first = sg.find(entity_type, filters, fields, order=order, limit=page_size, page=1)
+
+    emitted = 0
+
+    def trim(page: List[dict]) -> List[dict]:
+        return page[:limit - emitted] if limit else page
+
+    page = trim(first)
+    emitted += len(page)
+    yield page
+    if len(first) < page_size or (limit and emitted >= limit):
+        return
+
+    last_page = -(-limit // page_size) if limit else None
+
+    def fetch(number: int) -> List[dict]:
+        with sg_connection() as sg:
+            return sg.find(entity_type, filters, fields, order=order, limit=page_size, page=number)
+
+    log.debug(f"📄 Paging {entity_type} ({page_size}/page, {workers} worker(s))")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sg-page") as executor:
+        inflight = deque()
+        next_page = 2
+        try:
+            while True:
+                while len(inflight) < workers and (last_page is None or next_page <= last_page):
+                    inflight.append(executor.submit(fetch, next_page))
+                    next_page += 1
+                if not inflight:
+                    return
+                result = inflight.popleft().result()
+                page = trim(result)
+                emitted += len(page)
+                if page:
+                    yield page
+                if len(result) < page_size or (limit and emitted >= limit):
+                    return
+        finally:
+            for future in inflight:
+                future.cancel()
 
 
 def find_entities(entity_type: str, filters: List,
                   fields: Optional[List[str]] = None,
                   order: Optional[List[Dict[str, str]]] = None,
                   limit: int = 0) -> List[dict]:
-    sg = get_sg_client()
-    return sg.find(entity_type, filters, fields or ["id", "type"], order=order, limit=limit)
+    return [entity for page in iter_entity_pages(entity_type, filters, fields, order, limit) for entity in page]
 
 
 def find_one_entity(entity_type: str, filters: List,
                     fields: Optional[List[str]] = None) -> Optional[dict]:
-    sg = get_sg_client()
-    return sg.find_one(entity_type, filters, fields or ["id", "type"])
+    with sg_connection() as sg:
+        return sg.find_one(entity_type, filters, fields or ["id", "type"])
 
 
 def update_entity(entity_type: str, entity_id: int,
                   data: Dict[str, Any],
                   multi_entity_update_modes: Optional[Dict[str, str]] = None) -> dict:
-    sg = get_sg_client()
-    return sg.update(entity_type, entity_id, data, multi_entity_update_modes)
+    with sg_connection() as sg:
+        return sg.update(entity_type, entity_id, data, multi_entity_update_modes)
 
 
 def delete_entity(entity_type: str, entity_id: int) -> bool:
-    sg = get_sg_client()
-    return sg.delete(entity_type, entity_id)
+    with sg_connection() as sg:
+        return sg.delete(entity_type, entity_id)
 
 
 def revive_entity(entity_type: str, entity_id: int) -> bool:
-    sg = get_sg_client()
-    return sg.revive(entity_type, entity_id)
+    with sg_connection() as sg:
+        return sg.revive(entity_type, entity_id)
 
 
 def batch_operations(requests: List[Dict[str, Any]]) -> List[Any]:
-    sg = get_sg_client()
-    return sg.batch(requests)
+    with sg_connection() as sg:
+        return sg.batch(requests)
 
 
 def summarize_entity(entity_type: str,
                      filters: List,
                      summary_fields: List[Dict[str, str]],
                      grouping: Optional[List[Dict[str, str]]] = None) -> dict:
-    sg = get_sg_client()
-    return sg.summarize(entity_type, filters, summary_fields, grouping=grouping)
+    with sg_connection() as sg:
+        return sg.summarize(entity_type, filters, summary_fields, grouping=grouping)
@@ -5,7 +5,7 @@ import shutil
 import tempfile
 from typing import Optional, Dict, List, Any
 from fastapi import UploadFile
-from modules.flow.client import get_sg_client
+from modules.flow.client import sg_connection
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow.files.logic")
@@ -27,41 +27,38 @@ def upload_file(
     display_name: Optional[str] = None,
     tag_list: Optional[str] = None
 ) -> int:
-    sg = get_sg_client()
     tmp_path = save_temp_file(file)
     try:
-        result = sg.upload(entity_type, entity_id, tmp_path, field_name, display_name, tag_list)
-        return result
+        with sg_connection() as sg:
+            return sg.upload(entity_type, entity_id, tmp_path, field_name, display_name, tag_list)
     finally:
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
 
 
 def upload_thumbnail(entity_type: str, entity_id: int, file: UploadFile) -> int:
-    sg = get_sg_client()
     tmp_path = save_temp_file(file)
     try:
-        result = sg.upload_thumbnail(entity_type, entity_id, tmp_path)
-        return result
+        with sg_connection() as sg:
+            return sg.upload_thumbnail(entity_type, entity_id, tmp_path)
     finally:
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
 
 
 def upload_filmstrip_thumbnail(entity_type: str, entity_id: int, file: UploadFile) -> int:
-    sg = get_sg_client()
     tmp_path = save_temp_file(file)
     try:
-        result = sg.upload_filmstrip_thumbnail(entity_type, entity_id, tmp_path)
-        return result
+        with sg_connection() as sg:
+            return sg.upload_filmstrip_thumbnail(entity_type, entity_id, tmp_path)
     finally:
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
 
 
 def get_download_url(attachment_id: int) -> str:
-    sg = get_sg_client()
-    return sg.get_attachment_download_url({"type": "Attachment", "id": attachment_id})
+    with sg_connection() as sg:
+        return sg.get_attachment_download_url({"type": "Attachment", "id": attachment_id})
 
 
 def share_thumbnail(
@@ -70,24 +67,24 @@ def share_thumbnail(
     source_entity: Optional[Dict[str, Any]] = None,
     filmstrip_thumbnail: bool = False
 ) -> int:
-    sg = get_sg_client()
-
     if file:
         tmp_path = save_temp_file(file)
         try:
-            return sg.share_thumbnail(
-                entities=entities,
-                thumbnail_path=tmp_path,
-                filmstrip_thumbnail=filmstrip_thumbnail
-            )
+            with sg_connection() as sg:
+                return sg.share_thumbnail(
+                    entities=entities,
+                    thumbnail_path=tmp_path,
+                    filmstrip_thumbnail=filmstrip_thumbnail
+                )
         finally:
             if os.path.exists(tmp_path):
                 os.remove(tmp_path)
     elif source_entity:
-        return sg.share_thumbnail(
-            entities=entities,
-            source_entity=source_entity,
-            filmstrip_thumbnail=filmstrip_thumbnail
-        )
+        with sg_connection() as sg:
+            return sg.share_thumbnail(
+                entities=entities,
+                source_entity=source_entity,
+                filmstrip_thumbnail=filmstrip_thumbnail
+            )
     else:
         raise ValueError("Either `file` or `source_entity` must be provided for thumbnail sharing.")
@@ -1,17 +1,18 @@
 
 
-from typing import Dict, Any
-from modules.flow.client import get_sg_client
+from typing import Dict, Any, Optional
+from modules.flow.client import sg_connection
+from modules.flow.entity_cache import cached_find
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow.playlists.logic")
 
 
-def get_playlist_versions(playlist_id: int) -> Dict[str, Any]:
+def get_playlist_versions(playlist_id: int, max_age: Optional[float] = None) -> Dict[str, Any]:
     """
     Retrieve all versions linked to a specific playlist via PlaylistVersionConnection.
+    With `max_age`, served from the entity cache when it's at least that fresh.
     """
-    sg = get_sg_client()
     filters = [["playlist", "is", {"type": "Playlist", "id": playlist_id}]]
     fields = [
         "playlist.Playlist.code",
@@ -22,8 +23,11 @@ def get_playlist_versions(playlist_id: int) -> Dict[str, Any]:
     ]
     order = [{"column": "sg_sort_order", "direction": "asc"}]
 
-    log.debug(f"Fetching PlaylistVersionConnections for playlist_id={playlist_id}")
-    versions = sg.find("PlaylistVersionConnection", filters, fields, order)
+    versions = cached_find("PlaylistVersionConnection", filters, fields, order, max_age=max_age)
+    if versions is None:
+        with sg_connection() as sg:
+            log.debug(f"Fetching PlaylistVersionConnections for playlist_id={playlist_id}")
+            versions = sg.find("PlaylistVersionConnection", filters, fields, order)
 
     return {
         "playlist_id": playlist_id,
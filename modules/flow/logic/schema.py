@@ -1,7 +1,7 @@
 
 
 from typing import Dict, Any
-from modules.flow.client import get_sg_client
+from modules.flow.schema_cache import get_schema_cache
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow.schema.logic")
@@ -11,15 +11,24 @@ def get_entity_types() -> Dict[str, Any]:
     """
     Return all active ShotGrid entity types and display names.
     """
-    sg = get_sg_client()
     log.debug("📘 Reading ShotGrid schema entity types")
-    return sg.schema_entity_read()
+    return get_schema_cache().get_entity_types()
 
 
 def get_entity_fields(entity: str) -> Dict[str, Any]:
     """
     Return all fields for a given ShotGrid entity type.
     """
-    sg = get_sg_client()
     log.debug(f"📘 Reading schema fields for entity: {entity}")
-    return sg.schema_field_read(entity)
+    return get_schema_cache().get_entity_fields(entity)
+
+
+def refresh_schema() -> Dict[str, Any]:
+    """
+    Re-read the schema from ShotGrid and report which entities changed.
+    """
+    return get_schema_cache().refresh()
+
+
+def get_schema_cache_stats() -> Dict[str, Any]:
+    return get_schema_cache().stats()
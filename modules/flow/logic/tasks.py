@@ -1,22 +1,26 @@
 
 
-from typing import Dict, Any
-from modules.flow.client import get_sg_client
+from typing import Dict, Any, Optional
+from modules.flow.client import sg_connection
+from modules.flow.entity_cache import cached_find
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow.tasks.logic")
 
 
-def get_tasks_for_shot(shot_id: int) -> Dict[str, Any]:
+def get_tasks_for_shot(shot_id: int, max_age: Optional[float] = None) -> Dict[str, Any]:
     """
     Retrieve all Tasks linked to a specific Shot.
+    With `max_age`, served from the entity cache when it's at least that fresh.
     """
-    sg = get_sg_client()
     filters = [["entity", "is", {"type": "Shot", "id": shot_id}]]
     fields = ["content", "step.Step.short_name", "sg_status_list", "task_assignees"]
 
-    log.debug(f"🔍 Fetching tasks for Shot ID: {shot_id}")
-    tasks = sg.find("Task", filters, fields)
+    tasks = cached_find("Task", filters, fields, max_age=max_age)
+    if tasks is None:
+        with sg_connection() as sg:
+            log.debug(f"🔍 Fetching tasks for Shot ID: {shot_id}")
+            tasks = sg.find("Task", filters, fields)
 
     return {
         "shot_id": shot_id,
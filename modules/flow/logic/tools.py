@@ -1,34 +1,39 @@
 
 
 from typing import List, Dict, Any, Optional
-from modules.flow.client import get_sg_client
+from modules.flow.client import sg_connection
+from modules.flow.entity_cache import cached_find
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow.tools.logic")
 
 
-def list_projects(fields: List[str] = ["id", "name"]) -> List[Dict[str, Any]]:
+def list_projects(fields: List[str] = ["id", "name"], max_age: Optional[float] = None) -> List[Dict[str, Any]]:
     """
     Retrieve all accessible ShotGrid projects with specified fields.
+    With `max_age`, served from the entity cache when it's at least that fresh.
     """
-    sg = get_sg_client()
-    log.debug("📁 Fetching all accessible ShotGrid projects")
-    return sg.find("Project", [], fields)
+    projects = cached_find("Project", [], fields, max_age=max_age)
+    if projects is not None:
+        return projects
+    with sg_connection() as sg:
+        log.debug("📁 Fetching all accessible ShotGrid projects")
+        return sg.find("Project", [], fields)
 
 
 def find_project_by_name(name: str, fields: List[str] = ["id", "name"]) -> Optional[Dict[str, Any]]:
     """
     Find a single project by its name.
     """
-    sg = get_sg_client()
-    log.debug(f"🔍 Finding ShotGrid project with name: {name}")
-    return sg.find_one("Project", [["name", "is", name]], fields)
+    with sg_connection() as sg:
+        log.debug(f"🔍 Finding ShotGrid project with name: {name}")
+        return sg.find_one("Project", [["name", "is", name]], fields)
 
 
 def find_project_by_id(project_id: int, fields: List[str] = ["id", "name"]) -> Optional[Dict[str, Any]]:
     """
     Find a single project by its ID.
     """
-    sg = get_sg_client()
-    log.debug(f"🔍 Finding ShotGrid project with ID: {project_id}")
-    return sg.find_one("Project", [["id", "is", project_id]], fields)
+    with sg_connection() as sg:
+        log.debug(f"🔍 Finding ShotGrid project with ID: {project_id}")
+        return sg.find_one("Project", [["id", "is", project_id]], fields)
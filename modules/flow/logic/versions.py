@@ -4,7 +4,7 @@ import os
 import tempfile
 from typing import Optional, Dict, Any
 from fastapi import UploadFile
-from modules.flow.client import get_sg_client
+from modules.flow.client import sg_connection
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow.versions.logic")
@@ -23,7 +23,6 @@ def create_version(
     """
     Create a new Version in ShotGrid.
     """
-    sg = get_sg_client()
     data = {
         "project": {"type": "Project", "id": project_id},
         "code": code,
@@ -43,21 +42,21 @@ def create_version(
         data["user"] = {"type": "HumanUser", "id": user_id}
 
     log.info(f"🎞️ Creating Version: {code} for Project ID {project_id}")
-    return sg.create("Version", data)
+    with sg_connection() as sg:
+        return sg.create("Version", data)
 
 
 def upload_version_thumbnail(version_id: int, file: UploadFile) -> Dict[str, Any]:
     """
     Upload a thumbnail to a specific Version.
     """
-    sg = get_sg_client()
-
     with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
         tmp.write(file.file.read())
         tmp_path = tmp.name
 
     try:
-        attachment_id = sg.upload_thumbnail("Version", version_id, tmp_path)
+        with sg_connection() as sg:
+            attachment_id = sg.upload_thumbnail("Version", version_id, tmp_path)
         log.info(f"🖼️ Uploaded thumbnail for Version ID {version_id}")
         return {"version_id": version_id, "attachment_id": attachment_id}
     finally:
@@ -0,0 +1,46 @@
+
+
+from fastapi import APIRouter, HTTPException
+from homer.utils.logger import get_module_logger
+from modules.flow.entity_cache import get_entity_cache
+
+log = get_module_logger("flow-cache")
+router = APIRouter()
+
+
+def _cache():
+    cache = get_entity_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Entity cache is disabled (set SG_ENTITY_CACHE_DB)")
+    return cache
+
+
+@router.get("/")
+def get_cache_status():
+    """Entity cache freshness, row counts and hit/fallback metrics."""
+    cache = _cache()
+    return cache.stats()
+
+
+@router.post("/sync")
+def sync_cache():
+    """Apply pending EventLogEntry changes now."""
+    cache = _cache()
+    try:
+        cache.sync()
+        return cache.stats()
+    except Exception as e:
+        log.exception("❌ Entity cache sync failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/resync")
+def resync_cache():
+    """Reload every cached entity type from ShotGrid."""
+    cache = _cache()
+    try:
+        cache.resync()
+        return cache.stats()
+    except Exception as e:
+        log.exception("❌ Entity cache resync failed")
+        raise HTTPException(status_code=500, detail=str(e))
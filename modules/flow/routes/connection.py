@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Query
 from homer.utils.logger import get_module_logger
 from modules.flow.logic import connection as conn_logic
+from modules.flow.client import get_sg_pool
 
 log = get_module_logger("flow-connection")
 router = APIRouter()
@@ -24,6 +25,16 @@ def get_session_token():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/pool")
+def get_pool_stats():
+    """Connection pool usage and wait metrics."""
+    try:
+        return get_sg_pool().stats()
+    except Exception as e:
+        log.exception("❌ Failed to read connection pool stats")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/authenticate")
 def authenticate_human_user(
     user_login: str = Query(...),
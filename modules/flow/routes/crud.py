@@ -1,9 +1,13 @@
 
 
+import json
+from itertools import chain
 from fastapi import APIRouter, HTTPException, Body, Query
-from typing import Optional, List, Dict, Any
+from fastapi.responses import StreamingResponse
+from typing import Iterator, Optional, List, Dict, Any
 
 from modules.flow.logic import crud as crud_logic
+from modules.flow.schema_cache import SchemaValidationError, get_schema_cache
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("flow-crud")
@@ -28,14 +32,33 @@ def find_entities(
     filters: List = Body(...),
     fields: Optional[List[str]] = Body(default=["id", "type"]),
     order: Optional[List[Dict[str, str]]] = None,
-    limit: int = 0
+    limit: int = 0,
+    stream: bool = Query(False, description="Stream results as NDJSON, one entity per line")
 ):
     """Find ShotGrid entities using filters."""
     try:
-        return crud_logic.find_entities(entity_type, filters, fields, order, limit)
+        get_schema_cache().validate_find(entity_type, filters, fields, order)
+    except SchemaValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        if not stream:
+            return crud_logic.find_entities(entity_type, filters, fields, order, limit)
+        pages = crud_logic.iter_entity_pages(entity_type, filters, fields, order, limit)
+        first = next(pages)  # surface query errors before the response starts
     except Exception as e:
         log.exception("❌ Find failed")
         raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(_ndjson(first, pages), media_type="application/x-ndjson")
+
+
+def _ndjson(first: List[dict], pages: Iterator[List[dict]]) -> Iterator[str]:
+    try:
+        for page in chain([first], pages):
+            yield "".join(json.dumps(entity, default=str) + "\n" for entity in page)
+    except Exception as e:
+        # Headers are already sent; a final error record tells clients the stream is incomplete
+        log.exception("❌ Find stream aborted")
+        yield json.dumps({"error": str(e)}) + "\n"
 
 
 @router.post("/find-one")
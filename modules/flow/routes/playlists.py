@@ -1,6 +1,7 @@
 
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
 from homer.utils.logger import get_module_logger
 from modules.flow.logic import playlists as playlists_logic
 
@@ -8,12 +9,12 @@ log = get_module_logger("flow-playlists")
 router = APIRouter()
 
 @router.get("/playlists/{playlist_id}/versions")
-def get_playlist_versions(playlist_id: int):
+def get_playlist_versions(playlist_id: int, max_age: Optional[float] = Query(None, description="Serve from the entity cache if it is at most this many seconds old")):
     """
     Get versions on a playlist via PlaylistVersionConnection.
     """
     try:
-        return playlists_logic.get_playlist_versions(playlist_id)
+        return playlists_logic.get_playlist_versions(playlist_id, max_age)
     except Exception as e:
         log.exception("❌ Failed to fetch playlist versions")
         raise HTTPException(status_code=500, detail=str(e))
@@ -24,3 +24,21 @@ def get_entity_fields(entity: str):
     except Exception as e:
         log.exception(f"❌ Failed to get fields for {entity}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cache")
+def get_schema_cache_stats():
+    """Schema cache age, refresh count and the last detected changes."""
+    try:
+        return schema_logic.get_schema_cache_stats()
+    except Exception as e:
+        log.exception("❌ Failed to read schema cache stats")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/refresh")
+def refresh_schema():
+    """Re-read the schema from ShotGrid now and report added, removed and changed entities."""
+    try:
+        return schema_logic.refresh_schema()
+    except Exception as e:
+        log.exception("❌ Schema refresh failed")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,6 +1,6 @@
 
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional
 from modules.flow.logic import shots as shots_logic
@@ -32,10 +32,10 @@ class ShotUpdateRequest(BaseModel):
 # ─────────────────────────────────────────────────────────────────────────────
 
 @router.get("/by-project-name")
-def get_shots_by_project_name(project: str):
+def get_shots_by_project_name(project: str, max_age: Optional[float] = Query(None, description="Serve from the entity cache if it is at most this many seconds old")):
     """Return all Shots for a given project name."""
     try:
-        return shots_logic.get_shots_by_project_name(project)
+        return shots_logic.get_shots_by_project_name(project, max_age)
     except Exception as e:
         log.exception("❌ Failed to retrieve shots")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,6 +1,7 @@
 
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
 from homer.utils.logger import get_module_logger
 from modules.flow.logic import tasks as task_logic
 
@@ -8,10 +9,10 @@ log = get_module_logger("flow-tasks")
 router = APIRouter()
 
 @router.get("/by-shot/{shot_id}")
-def get_tasks_for_shot(shot_id: int):
+def get_tasks_for_shot(shot_id: int, max_age: Optional[float] = Query(None, description="Serve from the entity cache if it is at most this many seconds old")):
     """Return all Tasks linked to a specific Shot."""
     try:
-        return task_logic.get_tasks_for_shot(shot_id)
+        return task_logic.get_tasks_for_shot(shot_id, max_age)
     except Exception as e:
         log.exception("❌ Failed to retrieve tasks for shot")
         raise HTTPException(status_code=500, detail=str(e))
@@ -3,7 +3,7 @@
 
 
 from fastapi import APIRouter, Query, HTTPException
-from typing import List
+from typing import List, Optional
 from homer.utils.logger import get_module_logger
 from modules.flow.logic import tools as tools_logic
 
@@ -12,12 +12,12 @@ router = APIRouter()
 
 
 @router.get("/projects", summary="List accessible ShotGrid projects")
-def list_projects(fields: List[str] = Query(default=["id", "name"])):
+def list_projects(fields: List[str] = Query(default=["id", "name"]), max_age: Optional[float] = Query(None, description="Serve from the entity cache if it is at most this many seconds old")):
     """
     Return a list of ShotGrid projects visible to the current API user.
     """
     try:
-        return tools_logic.list_projects(fields)
+        return tools_logic.list_projects(fields, max_age)
     except Exception as e:
         log.exception("❌ Failed to fetch ShotGrid projects")
         raise HTTPException(status_code=500, detail=str(e))
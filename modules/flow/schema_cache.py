@@ -0,0 +1,299 @@
+import difflib
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from modules.flow.client import sg_connection
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("flow.schema_cache")
+
+DEFAULT_CACHE_PATH = ".homer_flow_schema.json"
+DEFAULT_TTL = 3600.0
+MISS_REFRESH_INTERVAL = 60.0   # at most one synchronous refresh per minute triggered by unknown names
+ALWAYS_VALID = {"id", "type"}  # returned for every entity but not always listed in the schema
+
+
+class SchemaValidationError(ValueError):
+    """A find referenced fields or an entity type the cached schema doesn't know."""
+
+
+def _digest(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _suggest(name: str, choices: Iterable[str]) -> str:
+    close = difflib.get_close_matches(name, list(choices), n=1)
+    return f"{name!r} (did you mean {close[0]!r}?)" if close else repr(name)
+
+
+class SchemaCache:
+    """
+    In-memory copy of the ShotGrid schema (entity types and every entity's
+    fields), saved as JSON so restarts begin warm.
+
+    Reads never wait on ShotGrid once the schema is loaded. After `ttl` seconds,
+    a read triggers a background refresh and keeps serving the current copy.
+    A refresh uses one `schema_entity_read` and one `schema_read`, then compares
+    per-entity hashes with the previous copy. Added, removed and changed
+    entities are logged and reported in `stats()`.
+
+    A find that names an unknown field or entity triggers one synchronous
+    refresh (at most every `miss_refresh_interval` seconds) before it is
+    rejected, so fields added since the last refresh aren't refused.
+    """
+
+    def __init__(
+        self,
+        site: str,
+        path: Optional[str] = DEFAULT_CACHE_PATH,
+        ttl: float = DEFAULT_TTL,
+        miss_refresh_interval: float = MISS_REFRESH_INTERVAL,
+    ):
+        self.site = site
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.miss_refresh_interval = miss_refresh_interval
+        self._miss_refreshed = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self.entities: Dict[str, Any] = {}
+        self.fields: Dict[str, Dict[str, Any]] = {}
+        self.hashes: Dict[str, str] = {}
+        self.loaded_at = 0.0   # wall clock, so it survives restarts
+        self.refreshes = 0
+        self.last_changes: Dict[str, List[str]] = {}
+        self._load()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 💾 Persistence
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except Exception as e:
+            log.warning(f"⚠️ Ignoring unreadable schema cache {self.path}: {e}")
+            return
+        if data.get("site") != self.site:
+            return
+        self.entities = data.get("entities") or {}
+        self.fields = data.get("fields") or {}
+        self.hashes = data.get("hashes") or {}
+        self.loaded_at = data.get("loaded_at") or 0.0
+        log.debug(f"📘 Loaded cached schema for {len(self.fields)} entities from {self.path}")
+
+    def _save(self):
+        if self.path is None:
+            return
+        payload = {
+            "site": self.site,
+            "loaded_at": self.loaded_at,
+            "entities": self.entities,
+            "fields": self.fields,
+            "hashes": self.hashes,
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, default=str))
+        os.replace(tmp, self.path)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔄 Refresh
+    # ──────────────────────────────────────────────────────────────────────
+
+    def refresh(self) -> Dict[str, List[str]]:
+        """Re-read the schema now; returns `{"added", "removed", "changed"}` entity names."""
+        with self._refreshing:
+            with sg_connection() as sg:
+                entities = sg.schema_entity_read()
+                fields = sg.schema_read()
+            hashes = {name: _digest(f) for name, f in fields.items()}
+            with self._lock:
+                old = self.hashes
+                changes = {
+                    "added": sorted(set(hashes) - set(old)),
+                    "removed": sorted(set(old) - set(hashes)),
+                    "changed": sorted(k for k in hashes if k in old and old[k] != hashes[k]),
+                }
+                self.entities, self.fields, self.hashes = entities, fields, hashes
+                self.loaded_at = time.time()
+                self.refreshes += 1
+                if old and any(changes.values()):
+                    self.last_changes = changes
+            if old and any(changes.values()):
+                log.info(f"📘 ShotGrid schema changed: {changes}")
+            self._save()  # also records when the schema was last checked
+            return changes
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            log.warning(f"⚠️ Background schema refresh failed: {e}")
+
+    def refresh_in_background(self) -> bool:
+        """Start a refresh thread unless one is already running."""
+        if self._refreshing.locked():
+            return False
+        threading.Thread(target=self._refresh_quietly, name="sg-schema-refresh", daemon=True).start()
+        return True
+
+    def _refresh_for_miss(self) -> bool:
+        """Refresh now because a find named something unknown; False if rate-limited or failed."""
+        with self._lock:
+            if time.time() - max(self.loaded_at, self._miss_refreshed) < self.miss_refresh_interval:
+                return False
+            self._miss_refreshed = time.time()
+        try:
+            self.refresh()
+            return True
+        except Exception as e:
+            log.warning(f"⚠️ Schema refresh after a validation miss failed: {e}")
+            return False
+
+    @property
+    def stale(self) -> bool:
+        return time.time() - self.loaded_at > self.ttl
+
+    def _ready(self):
+        if not self.fields:
+            self.refresh()
+        elif self.stale:
+            self.refresh_in_background()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 📘 Reads
+    # ──────────────────────────────────────────────────────────────────────
+
+    def get_entity_types(self) -> Dict[str, Any]:
+        self._ready()
+        return self.entities
+
+    def get_entity_fields(self, entity: str) -> Dict[str, Any]:
+        self._ready()
+        fields = self.fields.get(entity)
+        if fields is None:
+            # Possibly created since the last refresh; ask ShotGrid directly
+            with sg_connection() as sg:
+                fields = sg.schema_field_read(entity)
+            with self._lock:
+                self.fields[entity] = fields
+        return fields
+
+    # ──────────────────────────────────────────────────────────────────────
+    # ✅ Local validation
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _check_path(self, entity: str, path: str, errors: List[str]):
+        # "sg_sequence.Sequence.sg_status_list" → field on entity, then field on the linked type
+        parts = path.split(".")
+        current = entity
+        for i in range(0, len(parts), 2):
+            name = parts[i]
+            known = self.fields.get(current)
+            if known is None:
+                errors.append(f"unknown entity type {_suggest(current, self.fields)} in {path!r}")
+                return
+            if name not in known and name not in ALWAYS_VALID:
+                errors.append(f"unknown {current} field {_suggest(name, known)}" + (f" in {path!r}" if len(parts) > 1 else ""))
+                return
+            if i + 1 < len(parts):
+                current = parts[i + 1]
+
+    def _check_filters(self, entity: str, filters: Any, errors: List[str]):
+        if isinstance(filters, dict):
+            # {"filter_operator": "any", "filters": [...]}
+            self._check_filters(entity, filters.get("filters") or [], errors)
+            return
+        for item in filters or []:
+            if isinstance(item, dict) and "path" in item:
+                self._check_path(entity, item["path"], errors)
+            elif isinstance(item, dict):
+                self._check_filters(entity, item, errors)
+            elif isinstance(item, (list, tuple)) and item and isinstance(item[0], str):
+                self._check_path(entity, item[0], errors)
+
+    def validate_find(
+        self,
+        entity_type: str,
+        filters: Any,
+        fields: Optional[List[str]] = None,
+        order: Optional[List[Dict[str, str]]] = None,
+    ):
+        """
+        Check a find's entity type, fields, filters and order against the cached
+        schema. Raises `SchemaValidationError` listing every problem. Calls
+        ShotGrid only to refresh after a miss; with no schema loaded yet it
+        starts a background load and passes.
+        """
+        if not self.fields:
+            self.refresh_in_background()
+            return
+        if self.stale:
+            self.refresh_in_background()
+        errors = self._find_errors(entity_type, filters, fields, order)
+        if errors and self._refresh_for_miss():
+            errors = self._find_errors(entity_type, filters, fields, order)
+        if errors:
+            raise SchemaValidationError("; ".join(errors))
+
+    def _find_errors(
+        self,
+        entity_type: str,
+        filters: Any,
+        fields: Optional[List[str]],
+        order: Optional[List[Dict[str, str]]],
+    ) -> List[str]:
+        if entity_type not in self.fields:
+            return [f"Unknown entity type {_suggest(entity_type, self.fields)}"]
+        errors: List[str] = []
+        for field in fields or []:
+            self._check_path(entity_type, field, errors)
+        self._check_filters(entity_type, filters, errors)
+        for rule in order or []:
+            name = rule.get("field_name") or rule.get("column")
+            if name:
+                self._check_path(entity_type, name, errors)
+        return errors
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entities": len(self.fields),
+            "age_seconds": round(time.time() - self.loaded_at, 1) if self.loaded_at else None,
+            "stale": self.stale,
+            "refreshing": self._refreshing.locked(),
+            "refreshes": self.refreshes,
+            "last_changes": self.last_changes,
+            "path": str(self.path) if self.path else None,
+        }
+
+
+_cache: Optional[SchemaCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_schema_cache() -> SchemaCache:
+    """Return the shared schema cache, configured from SG_* environment variables."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SchemaCache(
+                    os.environ["SG_SITE"],
+                    os.environ.get("SG_SCHEMA_CACHE", DEFAULT_CACHE_PATH),
+                    float(os.environ.get("SG_SCHEMA_TTL", DEFAULT_TTL)),
+                )
+    return _cache
+
+
+def warm_schema_cache():
+    """Load or refresh the schema in the background if it's missing or stale (API startup hook)."""
+    cache = get_schema_cache()
+    if not cache.fields or cache.stale:
+        cache.refresh_in_background()
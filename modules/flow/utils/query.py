@@ -0,0 +1,78 @@
+
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from modules.flow.client import get_sg_pool, sg_connection
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("flow.query")
+
+DEFAULT_CHUNK_SIZE = 500   # ids per `in` filter; keeps each request small
+DEFAULT_WORKERS = 4
+
+
+def unique_ids(ids: Iterable[Any]) -> List[int]:
+    """Integer ids, de-duplicated, in first-seen order."""
+    return list(dict.fromkeys(int(i) for i in ids))
+
+
+def id_in(ids: Iterable[Any], field: str = "id") -> List:
+    """One `in` condition for many ids: `["id", "in", [1, 2, 3]]`."""
+    return [field, "in", unique_ids(ids)]
+
+
+def ids_filter(ids: Iterable[Any], field: str = "id") -> List[List]:
+    """A complete `filters` list matching any of `ids`."""
+    return [id_in(ids, field)]
+
+
+def any_of(*conditions: Any) -> Dict[str, Any]:
+    """Nested filter group that matches when any condition does."""
+    return {"filter_operator": "any", "filters": list(conditions)}
+
+
+def all_of(*conditions: Any) -> Dict[str, Any]:
+    """Nested filter group that matches when every condition does."""
+    return {"filter_operator": "all", "filters": list(conditions)}
+
+
+def chunked(items: List[Any], size: int = DEFAULT_CHUNK_SIZE) -> List[List[Any]]:
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def find_by_ids(
+    entity_type: str,
+    ids: Iterable[Any],
+    fields: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = DEFAULT_WORKERS,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch entities by id with one `id in [...]` find per chunk of ids. When
+    there are several chunks, they run in parallel on pooled connections.
+    Extra `filters` are ANDed onto every chunk. Results follow the order of
+    `ids`; ids that match nothing are left out.
+    """
+    wanted = unique_ids(ids)
+    if not wanted:
+        return []
+    fields = fields or ["id", "type"]
+    chunks = chunked(wanted, chunk_size)
+
+    def fetch(chunk: List[int]) -> List[Dict[str, Any]]:
+        with sg_connection() as sg:
+            return sg.find(entity_type, list(filters or []) + [id_in(chunk)], fields)
+
+    if len(chunks) == 1:
+        found = fetch(chunks[0])
+    else:
+        workers = max(1, min(workers, len(chunks), get_sg_pool().size))
+        log.debug(f"🔎 Fetching {len(wanted)} {entity_type} ids in {len(chunks)} chunks ({workers} worker(s))")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sg-ids") as executor:
+            found = [e for result in executor.map(fetch, chunks) for e in result]
+
+    position = {entity_id: n for n, entity_id in enumerate(wanted)}
+    return sorted(found, key=lambda e: position.get(e["id"], len(position)))
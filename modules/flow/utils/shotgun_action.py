@@ -3,6 +3,7 @@
 import urllib.parse
 from typing import Dict, List, Optional, Tuple
 from homer.utils.logger import get_module_logger
+from modules.flow.utils.query import ids_filter
 
 log = get_module_logger("flow-ami")
 
@@ -50,7 +51,8 @@ class ShotgunAction:
         return []
 
     def _convert_ids_to_filter(self, ids: List[int]) -> List[List]:
-        filters = [["id", "is", i] for i in ids]
+        # One `in` condition; a list of `is` conditions is ANDed and matches nothing for 2+ ids
+        filters = ids_filter(ids)
         log.debug(f"Parsed filters: {filters}")
         return filters
 
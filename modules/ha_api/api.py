@@ -0,0 +1,58 @@
+import asyncio
+
+from homer.api.core import HomerAPI, register_api
+from homer.utils.logger import get_module_logger
+from modules.ha_api.client import close_async_client, get_env
+from modules.ha_api.logic.rules_engine import start_rules_engine, stop_rules_engine
+from modules.ha_api.logic.state_mirror import stop_state_mirror
+from modules.ha_api.logic.template_renderer import stop_template_renderer
+from modules.ha_api.ws_manager import close_ws_manager, get_ws_manager
+
+# Route modules (with routers exposed)
+from modules.ha_api.routes import entities, events, rules, services, state, template, ws_listen
+
+log = get_module_logger("ha_api.api")
+
+
+@register_api
+class HomeAssistantAPI(HomerAPI):
+    def __init__(self):
+        super().__init__(prefix="/ha_api")
+
+    def register_routes(self):
+        @self.router.get("/ping")
+        async def ping():
+            """Quick Home Assistant health check over the shared WebSocket."""
+            try:
+                manager = get_ws_manager()
+                latency = await manager.aping()
+                return {"status": "ok", "version": manager.ha_version, "latency_ms": latency}
+            except Exception as e:
+                log.exception("❌ Home Assistant ping failed")
+                return {"status": "error", "message": str(e)}
+
+        async def start_rules():
+            env = get_env(safe=True)
+            if env and env.HA_RULES_FILE:
+                try:
+                    await asyncio.to_thread(start_rules_engine, env.HA_RULES_FILE)
+                except Exception:
+                    log.exception(f"❌ Could not start rules from {env.HA_RULES_FILE}")
+
+        self.router.add_event_handler("startup", start_rules)
+
+        # Release shared connections on shutdown
+        self.router.add_event_handler("shutdown", stop_rules_engine)
+        self.router.add_event_handler("shutdown", close_async_client)
+        self.router.add_event_handler("shutdown", stop_state_mirror)
+        self.router.add_event_handler("shutdown", stop_template_renderer)
+        self.router.add_event_handler("shutdown", close_ws_manager)
+
+        # Grouped route registration
+        self.router.include_router(state.router, prefix="/states")
+        self.router.include_router(entities.router, prefix="/entities")
+        self.router.include_router(services.router, prefix="/services")
+        self.router.include_router(events.router, prefix="/events")
+        self.router.include_router(template.router, prefix="/template")
+        self.router.include_router(rules.router, prefix="/rules")
+        self.router.include_router(ws_listen.router, prefix="/stream")
@@ -0,0 +1,294 @@
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import threading
+
+from requests_cache import DO_NOT_CACHE
+from requests_cache.backends.base import BaseCache, BaseStorage
+from aiohttp_client_cache import CacheBackend
+from aiohttp_client_cache.backends.base import BaseCache as AioBaseCache
+from aiohttp_client_cache.cache_control import DO_NOT_CACHE as AIO_DO_NOT_CACHE
+
+from modules.ha_api.config import HomeAssistantEnv
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("ha_api.cache")
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ⏱️ Per-endpoint expiry
+# ──────────────────────────────────────────────────────────────────────────────
+
+def url_ttls(env: HomeAssistantEnv, do_not_cache: Any = DO_NOT_CACHE) -> Dict[str, Any]:
+    """
+    `urls_expire_after` patterns, first match wins. States change constantly,
+    while config and service definitions only change on restarts or reloads.
+    History, logbook and camera responses are large and rarely re-read, so they
+    bypass the cache (the history store keeps history instead).
+    """
+    states = timedelta(seconds=env.HA_CACHE_STATES_TTL) if env.HA_CACHE_STATES_TTL > 0 else do_not_cache
+    static = timedelta(seconds=env.HA_CACHE_STATIC_TTL)
+    return {
+        "*/api/states": states,
+        "*/api/history": do_not_cache,
+        "*/api/logbook": do_not_cache,
+        "*/api/camera_proxy": do_not_cache,
+        "*/api/error_log": do_not_cache,
+        "*/api/config": static,
+        "*/api/services": static,
+        "*/api/events": static,
+        "*/api/components": static,
+    }
+
+
+def _reset(item: Any) -> Any:
+    # In-memory responses have already been read once; rewind their body
+    raw = getattr(item, "raw", None)
+    if raw is not None:
+        raw.reset()
+    return item
+
+
+class _LRU:
+    """Bounded, thread-safe most-recently-used map; the shared memory tier."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._data), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔁 Sync tier (requests-cache)
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TieredStorage(BaseStorage):
+    """
+    requests-cache storage: an in-memory LRU in front of an optional SQLite
+    table. Reads that miss memory fall through to SQLite and are promoted.
+    Writes go to both tiers.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[str] = None, table_name: str = "responses"):
+        super().__init__(serializer=None)  # memory keeps objects; SQLiteDict pickles its own copy
+        self.memory = _LRU(max_entries)
+        self.disk = None
+        if db_path:
+            from requests_cache.backends.sqlite import SQLiteDict
+            self.disk = SQLiteDict(db_path, table_name, wal=True)
+
+    def __getitem__(self, key):
+        found, item = self.memory.get(key)
+        if not found:
+            if self.disk is None:
+                raise KeyError(key)
+            item = self.disk[key]
+            self.memory.put(key, item)
+        try:
+            item.cache_key = key
+        except AttributeError:
+            pass
+        return _reset(item)
+
+    def __setitem__(self, key, value):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk[key] = value
+
+    def __delitem__(self, key):
+        in_memory = self.memory.pop(key)
+        if self.disk is not None:
+            try:
+                del self.disk[key]
+                return
+            except KeyError:
+                pass
+        if not in_memory:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self.memory.keys()
+        if self.disk is not None:
+            keys = list(dict.fromkeys(keys + list(self.disk.keys())))
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return len(self.disk) if self.disk is not None else len(self.memory.keys())
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+
+
+class TieredCache(BaseCache):
+    """requests-cache backend built on `TieredStorage`; never touches disk unless `db_path` is set."""
+
+    def __init__(self, cache_name: str = "ha_api", max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[str] = None, **kwargs):
+        super().__init__(cache_name=cache_name, **kwargs)
+        self.responses = TieredStorage(max_entries, db_path, "responses")
+        self.redirects = TieredStorage(max_entries, db_path, "redirects")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ⚡ Async tier (aiohttp-client-cache)
+# ──────────────────────────────────────────────────────────────────────────────
+
+class AsyncTieredStorage(AioBaseCache):
+    """The async counterpart of `TieredStorage`, for aiohttp-client-cache."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[str] = None, table_name: str = "async_responses", share_with: Optional["AsyncTieredStorage"] = None):
+        super().__init__()
+        self.memory = _LRU(max_entries)
+        self.disk = None
+        if db_path:
+            from aiohttp_client_cache.backends.sqlite import SQLitePickleCache
+            # One aiosqlite connection (and worker thread) per backend
+            shared = share_with.disk if share_with is not None else None
+            self.disk = SQLitePickleCache(
+                db_path,
+                table_name,
+                connection=shared._connection if shared else None,
+                lock=shared._lock if shared else None,
+            )
+
+    async def read(self, key: str):
+        found, item = self.memory.get(key)
+        if not found:
+            if self.disk is None:
+                return None
+            item = await self.disk.read(key)
+            if item is None:
+                return None
+            self.memory.put(key, item)
+        try:
+            item.reset()
+        except AttributeError:
+            pass
+        return item
+
+    async def write(self, key: str, item):
+        self.memory.put(key, item)
+        if self.disk is not None:
+            await self.disk.write(key, item)
+
+    async def contains(self, key: str) -> bool:
+        if key in self.memory.keys():
+            return True
+        return self.disk is not None and await self.disk.contains(key)
+
+    async def delete(self, key: str):
+        self.memory.pop(key)
+        if self.disk is not None:
+            await self.disk.delete(key)
+
+    async def bulk_delete(self, keys: set):
+        for key in keys:
+            await self.delete(key)
+
+    async def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            await self.disk.clear()
+
+    async def keys(self) -> AsyncIterator[str]:
+        if self.disk is not None:
+            async for key in self.disk.keys():
+                yield key
+            return
+        for key in self.memory.keys():
+            yield key
+
+    async def values(self) -> AsyncIterator[Any]:
+        async for key in self.keys():
+            item = await self.read(key)
+            if item is not None:
+                yield item
+
+    async def size(self) -> int:
+        return await self.disk.size() if self.disk is not None else len(self.memory.keys())
+
+    async def close(self):
+        if self.disk is not None:
+            await self.disk.close()
+
+
+class AsyncTieredBackend(CacheBackend):
+    """aiohttp-client-cache backend built on `AsyncTieredStorage`."""
+
+    def __init__(self, cache_name: str = "ha_api_async", max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[str] = None, **kwargs):
+        # autoclose: closing the session also stops the SQLite worker thread
+        super().__init__(cache_name=cache_name, autoclose=bool(db_path), **kwargs)
+        self.responses = AsyncTieredStorage(max_entries, db_path, "async_responses")
+        self.redirects = AsyncTieredStorage(max_entries, db_path, "async_redirects", share_with=self.responses)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🏭 Factories used by client.py
+# ──────────────────────────────────────────────────────────────────────────────
+
+def build_sync_cache(env: HomeAssistantEnv) -> Tuple[TieredCache, Dict[str, Any]]:
+    """(backend, CachedSession expiry kwargs)."""
+    cache = TieredCache(max_entries=env.HA_CACHE_MAX_ENTRIES, db_path=env.HA_CACHE_DB)
+    expiry = {"expire_after": timedelta(seconds=env.HA_CACHE_TTL), "urls_expire_after": url_ttls(env)}
+    log.debug(f"🗃️ REST cache: memory ({env.HA_CACHE_MAX_ENTRIES} entries)" + (f" + SQLite {env.HA_CACHE_DB}" if env.HA_CACHE_DB else ""))
+    return cache, expiry
+
+
+def build_async_cache(env: HomeAssistantEnv) -> AsyncTieredBackend:
+    return AsyncTieredBackend(
+        max_entries=env.HA_CACHE_MAX_ENTRIES,
+        db_path=env.HA_CACHE_DB,
+        expire_after=timedelta(seconds=env.HA_CACHE_TTL),
+        urls_expire_after=url_ttls(env, AIO_DO_NOT_CACHE),
+    )
+
+
+def cache_stats(session: Any) -> Optional[Dict[str, Any]]:
+    """Memory-tier hit/miss counts for a client's cache session (None when caching is off)."""
+    backend = getattr(session, "cache", None)
+    storage = getattr(backend, "responses", None)
+    if not isinstance(storage, (TieredStorage, AsyncTieredStorage)):
+        return None
+    return {**storage.memory.stats(), "sqlite": storage.disk is not None}
@@ -6,6 +6,7 @@ from homer.utils.logger import get_module_logger
 import modules.ha_api.config 
 
 # Subcommand groups
+from modules.ha_api.cli_functions.analytics import analytics_cmd
 from modules.ha_api.cli_functions.auth import auth_cmd
 from modules.ha_api.cli_functions.client import client_cmd
 from modules.ha_api.cli_functions.context import context_cmd
@@ -15,12 +16,14 @@ from modules.ha_api.cli_functions.event import event_cmd
 from modules.ha_api.cli_functions.group import group_cmd
 from modules.ha_api.cli_functions.history import history_cmd
 from modules.ha_api.cli_functions.logbook import logbook_cmd
+from modules.ha_api.cli_functions.mirror import mirror_cmd
 from modules.ha_api.cli_functions.response import response_cmd
+from modules.ha_api.cli_functions.rules import rules_cmd
 from modules.ha_api.cli_functions.service import service_cmd
 from modules.ha_api.cli_functions.state import state_cmd
 from modules.ha_api.cli_functions.ws_client import ws_cmd
 
-from modules.ha_api.client import build_client  
+from modules.ha_api.client import get_client
 
 log = get_module_logger("ha_api")
 
@@ -33,6 +36,7 @@ def cli():
     pass
 
 # 🔌 Register CLI subcommands
+cli.add_command(analytics_cmd)
 cli.add_command(auth_cmd)
 cli.add_command(client_cmd)
 cli.add_command(context_cmd)
@@ -42,7 +46,9 @@ cli.add_command(event_cmd)
 cli.add_command(group_cmd)
 cli.add_command(history_cmd)
 cli.add_command(logbook_cmd)
+cli.add_command(mirror_cmd)
 cli.add_command(response_cmd)
+cli.add_command(rules_cmd)
 cli.add_command(service_cmd)
 cli.add_command(state_cmd)
 cli.add_command(ws_cmd)
@@ -53,11 +59,11 @@ cli.add_command(ws_cmd)
 @cli.command("ping", help="Ping the Home Assistant REST API.")
 def cli_ping():
     try:
-        with build_client() as client:
-            if client.check_api_running():
-                click.echo("✅ Home Assistant REST API is up.")
-            else:
-                click.echo("⚠️ API responded but may not be healthy.")
+        client = get_client()
+        if client.check_api_running():
+            click.echo("✅ Home Assistant REST API is up.")
+        else:
+            click.echo("⚠️ API responded but may not be healthy.")
     except Exception as e:
         click.echo("❌ Ping failed.")
         log.exception("Ping error")
@@ -69,14 +75,14 @@ def cli_ping():
 @cli.command("lights", help="List all light.* entities and their states")
 def list_lights():
     try:
-        with build_client() as client:
-            states = client.get_states()
-            lights = [s for s in states if s.entity_id.startswith("light.")]
-            if not lights:
-                click.echo("ℹ️ No lights found.")
-                return
-            for light in lights:
-                click.echo(f"{light.entity_id} → {light.state} ({light.attributes.get('friendly_name', '-')})")
+        client = get_client()
+        states = client.get_states()
+        lights = [s for s in states if s.entity_id.startswith("light.")]
+        if not lights:
+            click.echo("ℹ️ No lights found.")
+            return
+        for light in lights:
+            click.echo(f"{light.entity_id} → {light.state} ({light.attributes.get('friendly_name', '-')})")
     except Exception as e:
         click.echo("❌ Failed to fetch lights.")
         log.exception("lights error")
@@ -85,10 +91,10 @@ def list_lights():
 @cli.command("domains", help="List all service domains available in Home Assistant")
 def list_domains():
     try:
-        with build_client() as client:
-            domains = client.get_domains()
-            for domain in domains:
-                click.echo(f"📂 {domain}")
+        client = get_client()
+        domains = client.get_domains()
+        for domain in domains:
+            click.echo(f"📂 {domain}")
     except Exception as e:
         click.echo("❌ Failed to fetch domains.")
         log.exception("domains error")
@@ -97,10 +103,10 @@ def list_domains():
 @cli.command("components", help="Show all registered HA components")
 def list_components():
     try:
-        with build_client() as client:
-            components = client.get_components()
-            for component in components:
-                click.echo(f"🔧 {component}")
+        client = get_client()
+        components = client.get_components()
+        for component in components:
+            click.echo(f"🔧 {component}")
     except Exception as e:
         click.echo("❌ Failed to fetch components.")
         log.exception("components error")
@@ -109,10 +115,10 @@ def list_components():
 @cli.command("config", help="Show HA config info (name, version, timezone, etc)")
 def get_config():
     try:
-        with build_client() as client:
-            config = client.get_config()
-            for k, v in config.items():
-                click.echo(f"{k}: {v}")
+        client = get_client()
+        config = client.get_config()
+        for k, v in config.items():
+            click.echo(f"{k}: {v}")
     except Exception as e:
         click.echo("❌ Failed to fetch config.")
         log.exception("config error")
@@ -121,9 +127,9 @@ def get_config():
 @cli.command("log", help="Get latest Home Assistant error log")
 def get_error_log():
     try:
-        with build_client() as client:
-            error_log = client.get_error_log()
-            click.echo(error_log)
+        client = get_client()
+        error_log = client.get_error_log()
+        click.echo(error_log)
     except Exception as e:
         click.echo("❌ Failed to fetch error log.")
         log.exception("log error")
@@ -133,14 +139,14 @@ def get_error_log():
 @click.argument("entity_id")
 def get_state(entity_id):
     try:
-        with build_client() as client:
-            state = client.get_state(entity_id=entity_id)
-            if not state:
-                click.echo(f"⚠️ No state found for: {entity_id}")
-            else:
-                click.echo(f"{state.entity_id} → {state.state}")
-                for k, v in state.attributes.items():
-                    click.echo(f"  • {k}: {v}")
+        client = get_client()
+        state = client.get_state(entity_id=entity_id)
+        if not state:
+            click.echo(f"⚠️ No state found for: {entity_id}")
+        else:
+            click.echo(f"{state.entity_id} → {state.state}")
+            for k, v in state.attributes.items():
+                click.echo(f"  • {k}: {v}")
     except Exception as e:
         click.echo(f"❌ Failed to get state for {entity_id}")
         log.exception("get_state error")
@@ -0,0 +1,133 @@
+import click
+import math
+from datetime import datetime
+
+from homer.utils.logger import get_module_logger
+from modules.ha_api.logic import history_analytics as analytics_logic
+from modules.ha_api.logic import history_fetch as fetch_logic
+from modules.ha_api.logic.history_store import HistoryStore
+
+log = get_module_logger("ha_api.analytics.cli")
+
+
+def _fmt_seconds(seconds: float) -> str:
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h{rest // 60:02d}m"
+
+
+def _fmt(value) -> str:
+    return "-" if value is None or (isinstance(value, float) and math.isnan(value)) else f"{value:.2f}"
+
+
+def _load(entities, days, hours, no_sync, db):
+    start, end = fetch_logic.since(days=days, hours=hours)
+    entity_ids = fetch_logic.resolve_entity_ids(entities)
+    with HistoryStore(db) as store:
+        return start, end, analytics_logic.load_series(entity_ids, start, end, store=store, sync=not no_sync)
+
+
+def _range_options(fn):
+    fn = click.option("--db", help="History store path (default: HA_HISTORY_DB).")(fn)
+    fn = click.option("--no-sync", is_flag=True, help="Use stored history only; don't fetch missing ranges.")(fn)
+    fn = click.option("--hours", default=0.0, help="Look back this many hours (added to --days).")(fn)
+    fn = click.option("--days", default=7.0, show_default=True, help="Look back this many days.")(fn)
+    fn = click.option("--entity", "entities", multiple=True, required=True, help="Entity ID or glob (repeatable).")(fn)
+    return fn
+
+
+@click.group(
+    name="analytics",
+    help="📊 History Analytics — Duty cycles, time-in-state, resampling and gaps over stored history"
+)
+def analytics_cmd():
+    pass
+
+
+@analytics_cmd.command("report", help="Duty cycle and switch counts (on/off entities) or mean/min/max (sensors).")
+@_range_options
+@click.option("--on-state", "on_states", multiple=True, help="States counted as 'on' (repeatable; default: on, open, home, ...).")
+def report(entities, days, hours, no_sync, db, on_states):
+    try:
+        start, end, series = _load(entities, days, hours, no_sync, db)
+        end_ts = end.timestamp()
+        for entity_id, s in series.items():
+            row = analytics_logic.summarize(entity_id, s, end_ts, on_states or analytics_logic.ON_STATES)
+            down = f", unavailable {_fmt_seconds(row['unavailable_seconds'])}" if row["unavailable_seconds"] else ""
+            if row["kind"] == "numeric":
+                click.echo(f"📈 {entity_id}: mean {_fmt(row['mean'])}, min {_fmt(row['min'])}, max {_fmt(row['max'])} ({row['samples']} samples{down})")
+            else:
+                duty = "-" if row["duty_cycle"] is None else f"{row['duty_cycle'] * 100:.1f}%"
+                click.echo(f"🔌 {entity_id}: on {duty}, {row['turn_on']} on / {row['turn_off']} off switches, {row['changes']} changes{down}")
+    except Exception as e:
+        log.exception("Failed to build analytics report")
+        click.echo(f"❌ Error: {e}")
+
+
+@analytics_cmd.command("time-in-state", help="Time spent in each state.")
+@_range_options
+@click.option("--top", default=10, show_default=True, help="Show at most this many states per entity.")
+def time_in_state(entities, days, hours, no_sync, db, top):
+    try:
+        start, end, series = _load(entities, days, hours, no_sync, db)
+        for entity_id, s in series.items():
+            totals = analytics_logic.time_in_state(s, end.timestamp())
+            span = sum(totals.values()) or 1
+            click.echo(f"⏱️ {entity_id}")
+            for state, seconds in sorted(totals.items(), key=lambda kv: -kv[1])[:top]:
+                click.echo(f"  • {state}: {_fmt_seconds(seconds)} ({seconds / span * 100:.1f}%)")
+    except Exception as e:
+        log.exception("Failed to compute time in state")
+        click.echo(f"❌ Error: {e}")
+
+
+@analytics_cmd.command("resample", help="Time-weighted mean/min/max of numeric sensors per bucket.")
+@_range_options
+@click.option("--bucket-minutes", default=60.0, show_default=True, help="Bucket size.")
+def resample(entities, days, hours, no_sync, db, bucket_minutes):
+    try:
+        start, end, series = _load(entities, days, hours, no_sync, db)
+        for entity_id, s in series.items():
+            buckets = analytics_logic.resample(s, start.timestamp(), end.timestamp(), bucket_minutes * 60)
+            if all(math.isnan(v) for v in buckets["mean"]):
+                click.echo(f"ℹ️ {entity_id}: no numeric states")
+                continue
+            click.echo(f"📈 {entity_id}")
+            for ts, mean, low, high in zip(buckets["start"], buckets["mean"], buckets["min"], buckets["max"]):
+                click.echo(f"  {datetime.fromtimestamp(ts):%Y-%m-%d %H:%M}  mean {_fmt(mean)}  min {_fmt(low)}  max {_fmt(high)}")
+    except Exception as e:
+        log.exception("Failed to resample history")
+        click.echo(f"❌ Error: {e}")
+
+
+@analytics_cmd.command("gaps", help="Unavailable periods, and optionally stretches with no updates.")
+@_range_options
+@click.option("--min-minutes", default=15.0, show_default=True, help="Shortest gap to report.")
+@click.option("--silence", is_flag=True, help="Also report periods with no state updates at all.")
+def gaps(entities, days, hours, no_sync, db, min_minutes, silence):
+    try:
+        start, end, series = _load(entities, days, hours, no_sync, db)
+        for entity_id, s in series.items():
+            found = analytics_logic.gaps(s, end.timestamp(), min_minutes * 60, silence=silence)
+            if not found:
+                continue
+            click.echo(f"🕳️ {entity_id}: {len(found)} gap(s)")
+            for gap in found:
+                click.echo(f"  • {datetime.fromtimestamp(gap['start']):%Y-%m-%d %H:%M} for {_fmt_seconds(gap['seconds'])} ({gap['reason']})")
+    except Exception as e:
+        log.exception("Failed to find gaps")
+        click.echo(f"❌ Error: {e}")
+
+
+@analytics_cmd.command("bench", help="Benchmark the analytics on synthetic multi-entity history (no HA needed).")
+@click.option("--entities", default=200, show_default=True, help="Number of synthetic entities.")
+@click.option("--days", default=30.0, show_default=True, help="Days of history per entity.")
+@click.option("--interval", default=300.0, show_default=True, help="Mean seconds between state changes.")
+def bench(entities, days, interval):
+    try:
+        result = analytics_logic.benchmark(entities=entities, days=days, interval=interval)
+        click.echo(f"🏁 {result['entities']} entities × {result['days']:g} days = {result['samples']:,} samples")
+        for name, ms in result["timings_ms"].items():
+            click.echo(f"  • {name}: {ms} ms")
+    except Exception as e:
+        log.exception("Benchmark failed")
+        click.echo(f"❌ Error: {e}")
@@ -1,7 +1,7 @@
 import click
 from homer.utils.logger import get_module_logger
 from modules.ha_api.logic import client as client_logic
-import asyncio
+from modules.ha_api.client import run_async
 
 log = get_module_logger("ha_api.client.cli")
 
@@ -249,7 +249,7 @@ def check_config():
 @client_cmd.command("async-states", help="List all states (async).")
 def async_list_states():
     try:
-        states = asyncio.run(client_logic.async_get_states())
+        states = run_async(client_logic.async_get_states())
         click.echo(f"⚡ Found {len(states)} states (via async):")
         for state in states:
             click.echo(f"{state.entity_id}: {state.state}")
@@ -261,7 +261,7 @@ def async_list_states():
 @click.option("--id", "entity_id", required=True, help="Entity ID")
 def async_get_state(entity_id):
     try:
-        state = asyncio.run(client_logic.async_get_state(entity_id))
+        state = run_async(client_logic.async_get_state(entity_id))
         if state:
             click.echo(f"⚡ {state.entity_id}: {state.state}")
         else:
@@ -277,7 +277,7 @@ def async_get_state(entity_id):
 def async_trigger(domain, service, data):
     try:
         payload = dict(kv.split("=", 1) for kv in data)
-        states = asyncio.run(client_logic.async_trigger_service(domain, service, **payload))
+        states = run_async(client_logic.async_trigger_service(domain, service, **payload))
         click.echo(f"⚡ Service triggered: {domain}.{service}")
         click.echo(f"🔄 States changed: {len(states)}")
     except Exception as e:
@@ -287,7 +287,7 @@ def async_trigger(domain, service, data):
 @client_cmd.command("async-config", help="Get HA config (async).")
 def async_config():
     try:
-        config = asyncio.run(client_logic.async_get_config())
+        config = run_async(client_logic.async_get_config())
         click.echo("⚡ Async Config Result:")
         click.echo(config)
     except Exception as e:
@@ -1,8 +1,10 @@
 import click
-from datetime import datetime
+from datetime import datetime, timedelta
 from modules.ha_api.logic import client as client_logic
 from modules.ha_api.logic import history as history_logic
 from modules.ha_api.logic import entity as entity_logic
+from modules.ha_api.logic import history_fetch as fetch_logic
+from modules.ha_api.logic.history_store import HistoryStore
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("ha_api.history.cli")
@@ -63,3 +65,85 @@ def all_states(entity_id):
     except Exception as e:
         log.exception("Failed to list all states")
         click.echo(f"❌ Error: {e}")
+
+
+def _range(days, hours):
+    if not days and not hours:
+        raise click.BadParameter("Give --days and/or --hours")
+    return fetch_logic.since(days=days, hours=hours)
+
+
+@history_cmd.command("fetch", help="Stream history for many entities in parallel time windows.")
+@click.option("--entity", "entities", multiple=True, required=True, help="Entity ID or glob (repeatable, e.g. 'light.*').")
+@click.option("--days", default=0.0, help="Look back this many days.")
+@click.option("--hours", default=0.0, help="Look back this many hours.")
+@click.option("--window-hours", default=24.0, show_default=True, help="Size of each request window.")
+@click.option("--workers", default=fetch_logic.DEFAULT_WORKERS, show_default=True, help="Windows fetched in parallel.")
+@click.option("--significant-only", is_flag=True, help="Only significant state changes.")
+@click.option("--quiet", is_flag=True, help="Only print per-entity counts.")
+def fetch_history(entities, days, hours, window_hours, workers, significant_only, quiet):
+    try:
+        start, end = _range(days, hours)
+        entity_ids = fetch_logic.resolve_entity_ids(entities)
+        counts = {}
+        for rows in fetch_logic.iter_history_rows(
+            entity_ids, start, end,
+            window=timedelta(hours=window_hours),
+            workers=workers,
+            significant_changes_only=significant_only,
+        ):
+            for row in rows:
+                counts[row["entity_id"]] = counts.get(row["entity_id"], 0) + 1
+                if not quiet:
+                    click.echo(f"{row['last_changed']}  {row['entity_id']} → {row['state']}")
+        for entity_id, count in sorted(counts.items()):
+            click.echo(f"📘 {entity_id}: {count} state(s)")
+    except Exception as e:
+        log.exception("Failed to fetch history")
+        click.echo(f"❌ Error: {e}")
+
+
+@history_cmd.command("sync", help="Top up the local history store; only missing ranges are fetched.")
+@click.option("--entity", "entities", multiple=True, required=True, help="Entity ID or glob (repeatable).")
+@click.option("--days", default=0.0, help="Keep this many days stored.")
+@click.option("--hours", default=0.0, help="Keep this many hours stored.")
+@click.option("--window-hours", default=24.0, show_default=True, help="Size of each request window.")
+@click.option("--workers", default=fetch_logic.DEFAULT_WORKERS, show_default=True, help="Windows fetched in parallel.")
+@click.option("--no-attributes", is_flag=True, help="Store states only (smaller, faster).")
+@click.option("--db", help="Store path (default: HA_HISTORY_DB).")
+def sync_history(entities, days, hours, window_hours, workers, no_attributes, db):
+    try:
+        start, end = _range(days, hours)
+        entity_ids = fetch_logic.resolve_entity_ids(entities)
+        with HistoryStore(db) as store:
+            stats = store.sync(
+                entity_ids, start, end,
+                window=timedelta(hours=window_hours),
+                workers=workers,
+                attributes=not no_attributes,
+            )
+            click.echo(
+                f"✅ {stats['entities']} entities: {stats['rows']} new row(s) from "
+                f"{stats['ranges']} missing range(s) in {stats['elapsed_ms']} ms"
+            )
+    except Exception as e:
+        log.exception("Failed to sync history store")
+        click.echo(f"❌ Error: {e}")
+
+
+@history_cmd.command("stored", help="Show what the local history store covers.")
+@click.option("--db", help="Store path (default: HA_HISTORY_DB).")
+@click.option("--prune-days", type=float, help="First drop rows older than this many days.")
+def stored_history(db, prune_days):
+    try:
+        with HistoryStore(db) as store:
+            if prune_days is not None:
+                removed = store.prune(fetch_logic.since(days=prune_days)[0])
+                click.echo(f"🧹 Pruned {removed} row(s)")
+            stats = store.stats()
+            click.echo(f"🗄️ {stats['path']}: {stats['rows']} row(s), {stats['entities']} entities, {stats['size_bytes'] / 1e6:.1f} MB")
+            for entity_id, (start, end) in sorted(store.coverage().items()):
+                click.echo(f"  • {entity_id}: {datetime.fromtimestamp(start):%Y-%m-%d %H:%M} → {datetime.fromtimestamp(end):%Y-%m-%d %H:%M}")
+    except Exception as e:
+        log.exception("Failed to read history store")
+        click.echo(f"❌ Error: {e}")
@@ -1,6 +1,8 @@
 import click
+from datetime import timedelta
 from modules.ha_api.logic import client as client_logic
 from modules.ha_api.logic import logbook as logbook_logic
+from modules.ha_api.logic import history_fetch as fetch_logic
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("ha_api.logbook.cli")
@@ -57,3 +59,23 @@ def only_messages(limit):
     except Exception as e:
         log.exception("Failed to fetch message-only log entries")
         click.echo(f"❌ Error: {e}")
+
+
+@logbook_cmd.command("fetch", help="Stream logbook entries over a long range in parallel windows.")
+@click.option("--entity", "entities", multiple=True, help="Entity ID or glob (repeatable); all entries if omitted.")
+@click.option("--days", default=1.0, show_default=True, help="Look back this many days.")
+@click.option("--window-hours", default=24.0, show_default=True, help="Size of each request window.")
+@click.option("--workers", default=fetch_logic.DEFAULT_WORKERS, show_default=True, help="Windows fetched in parallel.")
+def fetch_entries(entities, days, window_hours, workers):
+    try:
+        start, end = fetch_logic.since(days=days)
+        entity_ids = fetch_logic.resolve_entity_ids(entities) if entities else None
+        count = 0
+        for entry in fetch_logic.iter_logbook_entries(entity_ids, start, end, window=timedelta(hours=window_hours), workers=workers):
+            info = logbook_logic.describe_entry(entry)
+            click.echo(f"- [{info['timestamp']}] {info['name']}: {info['message'] or info['state'] or '[no message]'}")
+            count += 1
+        click.echo(f"🗒️ {count} entries")
+    except Exception as e:
+        log.exception("Failed to fetch logbook entries")
+        click.echo(f"❌ Error: {e}")
@@ -0,0 +1,82 @@
+import click
+import fnmatch
+import time
+
+from homer.utils.logger import get_module_logger
+from modules.ha_api.logic import state_mirror as mirror_logic
+
+log = get_module_logger("ha_api.mirror.cli")
+
+
+def _ready_mirror(timeout: float):
+    mirror = mirror_logic.get_state_mirror()
+    if not mirror.wait_ready(timeout):
+        raise TimeoutError(f"State mirror not ready after {timeout}s")
+    return mirror
+
+
+@click.group(
+    name="mirror",
+    help="🪞 State Mirror — Live in-memory copy of HA states fed by the WebSocket stream"
+)
+def mirror_cmd():
+    pass
+
+
+@mirror_cmd.command("stats", help="Bootstrap the mirror and show entity counts per domain.")
+@click.option("--timeout", default=30.0, show_default=True, help="Seconds to wait for the initial snapshot.")
+def mirror_stats(timeout):
+    try:
+        mirror = _ready_mirror(timeout)
+        stats = mirror.stats()
+        click.echo(f"✅ Mirroring {stats['entities']} entities across {stats['domains']} domains")
+        for domain, count in mirror.domains().items():
+            click.echo(f"📂 {domain}: {count}")
+    except Exception as e:
+        log.exception("Failed to load state mirror")
+        click.echo(f"❌ Error: {e}")
+    finally:
+        mirror_logic.stop_state_mirror()
+
+
+@mirror_cmd.command("domain", help="List mirrored states for a domain.")
+@click.argument("domain")
+@click.option("--timeout", default=30.0, show_default=True, help="Seconds to wait for the initial snapshot.")
+def mirror_domain(domain, timeout):
+    try:
+        states = _ready_mirror(timeout).domain(domain)
+        if not states:
+            click.echo(f"ℹ️ No entities in domain '{domain}'.")
+            return
+        for state in states:
+            click.echo(f"{state.entity_id} → {state.state} ({state.attributes.get('friendly_name', '-')})")
+    except Exception as e:
+        log.exception("Failed to list mirrored domain")
+        click.echo(f"❌ Error: {e}")
+    finally:
+        mirror_logic.stop_state_mirror()
+
+
+@mirror_cmd.command("watch", help="Print state changes as the mirror applies them (Ctrl+C to stop).")
+@click.option("--entity", "pattern", default="*", show_default=True, help="Entity ID glob (e.g. 'light.*').")
+@click.option("--timeout", default=30.0, show_default=True, help="Seconds to wait for the initial snapshot.")
+def mirror_watch(pattern, timeout):
+    def echo_change(entity_id, old, new):
+        if fnmatch.fnmatchcase(entity_id, pattern):
+            before = old.state if old else "∅"
+            after = new.state if new else "removed"
+            click.echo(f"🔄 {entity_id}: {before} → {after}")
+
+    try:
+        mirror = _ready_mirror(timeout)
+        mirror.add_listener(echo_change)
+        click.echo(f"👂 Watching {pattern} ({mirror.stats()['entities']} entities mirrored)")
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        click.echo("🛑 Stopped.")
+    except Exception as e:
+        log.exception("State mirror watch failed")
+        click.echo(f"❌ Error: {e}")
+    finally:
+        mirror_logic.stop_state_mirror()
@@ -0,0 +1,93 @@
+import click
+import time
+
+from homer.utils.logger import get_module_logger
+from modules.ha_api.logic import rules_engine as rules_logic
+
+log = get_module_logger("ha_api.rules.cli")
+
+
+@click.group(
+    name="rules",
+    help="🤖 Rules Engine — Event-driven automations (YAML) evaluated against the HA event stream"
+)
+def rules_cmd():
+    pass
+
+
+@rules_cmd.command("check", help="Validate a rules file and show how its triggers are indexed.")
+@click.option("--file", "path", required=True, type=click.Path(exists=True, dir_okay=False), help="Rules file (YAML or JSON).")
+def check_rules(path):
+    try:
+        rules = rules_logic.load_rules(path)
+        index = rules_logic.RuleIndex(rules)
+        click.echo(f"✅ {len(rules)} rule(s), {index.rules} enabled")
+        click.echo(f"👂 Subscribes to: {', '.join(sorted(index.event_types)) or '-'}")
+        click.echo(
+            f"🗂️ Indexed triggers: {len(index.by_entity)} entities, {len(index.by_domain)} domains, "
+            f"{len(index.by_event)} event types, {len(index.globs)} other globs"
+        )
+        for rule in rules:
+            flag = "" if rule.enabled else " (disabled)"
+            click.echo(f"  • {rule.id}{flag}: {len(rule.triggers)} trigger(s), {len(rule.conditions)} condition(s), "
+                       f"{len(rule.actions)} action(s), mode {rule.mode}/{rule.max}")
+    except Exception as e:
+        log.exception("Invalid rules file")
+        click.echo(f"❌ Error: {e}")
+
+
+@rules_cmd.command("match", help="Show which rules an event would trigger (conditions not checked; no HA needed).")
+@click.option("--file", "path", required=True, type=click.Path(exists=True, dir_okay=False), help="Rules file (YAML or JSON).")
+@click.option("--entity", help="Entity ID of a state change.")
+@click.option("--from", "from_state", help="Old state.")
+@click.option("--to", "to_state", help="New state.")
+@click.option("--event", "event_type", help="Event type (instead of a state change).")
+def match_rules(path, entity, from_state, to_state, event_type):
+    try:
+        if not entity and not event_type:
+            raise click.UsageError("Pass --entity or --event")
+        index = rules_logic.RuleIndex(rules_logic.load_rules(path))
+        if entity:
+            event = {"event_type": "state_changed", "data": {
+                "entity_id": entity,
+                "old_state": {"state": from_state} if from_state is not None else None,
+                "new_state": {"state": to_state} if to_state is not None else None,
+            }}
+        else:
+            event = {"event_type": event_type, "data": {}}
+        matched = [rule.id for rule in index.match(event)]
+        click.echo(f"🎯 {len(matched)} rule(s) match: {', '.join(matched)}" if matched else "ℹ️ No rules match")
+    except click.UsageError:
+        raise
+    except Exception as e:
+        log.exception("Failed to match rules")
+        click.echo(f"❌ Error: {e}")
+
+
+@rules_cmd.command("run", help="Run a rules file against the live event stream (Ctrl+C to stop).")
+@click.option("--file", "path", required=True, type=click.Path(exists=True, dir_okay=False), help="Rules file (YAML or JSON).")
+@click.option("--stats-every", default=60.0, show_default=True, help="Seconds between stats lines (0 to disable).")
+def run_rules(path, stats_every):
+    engine = None
+    try:
+        engine = rules_logic.start_rules_engine(path)
+        stats = engine.stats()
+        click.echo(f"🤖 Running {stats['rules']} rule(s) on {', '.join(stats['event_types'])} — Ctrl+C to stop")
+        last = time.monotonic()
+        while True:
+            time.sleep(1)
+            if stats_every and time.monotonic() - last >= stats_every:
+                last = time.monotonic()
+                runs = sum(rule.runs for rule in engine.rules.values())
+                click.echo(f"📊 {engine.events_received} event(s), {runs} run(s), {engine.stats()['running']} running")
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        log.exception("Rules engine failed")
+        click.echo(f"❌ Error: {e}")
+    finally:
+        if engine is not None:
+            rules_logic.stop_rules_engine()
+            for rule in engine.rules.values():
+                s = rule.stats()
+                click.echo(f"  • {s['id']}: {s['runs']} run(s), {s['skipped']} skipped, {s['blocked']} blocked, {s['failures']} failed")
@@ -1,6 +1,8 @@
 import click
+import json
 from homer.utils.logger import get_module_logger
 from modules.ha_api.logic import service as service_logic
+from modules.ha_api.logic import bulk_service as bulk_logic
 
 log = get_module_logger("ha_api.service.cli")
 
@@ -88,3 +90,41 @@ def async_trigger_service(service_id, domain, entity_id, data):
             click.echo(f"❌ Error: {e}")
 
     asyncio.run(run_async())
+
+
+@service_cmd.command("bulk", help="Run many service calls from a YAML/JSON plan over the shared WebSocket.")
+@click.option("--file", "plan_file", required=True, type=click.Path(exists=True, dir_okay=False), help="Plan file (YAML or JSON).")
+@click.option("--concurrency", type=int, help=f"Requests in flight at once (default: plan value or {bulk_logic.DEFAULT_CONCURRENCY}).")
+@click.option("--max-batch", default=bulk_logic.DEFAULT_MAX_BATCH, show_default=True, help="Most entities merged into one call.")
+@click.option("--no-coalesce", is_flag=True, help="Send every call as written, without merging targets.")
+@click.option("--dry-run", is_flag=True, help="Show the requests that would be sent, then exit.")
+@click.option("--failures-only", is_flag=True, help="Only list targets that failed.")
+def bulk_service(plan_file, concurrency, max_batch, no_coalesce, dry_run, failures_only):
+    try:
+        plan = bulk_logic.load_plan(plan_file)
+        coalesce = False if no_coalesce else None
+
+        if dry_run:
+            batches = bulk_logic.build_batches(plan["calls"], coalesce=plan.get("coalesce", True) if coalesce is None else coalesce, max_batch=max_batch)
+            click.echo(f"🧮 {len(plan['calls'])} call(s) → {len(batches)} request(s)")
+            for batch in batches:
+                targets = ", ".join(batch["entity_ids"]) or (json.dumps(batch["target"]) if batch["target"] else "-")
+                click.echo(f"  • {batch['domain']}.{batch['service']} → {targets}")
+            return
+
+        run = bulk_logic.execute_plan(plan, concurrency=concurrency, coalesce=coalesce, max_batch=max_batch)
+        for row in run["results"]:
+            if row["ok"] and failures_only:
+                continue
+            icon = "✅" if row["ok"] else "❌"
+            detail = f" — {row['error']}" if row["error"] else ""
+            click.echo(f"{icon} {row['call']} → {row['target'] or '-'} ({row['elapsed_ms']} ms, batch {row['batch']} × {row['batch_size']}){detail}")
+
+        summary = run["summary"]
+        click.echo(
+            f"📦 {summary['calls']} call(s), {summary['targets']} target(s) in {summary['requests']} request(s): "
+            f"{summary['succeeded']} ok, {summary['failed']} failed, {summary['elapsed_ms']} ms"
+        )
+    except Exception as e:
+        log.exception("Bulk service run failed")
+        click.echo(f"❌ Error: {e}")
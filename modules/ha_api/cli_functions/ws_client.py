@@ -1,9 +1,9 @@
 import click
 import json
-import asyncio
+from itertools import islice
 
 from homer.utils.logger import get_module_logger
-from modules.ha_api.cli_functions import ws_client as ws_logic
+from modules.ha_api.logic import ws_client as ws_logic
 
 log = get_module_logger("ha_api.ws_client.cli")
 
@@ -64,17 +64,45 @@ def ws_domains():
         click.echo(f"❌ Error: {e}")
 
 
-@ws_cmd.command("template", help="Render a Jinja2 template via WebSocket.")
-@click.option("--text", required=True, help="Template string to render")
-def ws_template(text):
+@ws_cmd.command("template", help="Render Jinja2 templates via WebSocket (several --text render in one round-trip).")
+@click.option("--text", "texts", required=True, multiple=True, help="Template string to render (repeatable)")
+def ws_template(texts):
     try:
-        result = ws_logic.get_rendered_template(text)
-        click.echo(f"✅ Rendered Template:\n{result}")
+        if len(texts) == 1:
+            result = ws_logic.get_rendered_template(texts[0])
+            click.echo(f"✅ Rendered Template:\n{result}")
+            return
+        for item in ws_logic.get_rendered_templates(list(texts)):
+            if item["error"]:
+                click.echo(f"❌ {item['template']} → {item['error']}")
+            else:
+                click.echo(f"✅ {item['template']} → {item['result']}")
     except Exception as e:
         log.exception("Failed to render WS template")
         click.echo(f"❌ Error: {e}")
 
 
+@ws_cmd.command("watch-template", help="Print a template's result each time Home Assistant re-renders it (Ctrl+C to stop).")
+@click.option("--text", required=True, help="Template string to watch")
+def ws_watch_template(text):
+    import time
+    from modules.ha_api.logic.template_renderer import get_template_renderer
+
+    def show(result, error):
+        click.echo(f"❌ {error}" if error else f"🔁 {result}")
+
+    try:
+        unwatch = get_template_renderer().watch(text, show)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            unwatch()
+    except Exception as e:
+        log.exception("Failed to watch WS template")
+        click.echo(f"❌ Error: {e}")
+
+
 @ws_cmd.command("fire", help="Fire an event via WebSocket.")
 @click.option("--type", "event_type", required=True, help="Event type (e.g. test_event)")
 @click.option("--data", multiple=True, help="Event payload as key=value")
@@ -115,3 +143,32 @@ def ws_trigger_service_response(domain, service, data):
     except Exception as e:
         log.exception("Failed to trigger WS service with response")
         click.echo(f"❌ Error: {e}")
+
+
+@ws_cmd.command("listen", help="Stream events over the shared WebSocket (Ctrl+C to stop).")
+@click.option("--type", "event_type", default=None, help="Event type to listen for (default: all)")
+@click.option("--limit", type=int, default=None, help="Stop after N events")
+def ws_listen(event_type, limit):
+    events = ws_logic.listen_events(event_type)
+    try:
+        click.echo(f"👂 Listening for {event_type or 'all events'}...")
+        for event in islice(events, limit):
+            click.echo(f"📨 {event.event_type}: {json.dumps(event.data, default=str)}")
+    except KeyboardInterrupt:
+        click.echo("🛑 Stopped.")
+    except Exception as e:
+        log.exception("Failed to listen for WS events")
+        click.echo(f"❌ Error: {e}")
+    finally:
+        events.close()  # unsubscribes
+
+
+@ws_cmd.command("stats", help="Show shared WebSocket connection status.")
+def ws_stats():
+    try:
+        ws_logic.ping()
+        for key, value in ws_logic.get_connection_stats().items():
+            click.echo(f"{key}: {value}")
+    except Exception as e:
+        log.exception("Failed to fetch WS stats")
+        click.echo(f"❌ Error: {e}")
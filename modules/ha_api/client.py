@@ -1,14 +1,30 @@
-from datetime import timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Union
+import asyncio
+import atexit
 import os
+import threading
 
+import aiohttp
+import requests
 from homeassistant_api import Client
+from requests.adapters import HTTPAdapter
+from modules.ha_api.cache import build_async_cache, build_sync_cache, cache_stats
 from modules.ha_api.config import HomeAssistantEnv
+from homer.utils.logger import get_module_logger
 
-# Optional persistent cache backends
+# Tiered (memory, optionally SQLite) response caches; see modules/ha_api/cache.py
 from requests_cache import CachedSession
 from aiohttp_client_cache import CachedSession as AioCachedSession
-from aiohttp_client_cache.backends.filesystem import FileBackend
+
+log = get_module_logger("ha_api.client")
+
+DEFAULT_POOL_SIZE = 10
+
+# Process-owned clients, reused by every logic/route/CLI call
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+_async_client: Optional[Client] = None
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
 
 
 def get_env(required: bool = False, safe: bool = False) -> Optional[HomeAssistantEnv]:
@@ -28,27 +44,121 @@ def get_env(required: bool = False, safe: bool = False) -> Optional[HomeAssistan
         raise
 
 
+def get_ws_url(env: HomeAssistantEnv) -> str:
+    """WebSocket API URL: HA_WS_URL (http(s) schemes mapped to ws(s)) or HA_API_URL + '/websocket'."""
+    url = str(env.HA_WS_URL or f"{str(env.HA_API_URL).rstrip('/')}/websocket")
+    if url.startswith("http"):
+        url = "ws" + url[len("http"):]
+    return url
+
+
+def _credentials(env: HomeAssistantEnv):
+    return str(env.HA_API_URL), str(env.HA_API_TOKEN.get_secret_value())
+
+
+def _sync_session(env: HomeAssistantEnv) -> Union[CachedSession, requests.Session]:
+    """Requests session with a keep-alive connection pool, cached when HA_ENABLE_CACHE is set."""
+    if env.HA_ENABLE_CACHE:
+        backend, expiry = build_sync_cache(env)
+        session = CachedSession(backend=backend, **expiry)
+    else:
+        session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=env.HA_POOL_SIZE, pool_maxsize=env.HA_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _async_session(env: HomeAssistantEnv) -> Union[AioCachedSession, aiohttp.ClientSession]:
+    """aiohttp session, cached when HA_ENABLE_CACHE is set; must be created inside the loop that will use it."""
+    connector = aiohttp.TCPConnector(limit=env.HA_POOL_SIZE)
+    if env.HA_ENABLE_CACHE:
+        return AioCachedSession(cache=build_async_cache(env), connector=connector)
+    return aiohttp.ClientSession(connector=connector)
+
+
 def build_client(use_async: bool = False) -> Client:
     """
-    Constructs a Home Assistant Client with optional persistent caching.
+    Constructs a new Home Assistant Client, with response caching if HA_ENABLE_CACHE is set.
+    Prefer `get_client()` / `get_async_client()`, which reuse one client per process.
     """
     env = get_env(required=True)
-
-    token = str(env.HA_API_TOKEN.get_secret_value())
-    url = str(env.HA_API_URL)
+    url, token = _credentials(env)
 
     if use_async:
-        session = AioCachedSession(
-            cache=FileBackend(
-                cache_name=".homer_ha_api_cache_async",
-                expire_after=timedelta(minutes=5)
-            )
-        )
-        return Client(url, token, use_async=True, cache_session=session)
-    else:
-        session = CachedSession(
-            cache_name=".homer_ha_api_cache",
-            backend="filesystem",
-            expire_after=timedelta(minutes=5)
-        )
-        return Client(url, token, cache_session=session)
+        return Client(url, token, use_async=True, async_cache_session=_async_session(env))
+    return Client(url, token, cache_session=_sync_session(env))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ♻️ Shared clients
+# ──────────────────────────────────────────────────────────────────────────────
+
+def get_client() -> Client:
+    """Return the process-wide sync client, creating its pooled session on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = build_client()
+                log.info("✅ Home Assistant client initialized")
+    return _client
+
+
+async def get_async_client() -> Client:
+    """
+    Return the shared async client for the running event loop.
+    aiohttp sessions are bound to one loop, so a new loop (e.g. a fresh
+    `asyncio.run()`) gets a fresh client.
+    """
+    global _async_client, _async_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_loop is not loop:
+        if _async_client is not None and not _async_loop.is_closed():
+            log.warning("⚠️ Async Home Assistant client used from a new event loop; replacing it")
+        _async_client = build_client(use_async=True)
+        _async_loop = loop
+        log.info("✅ Home Assistant async client initialized")
+    return _async_client
+
+
+def close_client():
+    """Close the shared sync client's session and connection pool."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.cache_session.close()
+            _client = None
+            log.debug("🔌 Closed Home Assistant client")
+
+
+async def close_async_client():
+    """Close the shared async client's session (API shutdown hook)."""
+    global _async_client, _async_loop
+    client, _async_client, _async_loop = _async_client, None, None
+    if client is not None:
+        await client.async_cache_session.close()
+        log.debug("🔌 Closed Home Assistant async client")
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Response-cache counters for the shared clients that exist (None per client when caching is off)."""
+    stats: Dict[str, Any] = {}
+    if _client is not None:
+        stats["sync"] = cache_stats(_client.cache_session)
+    if _async_client is not None:
+        stats["async"] = cache_stats(_async_client.async_cache_session)
+    return stats
+
+
+def run_async(coro):
+    """`asyncio.run()` for CLI commands, closing the loop's shared client afterwards."""
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await close_async_client()
+    return asyncio.run(runner())
+
+
+atexit.register(close_client)
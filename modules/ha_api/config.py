@@ -1,6 +1,6 @@
 from pathlib import Path
 from typing import Optional
-from pydantic import BaseModel, HttpUrl, SecretStr
+from pydantic import AnyUrl, BaseModel, HttpUrl, SecretStr
 
 from homer.utils.config import register_module_env, write_env_example
 
@@ -13,8 +13,18 @@ class HomeAssistantEnv(BaseModel):
 
     HA_API_URL: Optional[HttpUrl] = None
     HA_API_TOKEN: Optional[SecretStr] = None
-    HA_WS_URL: Optional[HttpUrl] = None
+    HA_WS_URL: Optional[AnyUrl] = None   # ws(s)://…/api/websocket; derived from HA_API_URL if unset
     HA_ENABLE_CACHE: bool = False
+    HA_CACHE_MAX_ENTRIES: int = 512   # In-memory LRU size (responses)
+    HA_CACHE_DB: Optional[str] = None # Optional SQLite second tier; memory only if unset
+    HA_CACHE_TTL: int = 60            # Seconds, for endpoints without a specific TTL
+    HA_CACHE_STATES_TTL: int = 5      # Seconds, /api/states (0 disables caching states)
+    HA_CACHE_STATIC_TTL: int = 3600   # Seconds, /api/config, /api/services, /api/events, /api/components
+    HA_POOL_SIZE: int = 10            # Keep-alive connections shared by all REST calls
+    HA_WS_PING_INTERVAL: int = 30     # Seconds between WebSocket pings
+    HA_WS_REQUEST_TIMEOUT: int = 30   # Seconds to wait for a WebSocket command result
+    HA_HISTORY_DB: Optional[str] = None  # Local history store (SQLite); default ~/.cache/homer/ha_history.sqlite
+    HA_RULES_FILE: Optional[str] = None  # Automation rules (YAML) run by `serve-api`
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 🧩 Register this module's .env file and validation schema
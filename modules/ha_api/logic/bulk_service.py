@@ -0,0 +1,208 @@
+import asyncio
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import yaml
+
+from homer.utils.logger import get_module_logger
+from modules.ha_api.ws_manager import get_ws_manager
+
+log = get_module_logger("ha_api.bulk_service")
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_MAX_BATCH = 100
+
+# Bulk plan (YAML or JSON). A bare list of calls is accepted too:
+#
+#   concurrency: 16               # optional, calls in flight at once
+#   coalesce: true                # optional, merge entity calls sharing service + data
+#   calls:
+#     - service: light.turn_on
+#       entity_id: [light.kitchen, light.hall]
+#       data: {brightness_pct: 80}
+#     - service: scene.turn_on
+#       target: {entity_id: scene.movie}
+#     - service: notify.notify      # no target: always sent on its own
+#       data: {message: Lights on}
+
+
+def load_plan(path: Union[str, Path]) -> Dict[str, Any]:
+    """Load a bulk service plan from a YAML or JSON file."""
+    text = Path(path).read_text()
+    data = json.loads(text) if str(path).endswith(".json") else yaml.safe_load(text)
+    return normalize_plan(data)
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def normalize_plan(data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Validate a plan and flatten every call to domain/service/entity_ids/target/data."""
+    plan = {"calls": data} if isinstance(data, list) else dict(data or {})
+    calls = []
+    for index, raw in enumerate(plan.get("calls") or []):
+        service = raw.get("service")
+        if not service:
+            raise ValueError(f"Call #{index} has no 'service'")
+        domain = raw.get("domain")
+        if domain is None:
+            if "." not in service:
+                raise ValueError(f"Call #{index}: service '{service}' needs a domain ('light.turn_on')")
+            domain, service = service.split(".", 1)
+
+        target = dict(raw.get("target") or {})
+        entity_ids = _as_list(raw.get("entity_id")) + _as_list(target.pop("entity_id", None))
+        calls.append({
+            "index": index,
+            "domain": domain,
+            "service": service,
+            "entity_ids": entity_ids,
+            "target": target,  # area_id / device_id / label_id, passed through as-is
+            "data": dict(raw.get("data") or {}),
+            "return_response": bool(raw.get("return_response", False)),
+        })
+    if not calls:
+        raise ValueError("Bulk plan contains no calls")
+    plan["calls"] = calls
+    return plan
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🧮 Coalescing
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _coalescable(call: Dict[str, Any]) -> bool:
+    # Only plain entity targets merge; service responses are per call
+    return bool(call["entity_ids"]) and not call["target"] and not call["return_response"]
+
+
+def build_batches(calls: List[Dict[str, Any]], coalesce: bool = True, max_batch: int = DEFAULT_MAX_BATCH) -> List[Dict[str, Any]]:
+    """
+    Group calls into the requests that will actually be sent. Entity calls to the
+    same service with identical data become one multi-entity call (split at
+    `max_batch` entities); everything else is sent as written. A call naming an
+    entity that appears more than once in the plan is never merged, so
+    repeated calls (toggle twice, on/off/on) keep their count and order.
+    """
+    batches: List[Dict[str, Any]] = []
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    seen = Counter(entity_id for call in calls for entity_id in call["entity_ids"])
+
+    for call in calls:
+        repeated = any(seen[entity_id] > 1 for entity_id in call["entity_ids"])
+        if not (coalesce and _coalescable(call)) or repeated:
+            batches.append({**call, "calls": [call["index"]]})
+            continue
+        key = (call["domain"], call["service"], json.dumps(call["data"], sort_keys=True, default=str))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {**call, "entity_ids": [], "calls": []}
+            batches.append(group)
+        group["calls"].append(call["index"])
+        group["entity_ids"].extend(call["entity_ids"])
+
+    if max_batch <= 0:
+        return batches
+    split: List[Dict[str, Any]] = []
+    for batch in batches:
+        entity_ids = batch["entity_ids"]
+        if len(entity_ids) <= max_batch:
+            split.append(batch)
+            continue
+        for start in range(0, len(entity_ids), max_batch):
+            split.append({**batch, "entity_ids": entity_ids[start:start + max_batch]})
+    return split
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🚀 Execution
+# ──────────────────────────────────────────────────────────────────────────────
+
+async def _send(batch: Dict[str, Any], semaphore: asyncio.Semaphore, after: List[asyncio.Task]) -> Dict[str, Any]:
+    if after:
+        await asyncio.wait(after)  # earlier requests on the same entities go first
+    params: Dict[str, Any] = {
+        "domain": batch["domain"],
+        "service": batch["service"],
+        "service_data": batch["data"],
+        "return_response": batch["return_response"],
+    }
+    target = dict(batch["target"])
+    if batch["entity_ids"]:
+        target["entity_id"] = batch["entity_ids"]
+    if target:
+        params["target"] = target
+
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            result = await get_ws_manager().arequest("call_service", **params) or {}
+            outcome = {"ok": True, "error": None, "response": result.get("response")}
+        except Exception as e:
+            outcome = {"ok": False, "error": str(e), "response": None}
+        outcome["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return outcome
+
+
+async def async_execute_plan(
+    plan: Dict[str, Any],
+    concurrency: Optional[int] = None,
+    coalesce: Optional[bool] = None,
+    max_batch: int = DEFAULT_MAX_BATCH,
+) -> Dict[str, Any]:
+    """
+    Execute a normalized plan over the shared WebSocket connection. Requests are
+    pipelined with at most `concurrency` in flight; requests sharing an entity
+    run one after another in plan order. Returns one result row per
+    target (a coalesced call reports its outcome for each of its entities) and a summary.
+    """
+    concurrency = concurrency or plan.get("concurrency") or DEFAULT_CONCURRENCY
+    coalesce = plan.get("coalesce", True) if coalesce is None else coalesce
+    batches = build_batches(plan["calls"], coalesce=coalesce, max_batch=max_batch)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    started = time.perf_counter()
+    tasks: List[asyncio.Task] = []
+    last: Dict[str, asyncio.Task] = {}  # entity_id -> latest request touching it
+    for batch in batches:
+        after = list({id(last[e]): last[e] for e in batch["entity_ids"] if e in last}.values())
+        task = asyncio.ensure_future(_send(batch, semaphore, after))
+        last.update(dict.fromkeys(batch["entity_ids"], task))
+        tasks.append(task)
+    outcomes = await asyncio.gather(*tasks)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    results = []
+    for number, (batch, outcome) in enumerate(zip(batches, outcomes)):
+        call = f"{batch['domain']}.{batch['service']}"
+        targets = batch["entity_ids"] or [json.dumps(batch["target"]) if batch["target"] else None]
+        for target in targets:
+            results.append({"call": call, "target": target, "batch": number, "batch_size": len(targets), **outcome})
+
+    failed = sum(1 for r in results if not r["ok"])
+    summary = {
+        "calls": len(plan["calls"]),
+        "targets": len(results),
+        "requests": len(batches),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "elapsed_ms": elapsed_ms,
+    }
+    log.info(f"📦 Bulk run: {summary['calls']} call(s) → {summary['requests']} request(s), {failed} failed target(s) in {elapsed_ms} ms")
+    return {"summary": summary, "results": results}
+
+
+def execute_plan(
+    plan: Dict[str, Any],
+    concurrency: Optional[int] = None,
+    coalesce: Optional[bool] = None,
+    max_batch: int = DEFAULT_MAX_BATCH,
+) -> Dict[str, Any]:
+    """Blocking wrapper around `async_execute_plan`."""
+    return asyncio.run(async_execute_plan(plan, concurrency=concurrency, coalesce=coalesce, max_batch=max_batch))
@@ -0,0 +1,166 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import fnmatch
+import json
+import threading
+
+from homer.utils.logger import get_module_logger
+from modules.ha_api.ws_manager import Subscription, get_ws_manager
+
+log = get_module_logger("ha_api.event_hub")
+
+DEFAULT_QUEUE_SIZE = 1000
+
+# Marks an upstream subscription that is being established
+_PENDING = object()
+
+
+def event_entity_ids(event: Dict[str, Any]) -> List[str]:
+    """Entity IDs an event refers to (state_changed data, or a service call target)."""
+    data = event.get("data") or {}
+    entity_id = data.get("entity_id") or (data.get("service_data") or {}).get("entity_id")
+    if entity_id is None:
+        return []
+    return [entity_id] if isinstance(entity_id, str) else list(entity_id)
+
+
+class EventStream:
+    """One downstream subscriber: filters plus a bounded queue on the subscriber's loop."""
+
+    def __init__(self, hub: "EventHub", event_types: Optional[Set[str]], entity_globs: List[str], maxsize: int):
+        self.hub = hub
+        self.event_types = event_types
+        self.entity_globs = entity_globs
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Tuple[str, str]]" = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if not self.entity_globs:
+            return True
+        return any(
+            fnmatch.fnmatchcase(entity_id, pattern)
+            for entity_id in event_entity_ids(event)
+            for pattern in self.entity_globs
+        )
+
+    def _offer(self, message: Tuple[str, str]):
+        # Runs on the subscriber's loop; a slow client loses its oldest events, not the hub
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Tuple[str, str]]:
+        """Next `(event_type, json)` pair, or None on timeout (use it for keepalives)."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.hub.remove(self)
+
+
+class EventHub:
+    """
+    Fans one upstream Home Assistant `subscribe_events` subscription out to
+    many local subscribers (SSE/WebSocket clients), filtering by event type and
+    entity glob before anything crosses threads. Each event is serialized once.
+    The upstream subscription exists only while someone is listening.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_type: Dict[str, Set[EventStream]] = {}
+        self._any_type: Set[EventStream] = set()
+        self._subscription: Any = None  # Subscription, _PENDING or None
+        self.events_received = 0
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._any_type) + len({s for streams in self._by_type.values() for s in streams})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": self.subscribers,
+            "upstream": isinstance(self._subscription, Subscription),
+            "events_received": self.events_received,
+            "event_types": sorted(self._by_type),
+        }
+
+    async def add(
+        self,
+        event_types: Optional[Iterable[str]] = None,
+        entity_globs: Optional[Iterable[str]] = None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+    ) -> EventStream:
+        stream = EventStream(self, set(event_types) if event_types else None, list(entity_globs or []), maxsize)
+        with self._lock:
+            if stream.event_types:
+                for event_type in stream.event_types:
+                    self._by_type.setdefault(event_type, set()).add(stream)
+            else:
+                self._any_type.add(stream)
+            needs_upstream = self._subscription is None
+            if needs_upstream:
+                self._subscription = _PENDING
+        if needs_upstream:
+            try:
+                subscription = await get_ws_manager().asubscribe("subscribe_events", self._on_event)
+            except Exception:
+                with self._lock:
+                    self._subscription = None
+                self.remove(stream)
+                raise
+            with self._lock:
+                wanted = self._subscription is _PENDING
+                if wanted:
+                    self._subscription = subscription
+            if not wanted:  # every listener left while we were subscribing
+                subscription.unsubscribe(wait=False)
+            log.info("👂 Event hub subscribed to Home Assistant events")
+        return stream
+
+    def remove(self, stream: EventStream):
+        with self._lock:
+            self._any_type.discard(stream)
+            for event_type in list(stream.event_types or ()):
+                streams = self._by_type.get(event_type)
+                if streams is not None:
+                    streams.discard(stream)
+                    if not streams:
+                        del self._by_type[event_type]
+            idle = not self._any_type and not self._by_type
+            subscription = self._subscription if idle else None
+            if idle:
+                self._subscription = None
+        if isinstance(subscription, Subscription):
+            subscription.unsubscribe(wait=False)
+            log.info("🔕 Event hub has no listeners; unsubscribed")
+
+    def _on_event(self, event: Dict[str, Any]):
+        # Runs on the WebSocket manager thread: match, serialize once, hand off per loop
+        self.events_received += 1
+        with self._lock:
+            candidates = self._any_type | self._by_type.get(event.get("event_type"), set())
+        streams = [s for s in candidates if s.matches(event)]
+        if not streams:
+            return
+        message = (event.get("event_type"), json.dumps(event, default=str))
+        for stream in streams:
+            try:
+                stream.loop.call_soon_threadsafe(stream._offer, message)
+            except RuntimeError:
+                self.remove(stream)  # subscriber's loop is gone
+
+
+_hub: Optional[EventHub] = None
+
+
+def get_event_hub() -> EventHub:
+    global _hub
+    if _hub is None:
+        _hub = EventHub()
+    return _hub
@@ -0,0 +1,212 @@
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Sequence, Tuple
+
+from homeassistant_api import History, LogbookEntry
+from homer.utils.logger import get_module_logger
+from modules.ha_api.client import get_client
+
+log = get_module_logger("ha_api.history_fetch")
+
+DEFAULT_WINDOW = timedelta(days=1)
+DEFAULT_WORKERS = 4
+MAX_ENTITIES_PER_REQUEST = 50  # keeps filter_entity_id well inside URL limits
+
+Window = Tuple[datetime, datetime]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🪟 Windows
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.astimezone()
+
+
+def parse_ts(value: str) -> float:
+    """Epoch seconds for an HA ISO timestamp."""
+    return datetime.fromisoformat(value).timestamp()
+
+
+def time_windows(start: datetime, end: datetime, window: timedelta = DEFAULT_WINDOW) -> List[Window]:
+    """Split [start, end) into consecutive windows of at most `window`."""
+    start, end = _aware(start), _aware(end)
+    if window <= timedelta(0):
+        raise ValueError("window must be positive")
+    windows = []
+    while start < end:
+        stop = min(start + window, end)
+        windows.append((start, stop))
+        start = stop
+    return windows
+
+
+def _entity_chunks(entity_ids: Optional[Sequence[str]]) -> List[Optional[List[str]]]:
+    if not entity_ids:
+        return [None]  # every entity HA records
+    ids = list(dict.fromkeys(entity_ids))
+    return [ids[i:i + MAX_ENTITIES_PER_REQUEST] for i in range(0, len(ids), MAX_ENTITIES_PER_REQUEST)]
+
+
+def _ordered_parallel(jobs: Iterable[Callable[[], Any]], workers: int) -> Generator[Any, None, None]:
+    """
+    Run jobs on a thread pool and yield their results in submission order,
+    keeping at most `workers` jobs in flight so memory stays bounded.
+    """
+    jobs = iter(jobs)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = [pool.submit(job) for job in islice(jobs, max(1, workers))]
+        while pending:
+            result = pending.pop(0).result()
+            job = next(jobs, None)
+            if job is not None:
+                pending.append(pool.submit(job))
+            yield result
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📚 History
+# ──────────────────────────────────────────────────────────────────────────────
+
+def fetch_history_window(
+    start: datetime,
+    end: datetime,
+    entity_ids: Optional[Sequence[str]] = None,
+    significant_changes_only: bool = False,
+    no_attributes: bool = False,
+) -> List[List[Dict[str, Any]]]:
+    """One `/api/history/period` request, fully read: a list of raw state lists, one per entity."""
+    params: Dict[str, Optional[str]] = {"end_time": _aware(end).isoformat()}
+    if entity_ids:
+        params["filter_entity_id"] = ",".join(entity_ids)
+    if significant_changes_only:
+        params["significant_changes_only"] = None
+    if no_attributes:
+        params["no_attributes"] = None
+    client = get_client()
+    return client.request(
+        f"history/period/{_aware(start).isoformat()}",
+        params=client.construct_params(params),
+    ) or []
+
+
+def iter_history_rows(
+    entity_ids: Optional[Sequence[str]],
+    start: datetime,
+    end: datetime,
+    window: timedelta = DEFAULT_WINDOW,
+    workers: int = DEFAULT_WORKERS,
+    significant_changes_only: bool = False,
+    no_attributes: bool = False,
+    previous: Optional[Dict[str, Tuple[float, str]]] = None,
+) -> Generator[List[Dict[str, Any]], None, None]:
+    """
+    Stream raw history rows window by window, in time order. Windows are fetched
+    in parallel. Each yielded batch is the window's rows across all entities.
+
+    HA repeats each entity's current state at the start of every window, so a
+    row that only carries the previous window's state forward is dropped. Pass
+    `previous` ({entity_id: (last_updated_ts, state)}) to extend existing data the same way.
+    """
+    last: Dict[str, Tuple[float, str]] = dict(previous or {})
+    chunks = _entity_chunks(entity_ids)
+    jobs = [
+        (lambda s=s, e=e, ids=ids: fetch_history_window(s, e, ids, significant_changes_only, no_attributes))
+        for s, e in time_windows(start, end, window)
+        for ids in chunks
+    ]
+
+    for entity_lists in _ordered_parallel(jobs, workers):
+        batch = []
+        for states in entity_lists:
+            for position, row in enumerate(states):
+                entity_id = row.get("entity_id")
+                ts = parse_ts(row["last_updated"])
+                prev = last.get(entity_id)
+                if prev is not None:
+                    overlap = ts < prev[0] or (ts == prev[0] and row["state"] == prev[1])
+                    carried = position == 0 and row["state"] == prev[1]
+                    if overlap or carried:
+                        continue
+                last[entity_id] = (ts, row["state"])
+                batch.append(row)
+        yield batch
+
+
+def iter_histories(
+    entity_ids: Optional[Sequence[str]],
+    start: datetime,
+    end: datetime,
+    window: timedelta = DEFAULT_WINDOW,
+    workers: int = DEFAULT_WORKERS,
+    significant_changes_only: bool = False,
+) -> Generator[History, None, None]:
+    """Like `iter_history_rows`, but yields one `History` per entity per window."""
+    for rows in iter_history_rows(entity_ids, start, end, window, workers, significant_changes_only):
+        by_entity: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_entity.setdefault(row["entity_id"], []).append(row)
+        for states in by_entity.values():
+            yield History.model_validate({"states": states})
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📓 Logbook
+# ──────────────────────────────────────────────────────────────────────────────
+
+def fetch_logbook_window(start: datetime, end: datetime, entity_ids: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """One `/api/logbook` request, fully read."""
+    params: Dict[str, Optional[str]] = {"end_time": _aware(end).isoformat()}
+    if entity_ids:
+        params["entity"] = ",".join(entity_ids)
+    client = get_client()
+    return client.request(
+        f"logbook/{_aware(start).isoformat()}",
+        params=client.construct_params(params),
+    ) or []
+
+
+def iter_logbook_entries(
+    entity_ids: Optional[Sequence[str]],
+    start: datetime,
+    end: datetime,
+    window: timedelta = DEFAULT_WINDOW,
+    workers: int = DEFAULT_WORKERS,
+) -> Generator[LogbookEntry, None, None]:
+    """Stream logbook entries in time order, fetching windows in parallel."""
+    windows = time_windows(start, end, window)
+    jobs = [
+        (lambda s=s, e=e, ids=ids: (s, fetch_logbook_window(s, e, ids)))
+        for s, e in windows
+        for ids in _entity_chunks(entity_ids)
+    ]
+    # Window edges are inclusive, so an entry stamped exactly on one is returned twice
+    previous_keys: set = set()
+    current_keys: set = set()
+    current_window = None
+    for window_start, entries in _ordered_parallel(jobs, workers):
+        if window_start != current_window:
+            previous_keys, current_keys, current_window = current_keys, set(), window_start
+        for entry in entries:
+            key = (entry.get("when"), entry.get("entity_id"), entry.get("state"), entry.get("message"))
+            if key in previous_keys:
+                continue
+            current_keys.add(key)
+            yield LogbookEntry.model_validate(entry)
+
+
+def resolve_entity_ids(patterns: Sequence[str]) -> List[str]:
+    """Expand entity ID globs (e.g. 'light.*') against the current state list."""
+    if not any(ch in p for p in patterns for ch in "*?["):
+        return list(dict.fromkeys(patterns))
+    known = [s.entity_id for s in get_client().get_states()]
+    matched = [e for p in patterns for e in (fnmatch.filter(known, p) if any(ch in p for ch in "*?[") else [p])]
+    return list(dict.fromkeys(matched))
+
+
+def since(days: float = 0, hours: float = 0) -> Tuple[datetime, datetime]:
+    """(start, now) for a look-back period."""
+    end = datetime.now(timezone.utc)
+    return end - timedelta(days=days, hours=hours), end
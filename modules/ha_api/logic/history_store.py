@@ -0,0 +1,271 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple
+
+from homer.utils.logger import get_module_logger
+from modules.ha_api.client import get_env
+from modules.ha_api.logic.history_fetch import DEFAULT_WINDOW, DEFAULT_WORKERS, iter_history_rows, parse_ts
+
+log = get_module_logger("ha_api.history_store")
+
+DB_NAME = "ha_history.sqlite"
+RECORDER_LAG = 30  # seconds; HA commits recorder rows in batches, so the newest moments are never marked fetched
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS states (
+    entity_id    TEXT NOT NULL,
+    last_updated REAL NOT NULL,
+    last_changed REAL NOT NULL,
+    state        TEXT,
+    attributes   BLOB,
+    PRIMARY KEY (entity_id, last_updated)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    entity_id TEXT PRIMARY KEY,
+    fetched_start REAL NOT NULL,
+    fetched_end   REAL NOT NULL
+);
+"""
+
+
+def _pack(attributes: Optional[Dict[str, Any]]) -> Optional[bytes]:
+    if not attributes:
+        return None
+    return zlib.compress(json.dumps(attributes, separators=(",", ":")).encode())
+
+
+def _unpack(blob: Optional[bytes]) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob)) if blob else {}
+
+
+def default_db_path() -> str:
+    """`$XDG_CACHE_HOME/homer/ha_history.sqlite` (`~/.cache/...`), never the working directory."""
+    base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "homer"
+    try:
+        base.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        raise RuntimeError(f"Cannot create history store directory {base} ({e}); set HA_HISTORY_DB to a writable path") from e
+    return str(base / DB_NAME)
+
+
+class HistoryStore:
+    """
+    Local SQLite copy of HA recorder history. Rows are keyed by
+    (entity_id, last_updated) and attributes are stored as zlib-compressed JSON.
+    Each entity has one contiguous fetched range. `sync()` only requests the
+    parts of a range not already covered, so repeated queries over the same months cost nothing.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        env = get_env(safe=True)
+        self.path = path or (env.HA_HISTORY_DB if env else None) or default_db_path()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔄 Fetching
+    # ──────────────────────────────────────────────────────────────────────
+
+    def coverage(self, entity_ids: Optional[Sequence[str]] = None) -> Dict[str, Tuple[float, float]]:
+        """Fetched (start, end) epoch range per entity."""
+        with self._lock:
+            rows = self._conn.execute("SELECT entity_id, fetched_start, fetched_end FROM coverage").fetchall()
+        wanted = set(entity_ids) if entity_ids else None
+        return {e: (s, t) for e, s, t in rows if wanted is None or e in wanted}
+
+    def _missing(self, entity_ids: Sequence[str], start: float, end: float) -> Dict[Tuple[float, float], List[str]]:
+        """Group entities by the range still to fetch, so entities sharing a gap share requests."""
+        covered = self.coverage(entity_ids)
+        gaps: Dict[Tuple[float, float], List[str]] = {}
+        for entity_id in dict.fromkeys(entity_ids):
+            if entity_id not in covered:
+                gaps.setdefault((start, end), []).append(entity_id)
+                continue
+            have_start, have_end = covered[entity_id]
+            # Extend outwards from the covered range so coverage stays contiguous
+            if start < have_start:
+                gaps.setdefault((start, have_start), []).append(entity_id)
+            if end > have_end:
+                gaps.setdefault((have_end, end), []).append(entity_id)
+        return gaps
+
+    def _latest(self, entity_ids: Sequence[str], before: float) -> Dict[str, Tuple[float, str]]:
+        latest = {}
+        with self._lock:
+            for entity_id in entity_ids:
+                row = self._conn.execute(
+                    "SELECT last_updated, state FROM states WHERE entity_id = ? AND last_updated <= ? "
+                    "ORDER BY last_updated DESC LIMIT 1",
+                    (entity_id, before),
+                ).fetchone()
+                if row:
+                    latest[entity_id] = (row[0], row[1])
+        return latest
+
+    def _drop_carried(self, entity_ids: Sequence[str], at: float):
+        """
+        Remove rows at `at` that only repeat the state before them: the start-of-range
+        row HA sent for an earlier fetch becomes redundant once older history is stored.
+        """
+        with self._lock, self._conn:
+            for entity_id in entity_ids:
+                self._conn.execute(
+                    "DELETE FROM states WHERE entity_id = ? AND last_updated = ? AND state IS (SELECT state FROM states "
+                    "WHERE entity_id = ? AND last_updated < ? ORDER BY last_updated DESC LIMIT 1)",
+                    (entity_id, at, entity_id, at),
+                )
+
+    def sync(
+        self,
+        entity_ids: Sequence[str],
+        start: datetime,
+        end: Optional[datetime] = None,
+        window: timedelta = DEFAULT_WINDOW,
+        workers: int = DEFAULT_WORKERS,
+        attributes: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Make sure [start, end] is stored for every entity, fetching only what is
+        missing. Windows are fetched in parallel and written as they arrive.
+        """
+        if not entity_ids:
+            raise ValueError("sync() needs at least one entity_id")
+        started = time.perf_counter()
+        start_ts = start.timestamp()
+        end_ts = min((end.timestamp() if end else time.time()), time.time() - RECORDER_LAG)
+        if end_ts <= start_ts:
+            return {"ranges": 0, "rows": 0, "entities": len(entity_ids), "elapsed_ms": 0.0}
+
+        gaps = self._missing(entity_ids, start_ts, end_ts)
+        inserted = 0
+        for (gap_start, gap_end), ids in gaps.items():
+            rows = iter_history_rows(
+                ids,
+                datetime.fromtimestamp(gap_start).astimezone(),
+                datetime.fromtimestamp(gap_end).astimezone(),
+                window=window,
+                workers=workers,
+                no_attributes=not attributes,
+                previous=self._latest(ids, gap_start),
+            )
+            for batch in rows:
+                values = [
+                    (
+                        row["entity_id"],
+                        parse_ts(row["last_updated"]),
+                        parse_ts(row["last_changed"]),
+                        row.get("state"),
+                        _pack(row.get("attributes")) if attributes else None,
+                    )
+                    for row in batch
+                ]
+                with self._lock, self._conn:
+                    self._conn.executemany("INSERT OR REPLACE INTO states VALUES (?, ?, ?, ?, ?)", values)
+                inserted += len(values)
+
+            covered = self.coverage(ids)
+            self._drop_carried([e for e in ids if e in covered and covered[e][0] == gap_end], gap_end)
+            # Only mark the gap covered once every window in it has been stored
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT INTO coverage VALUES (?, ?, ?) ON CONFLICT(entity_id) DO UPDATE SET "
+                    "fetched_start = min(fetched_start, excluded.fetched_start), fetched_end = max(fetched_end, excluded.fetched_end)",
+                    [(entity_id, gap_start, gap_end) for entity_id in ids],
+                )
+
+        stats = {
+            "ranges": len(gaps),
+            "rows": inserted,
+            "entities": len(entity_ids),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        log.info(f"📥 History sync: {stats['rows']} row(s) over {stats['ranges']} missing range(s) in {stats['elapsed_ms']} ms")
+        return stats
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔍 Queries
+    # ──────────────────────────────────────────────────────────────────────
+
+    def rows(
+        self,
+        entity_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        attributes: bool = False,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Stored rows for one entity in time order."""
+        columns = "last_updated, last_changed, state" + (", attributes" if attributes else "")
+        sql = f"SELECT {columns} FROM states WHERE entity_id = ? AND last_updated >= ? AND last_updated <= ? ORDER BY last_updated"
+        bounds = (entity_id, start.timestamp() if start else 0, end.timestamp() if end else float("inf"))
+        with self._lock:
+            fetched = self._conn.execute(sql, bounds).fetchall()
+        for row in fetched:
+            item = {"entity_id": entity_id, "last_updated": row[0], "last_changed": row[1], "state": row[2]}
+            if attributes:
+                item["attributes"] = _unpack(row[3])
+            yield item
+
+    def series(self, entity_id: str, start: datetime, end: datetime) -> Tuple[List[float], List[Optional[str]]]:
+        """
+        Column arrays (timestamps, states) covering [start, end]. The state in
+        effect at `start` is included, clipped to `start`.
+        """
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        with self._lock:
+            before = self._conn.execute(
+                "SELECT state FROM states WHERE entity_id = ? AND last_updated < ? ORDER BY last_updated DESC LIMIT 1",
+                (entity_id, start_ts),
+            ).fetchone()
+            inside = self._conn.execute(
+                "SELECT last_updated, state FROM states WHERE entity_id = ? AND last_updated >= ? AND last_updated <= ? "
+                "ORDER BY last_updated",
+                (entity_id, start_ts, end_ts),
+            ).fetchall()
+        times = [start_ts] if before else []
+        states = [before[0]] if before else []
+        for ts, state in inside:
+            times.append(ts)
+            states.append(state)
+        return times, states
+
+    def entities(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT entity_id FROM coverage ORDER BY entity_id")]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT count(*) FROM states").fetchone()[0]
+            entities = self._conn.execute("SELECT count(*) FROM coverage").fetchone()[0]
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {"path": self.path, "entities": entities, "rows": rows, "size_bytes": size}
+
+    def prune(self, before: datetime) -> int:
+        """Drop rows older than `before`, keeping each entity's state in effect at the cutoff."""
+        cutoff = before.timestamp()
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM states WHERE last_updated < ? AND EXISTS (SELECT 1 FROM states AS later "
+                "WHERE later.entity_id = states.entity_id AND later.last_updated > states.last_updated AND later.last_updated <= ?)",
+                (cutoff, cutoff),
+            ).rowcount
+            self._conn.execute("DELETE FROM coverage WHERE fetched_end <= ?", (cutoff,))
+            self._conn.execute("UPDATE coverage SET fetched_start = ? WHERE fetched_start < ?", (cutoff, cutoff))
+        return deleted
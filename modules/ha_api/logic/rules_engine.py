@@ -0,0 +1,611 @@
+import asyncio
+import fnmatch
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import aiohttp
+import yaml
+
+from homer.utils.logger import get_module_logger
+from modules.ha_api.logic.bulk_service import normalize_plan
+from modules.ha_api.logic.state_mirror import get_state_mirror
+from modules.ha_api.logic.template_renderer import get_template_renderer
+from modules.ha_api.ws_manager import Subscription, WebSocketManager, get_ws_manager
+
+log = get_module_logger("ha_api.rules_engine")
+
+MODES = ("single", "queued", "parallel")
+DEFAULT_MAX = 10          # runs at once for queued/parallel rules
+MAX_QUEUED = 100          # queued runs waiting per rule before new triggers are dropped
+MIRROR_WAIT = 30          # seconds to wait for the state mirror when conditions need it
+ANY_EVENT = "*"
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+DISCORD_API = "https://discord.com/api/v10"
+
+# Rules file (YAML or JSON). A bare list of rules is accepted too:
+#
+#   rules:
+#     - id: porch_motion
+#       trigger:
+#         - state: binary_sensor.porch_*      # entity_id or glob
+#           to: "on"                          # optional; `from` too, str or list
+#         - event: doorbell_pressed           # any HA event type ("*" for all)
+#           data: {button: front}             # optional subset match on event data
+#       condition:                            # all must hold
+#         - state: sun.sun
+#           is: below_horizon
+#         - numeric: sensor.porch_lux
+#           below: 20
+#         - template: "{{ is_state('input_boolean.away', 'off') }}"
+#         - time: {after: "17:00", before: "06:00", weekday: [mon, tue, wed, thu, fri]}  # quote times
+#       action:                               # run in order
+#         - service: light.turn_on
+#           target: {entity_id: light.porch}
+#           data: {brightness_pct: 100}
+#         - delay: 120
+#         - event: porch_motion_handled
+#           data: {entity: "{entity_id}"}
+#         - github_issue: {repo: org/home, title: "Motion at {entity_id}", body: "{to_state} at {time_fired}"}
+#         - discord: {webhook: "https://discord.com/api/webhooks/...", content: "🚶 {entity_id} → {to_state}"}
+#       mode: single                          # single (skip while running) | queued | parallel
+#       max: 1                                # runs at once for queued/parallel
+#
+# Action strings may use {placeholders}: rule_id, event_type, entity_id,
+# from_state, to_state, time_fired, plus dotted paths into `data` and `attributes`.
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📜 Loading
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _states(value: Any) -> Optional[Set[str]]:
+    # YAML turns bare on/off into booleans; HA states are strings
+    if value is None:
+        return None
+    return {("on" if v else "off") if isinstance(v, bool) else str(v) for v in _as_list(value)}
+
+
+class Trigger:
+    """A state trigger (entity glob + optional from/to) or an event trigger (type + data subset)."""
+
+    def __init__(self, raw: Dict[str, Any]):
+        if "state" in raw:
+            self.kind = "state"
+            self.event_type = "state_changed"
+            self.entity = str(raw["state"])
+            self.from_states = _states(raw.get("from"))
+            self.to_states = _states(raw.get("to"))
+            self.data: Dict[str, Any] = {}
+        elif "event" in raw:
+            self.kind = "event"
+            self.event_type = str(raw["event"])
+            self.entity = None
+            self.from_states = self.to_states = None
+            self.data = dict(raw.get("data") or {})
+        else:
+            raise ValueError(f"Trigger needs 'state' or 'event': {raw}")
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        data = event.get("data") or {}
+        if self.kind == "event":
+            return all(data.get(key) == value for key, value in self.data.items())
+        old, new = data.get("old_state") or {}, data.get("new_state") or {}
+        if (self.from_states is not None or self.to_states is not None) and old.get("state") == new.get("state"):
+            return False  # attribute-only update; from/to mean the state itself moved
+        if self.from_states is not None and old.get("state") not in self.from_states:
+            return False
+        if self.to_states is not None and new.get("state") not in self.to_states:
+            return False
+        return True
+
+
+class Rule:
+    """A compiled rule plus its run bookkeeping (all mutated on the manager loop)."""
+
+    def __init__(self, raw: Dict[str, Any], index: int):
+        self.id = str(raw.get("id") or f"rule_{index}")
+        self.description = raw.get("description", "")
+        self.triggers = [Trigger(t) for t in _as_list(raw.get("trigger"))]
+        if not self.triggers:
+            raise ValueError(f"Rule '{self.id}' has no trigger")
+        self.conditions = [_condition(c, self.id) for c in _as_list(raw.get("condition"))]
+        self.actions = [_action(a, self.id) for a in _as_list(raw.get("action"))]
+        if not self.actions:
+            raise ValueError(f"Rule '{self.id}' has no action")
+        self.mode = raw.get("mode", "single")
+        if self.mode not in MODES:
+            raise ValueError(f"Rule '{self.id}': mode must be one of {', '.join(MODES)}")
+        self.max = 1 if self.mode == "single" else max(1, int(raw.get("max", DEFAULT_MAX)))
+        self.enabled = bool(raw.get("enabled", True))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.active = 0   # dispatched and not finished (running + waiting)
+        self.running = 0
+        self.triggered = 0
+        self.runs = 0
+        self.skipped = 0
+        self.blocked = 0  # conditions failed
+        self.failures = 0
+        self.last_run: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def needs_states(self) -> bool:
+        return any(c["type"] in ("state", "numeric") for c in self.conditions)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "max": self.max,
+            "enabled": self.enabled,
+            "running": self.running,
+            "waiting": self.active - self.running,
+            "triggered": self.triggered,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "blocked": self.blocked,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "last_error": self.last_error,
+        }
+
+
+def _condition(raw: Dict[str, Any], rule_id: str) -> Dict[str, Any]:
+    if "state" in raw:
+        return {"type": "state", "entity_id": raw["state"], "is": _states(raw.get("is", raw.get("to")))}
+    if "numeric" in raw:
+        return {"type": "numeric", "entity_id": raw["numeric"], "above": raw.get("above"), "below": raw.get("below")}
+    if "template" in raw:
+        return {"type": "template", "template": raw["template"]}
+    if "time" in raw:
+        spec = raw["time"] or {}
+        weekdays = [str(d).lower()[:3] for d in _as_list(spec.get("weekday"))]
+        if any(d not in WEEKDAYS for d in weekdays):
+            raise ValueError(f"Rule '{rule_id}': weekday must be one of {', '.join(WEEKDAYS)}")
+        return {
+            "type": "time",
+            "after": _clock(spec.get("after"), rule_id),
+            "before": _clock(spec.get("before"), rule_id),
+            "weekday": weekdays,
+        }
+    raise ValueError(f"Rule '{rule_id}': unknown condition {raw}")
+
+
+def _action(raw: Dict[str, Any], rule_id: str) -> Dict[str, Any]:
+    if "service" in raw:
+        return {"type": "service", **normalize_plan([raw])["calls"][0]}
+    if "delay" in raw:
+        return {"type": "delay", "seconds": float(raw["delay"])}
+    if "event" in raw:
+        return {"type": "event", "event_type": raw["event"], "data": dict(raw.get("data") or {})}
+    if "github_issue" in raw:
+        spec = dict(raw["github_issue"])
+        if not spec.get("repo") or not spec.get("title"):
+            raise ValueError(f"Rule '{rule_id}': github_issue needs 'repo' and 'title'")
+        return {"type": "github_issue", **spec}
+    if "discord" in raw:
+        spec = dict(raw["discord"])
+        if not (spec.get("webhook") or spec.get("channel_id")) or not spec.get("content"):
+            raise ValueError(f"Rule '{rule_id}': discord needs 'webhook' or 'channel_id', and 'content'")
+        return {"type": "discord", **spec}
+    raise ValueError(f"Rule '{rule_id}': unknown action {raw}")
+
+
+def load_rules(path: Union[str, Path]) -> List[Rule]:
+    """Load and validate rules from a YAML or JSON file."""
+    text = Path(path).read_text()
+    data = json.loads(text) if str(path).endswith(".json") else yaml.safe_load(text)
+    return compile_rules(data)
+
+
+def compile_rules(data: Union[Dict[str, Any], List[Dict[str, Any]], None]) -> List[Rule]:
+    raw_rules = data if isinstance(data, list) else (data or {}).get("rules") or []
+    rules = [Rule(raw, index) for index, raw in enumerate(raw_rules)]
+    seen: Set[str] = set()
+    for rule in rules:
+        if rule.id in seen:
+            raise ValueError(f"Duplicate rule id '{rule.id}'")
+        seen.add(rule.id)
+    return rules
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🗂️ Index
+# ──────────────────────────────────────────────────────────────────────────────
+
+Candidate = Tuple[Rule, Trigger]
+
+
+class RuleIndex:
+    """
+    Maps an incoming event straight to the triggers that could match it, so the
+    cost per event depends on how many triggers watch that entity or event type.
+    The total number of rules doesn't matter. State triggers are indexed by exact
+    entity_id or by domain (`light.*`); other globs are checked one by one.
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.by_entity: Dict[str, List[Candidate]] = {}
+        self.by_domain: Dict[str, List[Candidate]] = {}
+        self.globs: List[Tuple[str, Rule, Trigger]] = []
+        self.by_event: Dict[str, List[Candidate]] = {}
+        self.rules = 0
+        for rule in rules:
+            if not rule.enabled:
+                continue
+            self.rules += 1
+            for trigger in rule.triggers:
+                self._add(rule, trigger)
+
+    def _add(self, rule: Rule, trigger: Trigger):
+        if trigger.kind == "event":
+            self.by_event.setdefault(trigger.event_type, []).append((rule, trigger))
+            return
+        pattern = trigger.entity
+        if not any(ch in pattern for ch in "*?["):
+            self.by_entity.setdefault(pattern, []).append((rule, trigger))
+        elif pattern.endswith(".*") and not any(ch in pattern[:-2] for ch in "*?["):
+            self.by_domain.setdefault(pattern[:-2], []).append((rule, trigger))
+        else:
+            self.globs.append((pattern, rule, trigger))
+
+    @property
+    def event_types(self) -> Set[str]:
+        """Event types to subscribe to; `{"*"}` when some trigger wants every event."""
+        types = set(self.by_event)
+        if self.by_entity or self.by_domain or self.globs:
+            types.add("state_changed")
+        return {ANY_EVENT} if ANY_EVENT in types else types
+
+    def candidates(self, event: Dict[str, Any]) -> List[Candidate]:
+        event_type = event.get("event_type")
+        found = list(self.by_event.get(event_type, ())) + list(self.by_event.get(ANY_EVENT, ()))
+        if event_type == "state_changed":
+            entity_id = (event.get("data") or {}).get("entity_id") or ""
+            found += self.by_entity.get(entity_id, ())
+            found += self.by_domain.get(entity_id.split(".", 1)[0], ())
+            found += [(rule, trigger) for pattern, rule, trigger in self.globs if fnmatch.fnmatchcase(entity_id, pattern)]
+        return found
+
+    def match(self, event: Dict[str, Any]) -> List[Rule]:
+        """Rules with a trigger matching the event, each once (conditions are not checked)."""
+        matched: Dict[str, Rule] = {}
+        for rule, trigger in self.candidates(event):
+            if rule.id not in matched and trigger.matches(event):
+                matched[rule.id] = rule
+        return list(matched.values())
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🧩 Evaluation helpers
+# ──────────────────────────────────────────────────────────────────────────────
+
+_PLACEHOLDER = re.compile(r"\{(\w+(?:\.\w+)*)\}")
+
+
+def event_context(rule: Rule, event: Dict[str, Any]) -> Dict[str, Any]:
+    """Variables available to action placeholders."""
+    data = event.get("data") or {}
+    old, new = data.get("old_state") or {}, data.get("new_state") or {}
+    return {
+        "rule_id": rule.id,
+        "event_type": event.get("event_type"),
+        "entity_id": data.get("entity_id"),
+        "from_state": old.get("state"),
+        "to_state": new.get("state"),
+        "attributes": new.get("attributes") or {},
+        "time_fired": event.get("time_fired"),
+        "data": data,
+    }
+
+
+def _lookup(context: Dict[str, Any], path: str) -> Any:
+    value: Any = context
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            raise KeyError(path)
+        value = value[part]
+    return value
+
+
+def render(value: Any, context: Dict[str, Any]) -> Any:
+    """Fill {placeholders} in strings, recursively; unknown names are left as written."""
+    if isinstance(value, str):
+        def sub(match):
+            try:
+                return str(_lookup(context, match.group(1)))
+            except KeyError:
+                return match.group(0)
+        return _PLACEHOLDER.sub(sub, value)
+    if isinstance(value, dict):
+        return {key: render(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render(item, context) for item in value]
+    return value
+
+
+def _clock(value: Any, rule_id: str) -> Optional[Tuple[int, ...]]:
+    """Parse "HH:MM[:SS]" into `(h, m, s)` when the rule is loaded."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        # YAML 1.1 reads unquoted 17:00 / 17:00:30 as base-60 numbers, which is ambiguous
+        raise ValueError(f"Rule '{rule_id}': quote times, e.g. after: \"17:00\" (got {value})")
+    try:
+        parts = [int(p) for p in str(value).split(":")]
+    except ValueError:
+        parts = []
+    if not 2 <= len(parts) <= 3:
+        raise ValueError(f"Rule '{rule_id}': time must be HH:MM or HH:MM:SS, got {value!r}")
+    clock = tuple(parts + [0] * (3 - len(parts)))
+    if not (0 <= clock[0] < 24 and 0 <= clock[1] < 60 and 0 <= clock[2] < 60):
+        raise ValueError(f"Rule '{rule_id}': time out of range: {value!r}")
+    return clock
+
+
+def _time_ok(condition: Dict[str, Any], now: datetime) -> bool:
+    if condition["weekday"] and WEEKDAYS[now.weekday()] not in condition["weekday"]:
+        return False
+    current = (now.hour, now.minute, now.second)
+    after, before = condition["after"], condition["before"]
+    if after and before and after > before:  # wraps midnight
+        return current >= after or current < before
+    return (after is None or current >= after) and (before is None or current < before)
+
+
+async def _check(condition: Dict[str, Any]) -> bool:
+    kind = condition["type"]
+    if kind == "time":
+        return _time_ok(condition, datetime.now())
+    if kind == "template":
+        result = await get_template_renderer().arender(condition["template"])
+        return str(result).strip().lower() in ("true", "1", "yes", "on")
+    state = get_state_mirror().get(condition["entity_id"])
+    if state is None:
+        return False
+    if kind == "state":
+        return condition["is"] is None or state.state in condition["is"]
+    try:
+        number = float(state.state)
+    except (TypeError, ValueError):
+        return False
+    above, below = condition["above"], condition["below"]
+    return (above is None or number > float(above)) and (below is None or number < float(below))
+
+
+async def _discord(action: Dict[str, Any], context: Dict[str, Any]):
+    payload = {"content": render(action["content"], context)}
+    if action.get("webhook"):
+        url, headers = action["webhook"], {}
+    else:
+        token = os.environ.get("DISCORD_BOT_TOKEN")
+        if not token:
+            raise RuntimeError("DISCORD_BOT_TOKEN is not set")
+        url, headers = f"{DISCORD_API}/channels/{action['channel_id']}/messages", {"Authorization": f"Bot {token}"}
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json=payload, headers=headers) as response:
+            if response.status >= 400:
+                raise RuntimeError(f"Discord returned {response.status}: {await response.text()}")
+
+
+async def _perform(manager: WebSocketManager, action: Dict[str, Any], context: Dict[str, Any]):
+    kind = action["type"]
+    if kind == "delay":
+        await asyncio.sleep(action["seconds"])
+    elif kind == "service":
+        params: Dict[str, Any] = {
+            "domain": action["domain"],
+            "service": action["service"],
+            "service_data": render(action["data"], context),
+        }
+        target = render(dict(action["target"]), context)
+        if action["entity_ids"]:
+            target["entity_id"] = render(action["entity_ids"], context)
+        if target:
+            params["target"] = target
+        await manager.arequest("call_service", **params)
+    elif kind == "event":
+        await manager.arequest("fire_event", event_type=render(action["event_type"], context), event_data=render(action["data"], context))
+    elif kind == "github_issue":
+        from modules.github.github_client import create_issue  # optional module
+        await asyncio.to_thread(
+            create_issue,
+            action["repo"],
+            render(action["title"], context),
+            render(action.get("body", ""), context),
+        )
+    elif kind == "discord":
+        await _discord(action, context)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ⚙️ Engine
+# ──────────────────────────────────────────────────────────────────────────────
+
+class RulesEngine:
+    """
+    Runs rules against the shared WebSocket event stream. There is one upstream
+    `subscribe_events` per event type the rules use, filtered by Home Assistant.
+    Matching happens inline on the manager thread through `RuleIndex`. Each
+    matching rule then runs as a task on the manager loop, limited by its mode
+    and `max`. Blocking actions (GitHub) run in worker threads.
+    """
+
+    def __init__(self, rules: List[Rule], manager: Optional[WebSocketManager] = None):
+        self.manager = manager or get_ws_manager()
+        self.rules: Dict[str, Rule] = {rule.id: rule for rule in rules}
+        self.index = RuleIndex(rules)
+        self._subscriptions: List[Subscription] = []
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self.events_received = 0
+        self.started_at: Optional[float] = None
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔌 Lifecycle
+    # ──────────────────────────────────────────────────────────────────────
+
+    def start(self) -> "RulesEngine":
+        """Subscribe to the event types the rules need; returns immediately after the mirror (if needed) is ready."""
+        with self._lock:
+            if self._subscriptions:
+                return self
+            if any(rule.needs_states for rule in self.rules.values()):
+                if not get_state_mirror().wait_ready(MIRROR_WAIT):
+                    log.warning("⚠️ State mirror not ready; state conditions fail until it loads")
+            for event_type in sorted(self.index.event_types):
+                data = {} if event_type == ANY_EVENT else {"event_type": event_type}
+                self._subscriptions.append(self.manager.subscribe("subscribe_events", self._on_event, **data))
+            self.started_at = time.time()
+        log.info(f"🤖 Rules engine started: {self.index.rules} rule(s) on {len(self._subscriptions)} event subscription(s)")
+        return self
+
+    def _unsubscribe(self):
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.unsubscribe(wait=False)
+
+    def stop(self):
+        """Unsubscribe and cancel every running rule."""
+        self._unsubscribe()
+
+        async def cancel():
+            for task in list(self._tasks):
+                task.cancel()
+
+        if self._tasks:
+            try:
+                self.manager.submit(cancel())
+            except RuntimeError:
+                pass  # manager loop already closed
+        log.info("🛑 Rules engine stopped")
+
+    def reload(self, rules: List[Rule]):
+        """
+        Swap in a new rule set (e.g. after editing the file). Runs already in
+        progress are not cancelled: they finish under the old rules, and their
+        mode limits no longer count against the new ones.
+        """
+        self._unsubscribe()
+        self.rules = {rule.id: rule for rule in rules}
+        self.index = RuleIndex(rules)
+        self.start()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🧠 Dispatch (manager loop)
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _on_event(self, event: Dict[str, Any]):
+        self.events_received += 1
+        for rule in self.index.match(event):
+            self._dispatch(rule, event_context(rule, event))
+
+    def _dispatch(self, rule: Rule, context: Dict[str, Any]):
+        rule.triggered += 1
+        limit = rule.max + MAX_QUEUED if rule.mode == "queued" else rule.max
+        if rule.active >= limit:
+            rule.skipped += 1
+            if rule.mode == "queued":
+                log.warning(f"⚠️ Rule '{rule.id}' queue is full; trigger dropped")
+            else:
+                log.debug(f"⏭️ Rule '{rule.id}' already running {rule.active}/{rule.max}; trigger skipped")
+            return
+        rule.active += 1
+        task = asyncio.get_running_loop().create_task(self._run(rule, context))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, rule: Rule, context: Dict[str, Any]):
+        if rule._semaphore is None:
+            rule._semaphore = asyncio.Semaphore(rule.max)
+        try:
+            await rule._semaphore.acquire()
+        except BaseException:
+            rule.active -= 1
+            raise
+        rule.running += 1
+        try:
+            for condition in rule.conditions:
+                if not await _check(condition):
+                    rule.blocked += 1
+                    return
+            rule.runs += 1
+            rule.last_run = time.time()
+            for action in rule.actions:
+                await _perform(self.manager, action, context)
+            log.info(f"✅ Rule '{rule.id}' ran for {context.get('entity_id') or context.get('event_type')}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            rule.failures += 1
+            rule.last_error = str(e)
+            log.error(f"❌ Rule '{rule.id}' failed: {e}")
+        finally:
+            rule.running -= 1
+            rule.active -= 1
+            rule._semaphore.release()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 📊 Introspection
+    # ──────────────────────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rules": self.index.rules,
+            "subscriptions": len(self._subscriptions),
+            "event_types": sorted(self.index.event_types),
+            "indexed": {
+                "entities": len(self.index.by_entity),
+                "domains": len(self.index.by_domain),
+                "globs": len(self.index.globs),
+                "events": len(self.index.by_event),
+            },
+            "events_received": self.events_received,
+            "running": sum(rule.running for rule in self.rules.values()),
+            "started_at": self.started_at,
+        }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ♻️ Process-wide engine
+# ──────────────────────────────────────────────────────────────────────────────
+
+_engine: Optional[RulesEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_rules_engine() -> Optional[RulesEngine]:
+    return _engine
+
+
+def start_rules_engine(path: Union[str, Path]) -> RulesEngine:
+    """Load `path` and run it as the shared engine, replacing any running one."""
+    global _engine
+    rules = load_rules(path)
+    with _engine_lock:
+        if _engine is not None:
+            _engine.reload(rules)
+        else:
+            _engine = RulesEngine(rules).start()
+        return _engine
+
+
+def stop_rules_engine():
+    global _engine
+    with _engine_lock:
+        engine, _engine = _engine, None
+    if engine is not None:
+        engine.stop()
@@ -0,0 +1,186 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+from homeassistant_api import State
+from homer.utils.logger import get_module_logger
+from modules.ha_api.ws_manager import Subscription, WebSocketManager, get_ws_manager
+
+log = get_module_logger("ha_api.state_mirror")
+
+# listener(entity_id, old_state, new_state); new_state is None when the entity is removed
+StateListener = Callable[[str, Optional[State], Optional[State]], None]
+
+
+def _domain(entity_id: str) -> str:
+    return entity_id.split(".", 1)[0]
+
+
+class StateMirror:
+    """
+    In-memory copy of every Home Assistant entity state.
+
+    Subscribes to `state_changed` on the shared WebSocket connection,
+    bootstraps from a `get_states` snapshot and applies each event to dicts
+    keyed by entity_id and by domain. After a reconnect the manager restores
+    the subscription and the mirror resyncs from a fresh snapshot.
+    """
+
+    def __init__(self):
+        self._states: Dict[str, State] = {}
+        self._by_domain: Dict[str, Dict[str, State]] = {}
+        self._lock = threading.RLock()
+        self._listeners: List[StateListener] = []
+        self._ready = threading.Event()
+        self._manager: Optional[WebSocketManager] = None
+        self._subscription: Optional[Subscription] = None
+        self.snapshots = 0
+        self.events_applied = 0
+        self.last_event_at: Optional[float] = None
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔎 Queries (no upstream traffic)
+    # ──────────────────────────────────────────────────────────────────────
+
+    def get(self, entity_id: str) -> Optional[State]:
+        return self._states.get(entity_id)
+
+    def all(self) -> Tuple[State, ...]:
+        with self._lock:
+            return tuple(self._states.values())
+
+    def domain(self, domain: str) -> Tuple[State, ...]:
+        with self._lock:
+            return tuple(self._by_domain.get(domain, {}).values())
+
+    def domains(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: len(states) for name, states in sorted(self._by_domain.items())}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self._ready.is_set(),
+            "connected": self.connected,
+            "entities": len(self._states),
+            "domains": len(self._by_domain),
+            "events_applied": self.events_applied,
+            "snapshots": self.snapshots,
+            "last_event_at": self.last_event_at,
+        }
+
+    def add_listener(self, listener: StateListener):
+        """Call `listener(entity_id, old, new)` after every applied change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: StateListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🧩 Applying snapshots + changes
+    # ──────────────────────────────────────────────────────────────────────
+
+    def load_snapshot(self, states: Tuple[State, ...]):
+        """Replace the mirror wholesale (drops entities removed while disconnected)."""
+        by_domain: Dict[str, Dict[str, State]] = {}
+        for state in states:
+            by_domain.setdefault(_domain(state.entity_id), {})[state.entity_id] = state
+        with self._lock:
+            self._states = {state.entity_id: state for state in states}
+            self._by_domain = by_domain
+            self.snapshots += 1
+        self._ready.set()
+        log.info(f"📦 State mirror loaded {len(states)} entities across {len(by_domain)} domains")
+
+    def apply(self, entity_id: str, new_state: Optional[Dict[str, Any]]) -> bool:
+        """
+        Apply one `state_changed` payload. Stale events (older than the
+        snapshot they were buffered behind) are ignored; returns True if applied.
+        """
+        new = State.from_json(new_state) if new_state else None
+        with self._lock:
+            old = self._states.get(entity_id)
+            if new is not None and old is not None and old.last_updated and new.last_updated and new.last_updated < old.last_updated:
+                return False
+            bucket = self._by_domain.setdefault(_domain(entity_id), {})
+            if new is None:
+                self._states.pop(entity_id, None)
+                bucket.pop(entity_id, None)
+                if not bucket:
+                    self._by_domain.pop(_domain(entity_id), None)
+            else:
+                self._states[entity_id] = bucket[entity_id] = new
+            self.events_applied += 1
+            self.last_event_at = time.time()
+
+        for listener in list(self._listeners):
+            try:
+                listener(entity_id, old, new)
+            except Exception as e:
+                log.exception(f"❌ State listener {getattr(listener, '__name__', listener)} failed for {entity_id}: {e}")
+        return True
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔌 Subscription lifecycle (on the shared WebSocket manager)
+    # ──────────────────────────────────────────────────────────────────────
+
+    @property
+    def connected(self) -> bool:
+        return self._manager is not None and self._manager.connected
+
+    def start(self) -> "StateMirror":
+        """Subscribe to `state_changed` and load a snapshot; returns immediately."""
+        if self._manager is None:
+            self._manager = get_ws_manager()
+            # Every reconnect restores the subscription first, then reloads the snapshot
+            self._manager.add_connect_hook(self._resync)
+            self._subscription = self._manager.subscribe("subscribe_events", self._on_event, event_type="state_changed")
+            if self._manager.connected:
+                self._manager.submit(self._resync(self._manager))
+        return self
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def stop(self):
+        if self._manager is not None:
+            self._manager.remove_connect_hook(self._resync)
+            if self._subscription is not None:
+                self._subscription.unsubscribe()
+            self._manager = self._subscription = None
+        log.info("🛑 State mirror stopped")
+
+    async def _resync(self, manager: WebSocketManager):
+        states = await manager.arequest("get_states")
+        self.load_snapshot(tuple(State.from_json(s) for s in states))
+
+    def _on_event(self, event: Dict[str, Any]):
+        data = event.get("data") or {}
+        self.apply(data["entity_id"], data.get("new_state"))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ♻️ Process-wide mirror
+# ──────────────────────────────────────────────────────────────────────────────
+
+_mirror: Optional[StateMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_state_mirror(start: bool = True) -> StateMirror:
+    """Return the shared state mirror, starting its subscription on first use."""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = StateMirror()
+        if start:
+            _mirror.start()
+    return _mirror
+
+
+def stop_state_mirror():
+    global _mirror
+    with _mirror_lock:
+        if _mirror is not None:
+            _mirror.stop()
+            _mirror = None
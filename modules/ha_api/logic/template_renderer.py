@@ -0,0 +1,273 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import asyncio
+import json
+import time
+
+from homer.utils.logger import get_module_logger
+from modules.ha_api.ws_manager import Subscription, WebSocketManager, get_ws_manager
+
+log = get_module_logger("ha_api.template_renderer")
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_IDLE_SECONDS = 600
+
+TemplateSpec = Union[str, Tuple[str, Optional[Dict[str, Any]]]]
+Watcher = Callable[[Optional[str], Optional[str]], Any]  # (result, error)
+
+
+class TemplateError(ValueError):
+    """Home Assistant reported an error rendering a template."""
+
+
+class _Entry:
+    """A cached template kept fresh by its own `render_template` subscription."""
+
+    def __init__(self, template: str, variables: Dict[str, Any], ready: asyncio.Future):
+        self.template = template
+        self.variables = variables
+        self.ready = ready
+        self.subscription: Optional[Subscription] = None
+        self.loaded = False
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+        self.listeners: Dict[str, Any] = {}  # entities/domains/all/time that trigger re-renders
+        self.pushes = 0
+        self.last_read = time.monotonic()
+        self.watchers: List[Watcher] = []
+
+    def value(self) -> str:
+        if self.error is not None:
+            raise TemplateError(self.error)
+        return self.result
+
+
+def _spec(item: TemplateSpec) -> Tuple[str, Dict[str, Any]]:
+    return (item, {}) if isinstance(item, str) else (item[0], dict(item[1] or {}))
+
+
+def _key(template: str, variables: Dict[str, Any]) -> str:
+    return json.dumps([template, variables], sort_keys=True, default=str)
+
+
+class TemplateRenderer:
+    """
+    Cached template rendering over the shared WebSocket.
+
+    Each distinct (template, variables) pair is rendered through a
+    `render_template` subscription. Home Assistant re-renders it and pushes the
+    new result whenever an entity it references changes (or every minute for
+    time-based templates). Cached results are therefore current, and reads are
+    plain dictionary lookups. Entries that go unread for `idle_seconds` are
+    unsubscribed. At most `max_entries` are kept, dropping the least recently read.
+    """
+
+    def __init__(
+        self,
+        manager: Optional[WebSocketManager] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+    ):
+        self.manager = manager or get_ws_manager()
+        self.max_entries = max_entries
+        self.idle_seconds = idle_seconds
+        self._entries: Dict[str, _Entry] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🧠 Manager-loop internals
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _on_render(self, entry: _Entry, event: Dict[str, Any]):
+        if "error" in event:
+            entry.error, entry.result = event["error"], None
+        else:
+            entry.error, entry.result = None, event.get("result")
+            entry.listeners = event.get("listeners") or {}
+        entry.pushes += 1
+        entry.loaded = True
+        if not entry.ready.done():
+            entry.ready.set_result(None)
+        for watcher in list(entry.watchers):
+            try:
+                watcher(entry.result, entry.error)
+            except Exception:
+                log.exception(f"Template watcher failed for {entry.template!r}")
+
+    async def _ensure(self, template: str, variables: Dict[str, Any], timeout: Optional[float]) -> _Entry:
+        key = _key(template, variables)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(template, variables, asyncio.get_running_loop().create_future())
+            try:
+                entry.subscription = await self.manager.asubscribe(
+                    "render_template",
+                    lambda event, e=entry: self._on_render(e, event),
+                    template=template,
+                    variables=variables,
+                    report_errors=True,
+                )
+            except Exception as e:
+                self._entries.pop(key, None)
+                if not entry.ready.done():
+                    # Concurrent callers waiting on the same template fail too
+                    entry.ready.set_exception(e)
+                    entry.ready.exception()
+                raise
+            if self._sweeper is None or self._sweeper.done():
+                self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop())
+            self._evict_overflow()
+        entry.last_read = time.monotonic()
+        await asyncio.wait_for(asyncio.shield(entry.ready), timeout or self.manager.request_timeout)
+        return entry
+
+    async def _ensure_many(self, specs: Sequence[Tuple[str, Dict[str, Any]]], timeout: Optional[float]) -> List[Any]:
+        # Every subscribe goes out back-to-back: one round-trip for the whole batch
+        return await asyncio.gather(*(self._ensure(t, v, timeout) for t, v in specs), return_exceptions=True)
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry.subscription is not None:
+            entry.subscription.unsubscribe(wait=False)
+
+    def _evict_overflow(self):
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            evictable = sorted((e.last_read, k) for k, e in self._entries.items() if not e.watchers)
+            for _, key in evictable[:overflow]:
+                self._drop(key)
+
+    async def _sweep_loop(self):
+        while self._entries:
+            await asyncio.sleep(max(1.0, self.idle_seconds / 4))
+            cutoff = time.monotonic() - self.idle_seconds
+            for key, entry in list(self._entries.items()):
+                if not entry.watchers and entry.last_read < cutoff:
+                    self._drop(key)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🌐 Public API (any thread / any loop)
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _cached(self, template: str, variables: Dict[str, Any]) -> Optional[_Entry]:
+        entry = self._entries.get(_key(template, variables))
+        if entry is not None and entry.loaded:
+            entry.last_read = time.monotonic()
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def render(self, template: str, variables: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> str:
+        """Rendered result; served from cache once the template has been seen. Don't call from manager callbacks."""
+        variables = dict(variables or {})
+        entry = self._cached(template, variables)
+        if entry is None:
+            entry = self.manager.submit(self._ensure(template, variables, timeout)).result()
+        return entry.value()
+
+    async def _aentry(self, template: str, variables: Optional[Dict[str, Any]], timeout: Optional[float]) -> _Entry:
+        variables = dict(variables or {})
+        entry = self._cached(template, variables)
+        if entry is None:
+            entry = await asyncio.wrap_future(self.manager.submit(self._ensure(template, variables, timeout)))
+        return entry
+
+    async def arender(self, template: str, variables: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> str:
+        entry = await self._aentry(template, variables, timeout)
+        return entry.value()
+
+    async def arender_detail(self, template: str, variables: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """`{"result", "listeners"}`: the rendered result plus the entities/domains/time HA re-renders it on."""
+        entry = await self._aentry(template, variables, timeout)
+        return {"result": entry.value(), "listeners": dict(entry.listeners)}
+
+    def _collect(self, specs: List[Tuple[str, Dict[str, Any]]], entries: List[Any]) -> List[Dict[str, Any]]:
+        results = []
+        for (template, _), entry in zip(specs, entries):
+            if isinstance(entry, BaseException):
+                results.append({"template": template, "result": None, "error": str(entry) or type(entry).__name__})
+            else:
+                results.append({"template": template, "result": entry.result, "error": entry.error})
+        return results
+
+    def render_many(self, templates: Sequence[TemplateSpec], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Render many templates (strings or `(template, variables)` pairs) in one
+        round-trip. Returns `{"template", "result", "error"}` per input, in order.
+        """
+        specs = [_spec(t) for t in templates]
+        entries = self.manager.submit(self._ensure_many(specs, timeout)).result()
+        return self._collect(specs, entries)
+
+    async def arender_many(self, templates: Sequence[TemplateSpec], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        specs = [_spec(t) for t in templates]
+        entries = await asyncio.wrap_future(self.manager.submit(self._ensure_many(specs, timeout)))
+        return self._collect(specs, entries)
+
+    def watch(self, template: str, callback: Watcher, variables: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Callable[[], None]:
+        """
+        Call `callback(result, error)` on every push for this template (on the
+        manager loop; keep it quick). Watched templates are never evicted.
+        Returns a function that stops watching.
+        """
+        variables = dict(variables or {})
+
+        async def attach() -> _Entry:
+            entry = await self._ensure(template, variables, timeout)
+            entry.watchers.append(callback)
+            return entry
+
+        entry = self.manager.submit(attach()).result()
+
+        async def detach():
+            if callback in entry.watchers:
+                entry.watchers.remove(callback)
+                entry.last_read = time.monotonic()  # idle countdown starts now
+
+        def unwatch():
+            self.manager.submit(detach())
+
+        return unwatch
+
+    def invalidate(self, template: Optional[str] = None):
+        """Drop one template (all its variable sets) or everything."""
+        async def drop():
+            for key, entry in list(self._entries.items()):
+                if template is None or entry.template == template:
+                    self._drop(key)
+        self.manager.submit(drop()).result()
+
+    def stats(self) -> Dict[str, Any]:
+        entries = list(self._entries.values())
+        return {
+            "entries": len(entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "pushes": sum(e.pushes for e in entries),
+            "errors": sum(1 for e in entries if e.error is not None),
+            "watched": sum(1 for e in entries if e.watchers),
+            "listening_to_all": sum(1 for e in entries if e.listeners.get("all")),
+        }
+
+
+_renderer: Optional[TemplateRenderer] = None
+
+
+def get_template_renderer() -> TemplateRenderer:
+    global _renderer
+    if _renderer is None:
+        _renderer = TemplateRenderer()
+    return _renderer
+
+
+def stop_template_renderer():
+    """Unsubscribe every cached template (shutdown hook)."""
+    global _renderer
+    renderer, _renderer = _renderer, None
+    if renderer is not None and renderer.manager.connected:
+        try:
+            renderer.invalidate()
+        except Exception as e:
+            log.debug(f"Template renderer shutdown: {e}")
@@ -1,89 +1,126 @@
-from typing import Optional, Dict, Any, Tuple, Generator
-import os
+from typing import Optional, Dict, Any, List, Tuple, Generator
+import queue
+from contextlib import closing
 
-from homeassistant_api import WebsocketClient, State, Group, Domain, Context
+from homeassistant_api import State, Group, Domain, Context, Entity
+from homeassistant_api.models.websocket import FiredEvent
 from homer.utils.logger import get_module_logger
-from modules.ha_api.config import HomeAssistantEnv
-from modules.ha_api.client import get_env
+from modules.ha_api.client import get_client
+from modules.ha_api.ws_manager import get_ws_manager
+from modules.ha_api.logic.template_renderer import get_template_renderer
 log = get_module_logger("ha_api.ws_client")
 
 
-def _get_ws_client() -> WebsocketClient:
-    env = get_env(safe=True)
-    if not env or not env.HA_WS_URL or not env.HA_API_TOKEN:
-        raise RuntimeError("WebSocket client requires HA_WS_URL and HA_API_TOKEN to be set.")
-    return WebsocketClient(env.HA_WS_URL, env.HA_API_TOKEN.get_secret_value())
-
-
 # ──────────────────────────────────────────────────────────────────────────────
-# ⚡ WebSocket Client Utility Methods
+# ⚡ WebSocket Client Utility Methods (one shared, pipelined connection)
 # ──────────────────────────────────────────────────────────────────────────────
 
 def get_states() -> Tuple[State, ...]:
-    with _get_ws_client() as ws:
-        states = ws.get_states()
-        log.debug(f"📦 Fetched {len(states)} states via WS")
-        return states
+    states = tuple(State.from_json(s) for s in get_ws_manager().request("get_states"))
+    log.debug(f"📦 Fetched {len(states)} states via WS")
+    return states
 
 def get_state(entity_id: str) -> Optional[State]:
-    with _get_ws_client() as ws:
-        state = ws.get_state(entity_id=entity_id)
-        log.debug(f"🔍 Fetched WS state for {entity_id}: {state}")
-        return state
+    # The WS API has no single-state command; filter the snapshot
+    state = next((s for s in get_states() if s.entity_id == entity_id), None)
+    log.debug(f"🔍 Fetched WS state for {entity_id}: {state}")
+    return state
 
 def get_entities() -> Dict[str, Group]:
-    with _get_ws_client() as ws:
-        entities = ws.get_entities()
-        log.debug(f"📚 Fetched WS entities: {list(entities.keys())}")
-        return entities
-
-def get_entity(entity_id: str) -> Optional[Any]:
-    with _get_ws_client() as ws:
-        entity = ws.get_entity(entity_id=entity_id)
-        log.debug(f"📦 Fetched WS entity {entity_id}: {entity}")
-        return entity
+    entities: Dict[str, Group] = {}
+    for state in get_states():
+        group_id, slug = state.entity_id.split(".", 1)
+        if group_id not in entities:
+            entities[group_id] = Group(group_id=group_id, _client=get_client())
+        entities[group_id]._add_entity(slug, state)
+    log.debug(f"📚 Fetched WS entities: {list(entities.keys())}")
+    return entities
+
+def get_entity(entity_id: str) -> Optional[Entity]:
+    state = get_state(entity_id)
+    if state is None:
+        return None
+    group_id, slug = entity_id.split(".", 1)
+    group = Group(group_id=group_id, _client=get_client())
+    group._add_entity(slug, state)
+    entity = group.get_entity(slug)
+    log.debug(f"📦 Fetched WS entity {entity_id}: {entity}")
+    return entity
 
 def get_domains() -> Dict[str, Domain]:
-    with _get_ws_client() as ws:
-        domains = ws.get_domains()
-        log.debug(f"📂 Fetched {len(domains)} WS domains")
-        return domains
-
-def get_rendered_template(template: str) -> str:
-    with _get_ws_client() as ws:
-        rendered = ws.get_rendered_template(template)
-        log.debug(f"🧪 Rendered WS template: {template} → {rendered}")
-        return rendered
+    services = get_ws_manager().request("get_services")
+    client = get_client()  # Domain/Service models trigger over REST
+    domains = {
+        domain_id: Domain.from_json({"domain": domain_id, "services": domain_services}, client=client)
+        for domain_id, domain_services in services.items()
+    }
+    log.debug(f"📂 Fetched {len(domains)} WS domains")
+    return domains
+
+def get_rendered_template(template: str, **variables) -> str:
+    # Cached; Home Assistant pushes a new result whenever a referenced entity changes
+    rendered = get_template_renderer().render(template, variables)
+    log.debug(f"🧪 Rendered WS template: {template} → {rendered}")
+    return rendered
+
+def get_rendered_templates(templates: List[str]) -> List[Dict[str, Any]]:
+    results = get_template_renderer().render_many(templates)
+    log.debug(f"🧪 Rendered {len(results)} WS templates in one batch")
+    return results
 
 def get_config() -> Dict[str, Any]:
-    with _get_ws_client() as ws:
-        config = ws.get_config()
-        log.debug("⚙️ Fetched WS config")
-        return config
-
-def trigger_service(domain: str, service: str, **data) -> None:
-    with _get_ws_client() as ws:
-        ws.trigger_service(domain, service, **data)
-        log.info(f"🚀 Triggered WS service {domain}.{service} with data: {data}")
-
-def trigger_service_with_response(domain: str, service: str, **data) -> Dict[str, Any]:
-    with _get_ws_client() as ws:
-        response = ws.trigger_service_with_response(domain, service, **data)
-        log.info(f"📬 WS service {domain}.{service} response: {response}")
-        return response
+    config = get_ws_manager().request("get_config")
+    log.debug("⚙️ Fetched WS config")
+    return config
 
-def fire_event(event_type: str, **event_data) -> Context:
-    with _get_ws_client() as ws:
-        ctx = ws.fire_event(event_type, **event_data)
-        log.info(f"🔥 Fired WS event '{event_type}' with data: {event_data}")
-        return ctx
+def _service_call(domain: str, service: str, return_response: bool, entity_id: Optional[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"domain": domain, "service": service, "service_data": data, "return_response": return_response}
+    if entity_id is not None:
+        params["target"] = {"entity_id": entity_id}
+    return get_ws_manager().request("call_service", **params) or {}
 
-def listen_events(event_type: Optional[str] = None) -> Generator:
-    ws = _get_ws_client()
+def trigger_service(domain: str, service: str, entity_id: Optional[str] = None, **data) -> None:
+    _service_call(domain, service, False, entity_id, data)
+    log.info(f"🚀 Triggered WS service {domain}.{service} with data: {data}")
+
+def trigger_service_with_response(domain: str, service: str, entity_id: Optional[str] = None, **data) -> Dict[str, Any]:
+    response = _service_call(domain, service, True, entity_id, data).get("response")
+    log.info(f"📬 WS service {domain}.{service} response: {response}")
+    return response
+
+def fire_event(event_type: str, **event_data) -> Context:
+    params: Dict[str, Any] = {"event_type": event_type}
+    if event_data:
+        params["event_data"] = event_data
+    result = get_ws_manager().request("fire_event", **params)
+    log.info(f"🔥 Fired WS event '{event_type}' with data: {event_data}")
+    return Context.from_json(result["context"])
+
+def _listen(subscribe_type: str, **data) -> Generator[Dict[str, Any], None, None]:
+    """Yield raw events of one subscription; closing the generator unsubscribes."""
+    events: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+    sub = get_ws_manager().subscribe(subscribe_type, events.put, **data)
+    try:
+        while True:
+            yield events.get()
+    finally:
+        sub.unsubscribe()
+
+def listen_events(event_type: Optional[str] = None) -> Generator[FiredEvent, None, None]:
     log.info(f"👂 Listening to WS events: {event_type or 'ALL'}")
-    return ws.listen_events(event_type)
+    params = {"event_type": event_type} if event_type else {}
+    with closing(_listen("subscribe_events", **params)) as events:
+        for event in events:
+            yield FiredEvent.model_validate(event)
 
-def listen_trigger(trigger: str, **trigger_fields) -> Generator:
-    ws = _get_ws_client()
+def listen_trigger(trigger: str, **trigger_fields) -> Generator[Dict[str, Any], None, None]:
     log.info(f"🎯 Listening to WS trigger: {trigger} with filters: {trigger_fields}")
-    return ws.listen_trigger(trigger, **trigger_fields)
+    with closing(_listen("subscribe_trigger", trigger={"platform": trigger, **trigger_fields})) as events:
+        for event in events:
+            yield event.get("variables", {})
+
+def ping() -> float:
+    return get_ws_manager().ping()
+
+def get_connection_stats() -> Dict[str, Any]:
+    return get_ws_manager().stats()
@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any
+
+from fastapi import HTTPException
+
+from homer.utils.logger import get_module_logger
+from modules.ha_api.ws_manager import HAWebSocketError, get_ws_manager
+
+log = get_module_logger("ha_api.routes.async_utils")
+
+
+def _http_error(e: Exception, what: str) -> HTTPException:
+    if isinstance(e, HAWebSocketError):
+        status = 404 if e.code in ("not_found", "service_not_found") else 400
+        return HTTPException(status_code=status, detail=e.message)
+    if isinstance(e, (ConnectionError, asyncio.TimeoutError)):
+        return HTTPException(status_code=503, detail="Home Assistant is unreachable")
+    if isinstance(e, RuntimeError):  # not configured
+        return HTTPException(status_code=503, detail=str(e))
+    log.exception(f"❌ {what} failed")
+    return HTTPException(status_code=500, detail=f"{what} failed")
+
+
+async def ws_request(type: str, **data) -> Any:
+    """Send a command over the shared WebSocket, mapping failures to HTTP errors."""
+    try:
+        return await get_ws_manager().arequest(type, **data)
+    except Exception as e:
+        raise _http_error(e, type)
+
+
+async def ws_first_event(type: str, **data) -> Any:
+    """One-shot subscription (e.g. render_template), mapping failures to HTTP errors."""
+    try:
+        return await get_ws_manager().afirst_event(type, **data)
+    except Exception as e:
+        raise _http_error(e, type)
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException, Query
+
+from modules.ha_api.client import get_client
+from modules.ha_api.logic import state as state_logic
+from modules.ha_api.routes.state import current_state, current_states
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("ha_api.routes.entities")
+
+router = APIRouter(tags=["ha_api"])
+
+
+@router.get("/", response_model=Dict[str, List[str]])
+def list_entities():
+    """Entity IDs grouped by domain."""
+    try:
+        grouped: Dict[str, List[str]] = {}
+        for state in current_states():
+            grouped.setdefault(state.entity_id.split(".", 1)[0], []).append(state.entity_id)
+        return {domain: sorted(ids) for domain, ids in sorted(grouped.items())}
+    except Exception:
+        log.exception("Failed to list entities")
+        raise HTTPException(status_code=503, detail="Unable to list entities")
+
+
+@router.get("/{entity_id}", response_model=Dict[str, Any])
+def get_entity(entity_id: str):
+    """One entity: its domain, friendly name and current state."""
+    state = current_state(entity_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Entity {entity_id} not found")
+    return {
+        "entity_id": entity_id,
+        "domain": entity_id.split(".", 1)[0],
+        "friendly_name": state.attributes.get("friendly_name"),
+        "state": state_logic.to_dict(state),
+    }
+
+
+@router.get("/{entity_id}/history", response_model=List[Dict[str, Any]])
+def get_entity_history(
+    entity_id: str,
+    hours: float = Query(24, gt=0, description="How far back to look"),
+    significant_only: bool = Query(False, description="Only significant state changes"),
+):
+    """State history for one entity over the last `hours`."""
+    try:
+        client = get_client()
+        entity = client.get_entity(entity_id=entity_id)
+        if entity is None:
+            raise HTTPException(status_code=404, detail=f"Entity {entity_id} not found")
+        end = datetime.now(timezone.utc)
+        histories = client.get_entity_histories(
+            entities=(entity,),
+            start_timestamp=end - timedelta(hours=hours),
+            end_timestamp=end,
+            significant_changes_only=significant_only,
+        )
+        return [state_logic.to_dict(s) for history in histories for s in history.states]
+    except HTTPException:
+        raise
+    except Exception:
+        log.exception(f"Failed to fetch history for {entity_id}")
+        raise HTTPException(status_code=500, detail="Unable to fetch history")
@@ -0,0 +1,32 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Body, HTTPException
+
+from modules.ha_api.client import get_client
+from modules.ha_api.routes.async_utils import ws_request
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("ha_api.routes.events")
+
+router = APIRouter(tags=["ha_api"])
+
+
+@router.get("/", response_model=List[Dict[str, Any]])
+def list_events():
+    """Event types Home Assistant has listeners for."""
+    try:
+        return [{"event_type": e.event_type, "listener_count": e.listener_count} for e in get_client().get_events()]
+    except Exception:
+        log.exception("Failed to list events")
+        raise HTTPException(status_code=503, detail="Unable to list events")
+
+
+@router.post("/{event_type}", response_model=Dict[str, Any])
+async def fire_event(event_type: str, data: Dict[str, Any] = Body(default={})):
+    """Fire an event on Home Assistant's bus."""
+    params: Dict[str, Any] = {"event_type": event_type}
+    if data:
+        params["event_data"] = data
+    result = await ws_request("fire_event", **params)
+    log.info(f"🔥 Fired '{event_type}' via API")
+    return {"event_type": event_type, "context": (result or {}).get("context")}
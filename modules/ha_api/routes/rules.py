@@ -0,0 +1,45 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException
+
+from modules.ha_api.client import get_env
+from modules.ha_api.logic.rules_engine import get_rules_engine, start_rules_engine
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("ha_api.routes.rules")
+
+router = APIRouter(tags=["ha_api"])
+
+
+def _engine():
+    engine = get_rules_engine()
+    if engine is None:
+        raise HTTPException(status_code=404, detail="Rules engine is not running (set HA_RULES_FILE)")
+    return engine
+
+
+@router.get("/", response_model=Dict[str, Any])
+def rules_stats():
+    """Engine statistics and per-rule run counters."""
+    engine = _engine()
+    return {**engine.stats(), "rule_stats": [rule.stats() for rule in engine.rules.values()]}
+
+
+@router.get("/{rule_id}", response_model=Dict[str, Any])
+def rule_stats(rule_id: str):
+    rule = _engine().rules.get(rule_id)
+    if rule is None:
+        raise HTTPException(status_code=404, detail=f"Unknown rule '{rule_id}'")
+    return rule.stats()
+
+
+@router.post("/reload", response_model=Dict[str, Any])
+def reload_rules():
+    """Reload HA_RULES_FILE; an invalid file leaves the running rules untouched."""
+    env = get_env(safe=True)
+    if not env or not env.HA_RULES_FILE:
+        raise HTTPException(status_code=404, detail="HA_RULES_FILE is not set")
+    try:
+        return start_rules_engine(env.HA_RULES_FILE).stats()
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
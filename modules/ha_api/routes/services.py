@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from modules.ha_api.logic.bulk_service import async_execute_plan, normalize_plan
+from modules.ha_api.routes.async_utils import ws_request
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("ha_api.routes.services")
+
+router = APIRouter(tags=["ha_api"])
+
+
+class ServiceCall(BaseModel):
+    entity_id: Optional[Union[str, List[str]]] = None
+    data: Dict[str, Any] = {}
+    return_response: bool = False
+
+
+class BulkPlan(BaseModel):
+    calls: List[Dict[str, Any]]
+    concurrency: Optional[int] = None
+    coalesce: Optional[bool] = None
+
+
+@router.get("/", response_model=Dict[str, Any])
+async def list_services():
+    """All service domains and their service definitions."""
+    return await ws_request("get_services")
+
+
+@router.get("/{domain}", response_model=Dict[str, Any])
+async def get_domain_services(domain: str):
+    """Service definitions for one domain."""
+    services = await ws_request("get_services")
+    if domain not in services:
+        raise HTTPException(status_code=404, detail=f"Domain {domain} not found")
+    return services[domain]
+
+
+@router.post("/{domain}/{service}", response_model=Dict[str, Any])
+async def call_service(domain: str, service: str, call: ServiceCall):
+    """Call a service over the shared WebSocket (pipelined with other calls)."""
+    params: Dict[str, Any] = {
+        "domain": domain,
+        "service": service,
+        "service_data": call.data,
+        "return_response": call.return_response,
+    }
+    if call.entity_id is not None:
+        params["target"] = {"entity_id": call.entity_id}
+    result = await ws_request("call_service", **params) or {}
+    log.info(f"🚀 {domain}.{service} called via API")
+    return {"context": result.get("context"), "response": result.get("response")}
+
+
+@router.post("/bulk", response_model=Dict[str, Any])
+async def call_services_bulk(plan: BulkPlan):
+    """
+    Run a bulk service plan (same format as `ha_api service bulk`): calls are
+    coalesced per service + data and pipelined over the shared WebSocket.
+    Returns a summary and one result row per target.
+    """
+    try:
+        normalized = normalize_plan(plan.model_dump(exclude_none=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await async_execute_plan(normalized)
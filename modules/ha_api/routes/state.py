@@ -0,0 +1,96 @@
+import fnmatch
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+from homeassistant_api import State
+
+from modules.ha_api.client import get_client
+from modules.ha_api.logic import state as state_logic
+from modules.ha_api.logic.state_mirror import get_state_mirror
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("ha_api.routes.state")
+
+router = APIRouter(tags=["ha_api"])
+
+# How long a request waits for the mirror's first snapshot before falling back to REST
+MIRROR_WAIT = 5
+
+
+class StateUpdate(BaseModel):
+    state: str
+    attributes: Dict[str, Any] = {}
+
+
+def current_states() -> Tuple[State, ...]:
+    """All states from the live mirror, or one REST call while it is still loading."""
+    try:
+        mirror = get_state_mirror()
+        if mirror.wait_ready(MIRROR_WAIT):
+            return mirror.all()
+    except Exception as e:
+        log.warning(f"⚠️ State mirror unavailable ({e}); using REST")
+    return get_client().get_states()
+
+
+def current_state(entity_id: str) -> Optional[State]:
+    try:
+        mirror = get_state_mirror()
+        if mirror.wait_ready(MIRROR_WAIT):
+            return mirror.get(entity_id)
+    except Exception as e:
+        log.warning(f"⚠️ State mirror unavailable ({e}); using REST")
+    return get_client().get_state(entity_id=entity_id)
+
+
+@router.get("/", response_model=List[Dict[str, Any]])
+def list_states(
+    domain: Optional[str] = Query(None, description="Only entities in this domain (e.g. 'light')"),
+    entity: Optional[str] = Query(None, description="Entity ID glob (e.g. 'sensor.*_temperature')"),
+):
+    """List entity states, served from the live state mirror."""
+    try:
+        states = current_states()
+    except Exception:
+        log.exception("Failed to fetch states")
+        raise HTTPException(status_code=503, detail="Unable to fetch states")
+    if domain:
+        states = [s for s in states if s.entity_id.startswith(f"{domain}.")]
+    if entity:
+        states = [s for s in states if fnmatch.fnmatchcase(s.entity_id, entity)]
+    return [state_logic.to_dict(s) for s in states]
+
+
+@router.get("/mirror", response_model=Dict[str, Any])
+def mirror_stats():
+    """Status of the in-memory state mirror."""
+    try:
+        mirror = get_state_mirror()
+        return {**mirror.stats(), "by_domain": mirror.domains()}
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/{entity_id}", response_model=Dict[str, Any])
+def get_state(entity_id: str):
+    """Current state of one entity."""
+    try:
+        state = current_state(entity_id)
+    except Exception:
+        log.exception(f"Failed to fetch state for {entity_id}")
+        raise HTTPException(status_code=503, detail="Unable to fetch state")
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Entity {entity_id} not found")
+    return state_logic.to_dict(state)
+
+
+@router.post("/{entity_id}", response_model=Dict[str, Any])
+def set_state(entity_id: str, update: StateUpdate):
+    """Set (or create) an entity's state in Home Assistant's state machine."""
+    try:
+        state = get_client().set_state(State(entity_id=entity_id, state=update.state, attributes=update.attributes))
+        return state_logic.to_dict(state)
+    except Exception:
+        log.exception(f"Failed to set state for {entity_id}")
+        raise HTTPException(status_code=500, detail="Unable to set state")
@@ -0,0 +1,47 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from modules.ha_api.logic.template_renderer import TemplateError, get_template_renderer
+from modules.ha_api.routes.async_utils import _http_error
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("ha_api.routes.template")
+
+router = APIRouter(tags=["ha_api"])
+
+
+class TemplateRequest(BaseModel):
+    template: str
+    variables: Dict[str, Any] = {}
+
+
+class TemplateBatch(BaseModel):
+    templates: List[TemplateRequest]
+
+
+@router.post("/", response_model=Dict[str, Any])
+async def render_template(request: TemplateRequest):
+    """Render a Jinja2 template with Home Assistant's state context (cached, kept fresh by HA pushes)."""
+    try:
+        return await get_template_renderer().arender_detail(request.template, request.variables)
+    except TemplateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise _http_error(e, "render_template")
+
+
+@router.post("/batch", response_model=List[Dict[str, Any]])
+async def render_templates(batch: TemplateBatch):
+    """Render many templates in one WebSocket round-trip; errors are reported per template."""
+    try:
+        return await get_template_renderer().arender_many([(t.template, t.variables) for t in batch.templates])
+    except Exception as e:
+        raise _http_error(e, "render_template")
+
+
+@router.get("/stats", response_model=Dict[str, Any])
+def template_stats():
+    """Template cache size, hit/miss counts and pushed re-renders."""
+    return get_template_renderer().stats()
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from modules.ha_api.logic.event_hub import get_event_hub
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("ha_api.routes.ws_listen")
+
+router = APIRouter(tags=["ha_api"])
+
+KEEPALIVE_SECONDS = 15
+
+
+async def _open_stream(event_type: Optional[List[str]], entity: Optional[List[str]]):
+    try:
+        return await get_event_hub().add(event_types=event_type, entity_globs=entity)
+    except Exception as e:
+        log.warning(f"⚠️ Could not subscribe to Home Assistant events: {e}")
+        raise HTTPException(status_code=503, detail="Home Assistant event stream unavailable")
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    event_type: Optional[List[str]] = Query(None, description="Event type(s) to receive; repeat for several"),
+    entity: Optional[List[str]] = Query(None, description="Entity ID glob(s), e.g. 'light.*'"),
+):
+    """
+    Server-sent events from Home Assistant's event bus. Every subscriber shares
+    one upstream subscription; filters are applied server-side.
+    """
+    stream = await _open_stream(event_type, entity)
+
+    async def sse():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                item = await stream.get(timeout=KEEPALIVE_SECONDS)
+                if item is None:
+                    yield ": keepalive\n\n"
+                    continue
+                name, data = item
+                yield f"event: {name}\ndata: {data}\n\n"
+        finally:
+            stream.close()
+
+    return StreamingResponse(sse(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    event_type: Optional[List[str]] = Query(None),
+    entity: Optional[List[str]] = Query(None),
+):
+    """The same filtered fan-out over a WebSocket; each message is one event as JSON."""
+    await websocket.accept()
+    try:
+        stream = await get_event_hub().add(event_types=event_type, entity_globs=entity)
+    except Exception as e:
+        log.warning(f"⚠️ Could not subscribe to Home Assistant events: {e}")
+        await websocket.close(code=1011, reason="Home Assistant event stream unavailable")
+        return
+    # Watch the client side too, so a quiet disconnect is noticed without waiting for an event
+    receiver = asyncio.create_task(websocket.receive_text())
+    try:
+        while True:
+            getter = asyncio.create_task(stream.get())
+            done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                await websocket.send_text(getter.result()[1])
+            else:
+                getter.cancel()
+            if receiver in done:
+                receiver.result()  # raises WebSocketDisconnect; client messages are ignored
+                receiver = asyncio.create_task(websocket.receive_text())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        stream.close()
+
+
+@router.get("/stats", response_model=Dict[str, Any])
+def stream_stats():
+    """Subscriber count and upstream status of the event fan-out."""
+    return get_event_hub().stats()
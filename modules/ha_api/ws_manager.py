@@ -0,0 +1,486 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import asyncio
+import atexit
+import concurrent.futures
+import inspect
+import json
+import threading
+import time
+
+import aiohttp
+from homer.utils.logger import get_module_logger
+from modules.ha_api.client import get_env, get_ws_url
+
+log = get_module_logger("ha_api.ws_manager")
+
+MAX_BACKOFF = 30
+
+# Subscription callbacks receive the raw `event` payload of each message
+EventCallback = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+ConnectHook = Callable[["WebSocketManager"], Union[None, Awaitable[None]]]
+
+
+class HAWebSocketError(Exception):
+    """Raised when Home Assistant answers a WebSocket command with `success: false`."""
+    def __init__(self, code: str, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(f"{code}: {message}")
+
+
+class Subscription:
+    """
+    A live subscription (subscribe_events, subscribe_trigger, render_template, …).
+    `id` is the message id on the current socket; it changes on resubscribe.
+    """
+
+    def __init__(self, manager: "WebSocketManager", message: Dict[str, Any], callback: EventCallback):
+        self.manager = manager
+        self.message = message
+        self.callback = callback
+        self.id: Optional[int] = None
+
+    def unsubscribe(self, wait: bool = True):
+        self.manager.unsubscribe(self, wait=wait)
+
+    def __repr__(self) -> str:
+        return f"Subscription({self.message.get('type')}, id={self.id})"
+
+
+class WebSocketManager:
+    """
+    One authenticated Home Assistant WebSocket connection shared by the process.
+
+    The socket lives on a dedicated event-loop thread. Commands from any thread or
+    loop are pipelined over it and matched to their results by message id, so
+    many `get_states`/`call_service`/`render_template` calls can be in flight at
+    once. Subscriptions are multiplexed on the same socket, re-established after a
+    reconnect, and `ping` keeps the connection honest.
+    """
+
+    def __init__(self, url: str, token: str, ping_interval: float = 30, request_timeout: float = 30):
+        self.url = url
+        self._token = token
+        self.ping_interval = ping_interval
+        self.request_timeout = request_timeout
+        self.ha_version: Optional[str] = None
+        self.latency_ms: Optional[float] = None
+        self.connects = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._connected: Optional[asyncio.Event] = None
+        self._send_lock: Optional[asyncio.Lock] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._subscriptions: Dict[int, Subscription] = {}
+        self._unsent: List[Subscription] = []  # registered while disconnected
+        self._connect_hooks: List[ConnectHook] = []
+
+    @property
+    def connected(self) -> bool:
+        return self._connected is not None and self._connected.is_set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "ha_version": self.ha_version,
+            "connects": self.connects,
+            "pending": len(self._pending),
+            "subscriptions": len(self._subscriptions) + len(self._unsent),
+            "latency_ms": self.latency_ms,
+        }
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🔌 Loop thread + connection lifecycle
+    # ──────────────────────────────────────────────────────────────────────
+
+    def start(self) -> "WebSocketManager":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run_loop, name="ha-ws-manager", daemon=True)
+            self._thread.start()
+            self._ready.wait()
+        return self
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._connected = asyncio.Event()
+        self._send_lock = asyncio.Lock()
+        self._stop_event = asyncio.Event()
+        self._ready.set()
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        self._session = aiohttp.ClientSession()
+        attempt = 0
+        try:
+            while not self._stopping:
+                try:
+                    await self._connect()
+                    attempt = 0
+                    await self._serve()
+                except Exception as e:
+                    self._on_disconnect()
+                    if self._stopping:
+                        break
+                    attempt += 1
+                    delay = min(MAX_BACKOFF, 2 ** (attempt - 1))
+                    log.warning(f"⚠️ HA WebSocket disconnected ({e}); reconnecting in {delay}s")
+                    try:
+                        await asyncio.wait_for(self._stop_event.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self._session.close()
+
+    async def _connect(self):
+        # max_msg_size=0: get_states on large installs easily exceeds aiohttp's 4 MiB default
+        self._ws = await self._session.ws_connect(self.url, max_msg_size=0, heartbeat=None)
+        hello = await self._ws.receive_json()
+        if hello.get("type") != "auth_required":
+            raise ConnectionError(f"Unexpected handshake message: {hello}")
+        await self._ws.send_json({"type": "auth", "access_token": self._token})
+        auth = await self._ws.receive_json()
+        if auth.get("type") == "auth_invalid":
+            log.error(f"❌ Home Assistant rejected the access token: {auth.get('message')}")
+            self._stopping = True  # retrying a bad token will not help
+        if auth.get("type") != "auth_ok":
+            raise ConnectionError(auth.get("message") or f"Authentication failed: {auth}")
+        self.ha_version = auth.get("ha_version")
+        self.connects += 1
+        log.info(f"✅ Connected to Home Assistant WebSocket ({self.ha_version})")
+
+    async def _serve(self):
+        reader = asyncio.create_task(self._read())
+        pinger = asyncio.create_task(self._keepalive())
+        setup = asyncio.create_task(self._on_connect())
+        try:
+            await reader
+        finally:
+            for task in (pinger, setup):
+                task.cancel()
+
+    async def _on_connect(self):
+        try:
+            await self._restore()
+        except Exception as e:
+            log.error(f"❌ WebSocket setup failed ({e}); reconnecting")
+            await self._ws.close()
+
+    async def _restore(self):
+        # Coalesced messages arrive as JSON arrays; fewer frames under load
+        await self._command({"type": "supported_features", "features": {"coalesce_messages": 1}}, require_connected=False)
+        # Everything goes back in the queue and leaves it only once its send succeeds,
+        # so a transport error part-way through keeps the rest for the next connect
+        self._unsent = list(self._subscriptions.values()) + self._unsent
+        self._subscriptions = {}
+        restored = await self._drain_unsent()
+        self._connected.set()
+        while self._unsent:
+            restored += await self._drain_unsent()
+        if self.connects > 1:
+            log.info(f"🔁 Resubscribed {restored} subscription(s)")
+        for hook in list(self._connect_hooks):
+            await self._call(hook, self)
+
+    async def _drain_unsent(self) -> int:
+        sent = 0
+        while self._unsent:
+            sub = self._unsent[0]
+            try:
+                await self._send_subscription(sub, require_connected=False)
+                sent += 1
+            except HAWebSocketError as e:
+                log.error(f"❌ Could not resubscribe {sub}: {e}")
+            except (ConnectionError, asyncio.TimeoutError):
+                self._subscriptions.pop(sub.id, None)
+                raise
+            if sub in self._unsent:
+                self._unsent.remove(sub)
+            else:
+                self._subscriptions.pop(sub.id, None)  # unsubscribed while its send was in flight
+        return sent
+
+    def _on_disconnect(self):
+        self._connected.clear()
+        if self._ws is not None and not self._ws.closed:
+            self._loop.create_task(self._ws.close())
+        self._ws = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Home Assistant WebSocket disconnected"))
+        self._pending.clear()
+
+    async def _read(self):
+        async for msg in self._ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                if msg.type == aiohttp.WSMsgType.ERROR:
+                    raise ConnectionError(self._ws.exception())
+                continue
+            payload = json.loads(msg.data)
+            for message in payload if isinstance(payload, list) else (payload,):
+                self._dispatch(message)
+        raise ConnectionError(f"socket closed (code {self._ws.close_code})")
+
+    def _dispatch(self, message: Dict[str, Any]):
+        kind = message.get("type")
+        if kind == "event":
+            sub = self._subscriptions.get(message.get("id"))
+            if sub is not None:
+                self._fire(sub.callback, message["event"])
+            return
+        future = self._pending.pop(message.get("id"), None)
+        if future is None or future.done():
+            return
+        if kind == "pong" or message.get("success"):
+            future.set_result(message.get("result"))
+        else:
+            error = message.get("error") or {}
+            future.set_exception(HAWebSocketError(error.get("code", "unknown_error"), error.get("message", str(message))))
+
+    def _fire(self, callback: EventCallback, event: Dict[str, Any]):
+        # Sync callbacks run inline (in order); coroutines are scheduled so the reader never stalls
+        try:
+            result = callback(event)
+            if inspect.isawaitable(result):
+                self._loop.create_task(self._call(lambda: result))
+        except Exception as e:
+            log.exception(f"❌ WebSocket callback {getattr(callback, '__name__', callback)} failed: {e}")
+
+    async def _call(self, callback: Callable, *args):
+        try:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            log.exception(f"❌ WebSocket callback {getattr(callback, '__name__', callback)} failed: {e}")
+
+    async def _ping(self) -> float:
+        started = time.perf_counter()
+        await self._command({"type": "ping"})
+        self.latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        return self.latency_ms
+
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                await self._ping()
+            except (asyncio.TimeoutError, ConnectionError, HAWebSocketError) as e:
+                reason = "no pong" if isinstance(e, asyncio.TimeoutError) else e
+                log.warning(f"⚠️ Ping to Home Assistant failed ({reason}); forcing reconnect")
+                if self._ws is not None:
+                    await self._ws.close()
+                return
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 📨 Commands (run on the manager loop)
+    # ──────────────────────────────────────────────────────────────────────
+
+    async def _command(
+        self,
+        message: Dict[str, Any],
+        timeout: Optional[float] = None,
+        require_connected: bool = True,
+        subscription: Optional[Subscription] = None,
+    ) -> Any:
+        timeout = timeout or self.request_timeout
+        if require_connected and not self._connected.is_set():
+            await asyncio.wait_for(self._connected.wait(), timeout)
+        if self._ws is None:
+            raise ConnectionError("Home Assistant WebSocket is not connected")
+        self._next_id += 1
+        message = {**message, "id": self._next_id}
+        if subscription is not None:
+            # Registered before sending: events may arrive ahead of the result
+            subscription.id = self._next_id
+            self._subscriptions[self._next_id] = subscription
+        future = self._pending[self._next_id] = self._loop.create_future()
+        async with self._send_lock:
+            await self._ws.send_str(json.dumps(message))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(message["id"], None)
+
+    async def _send_subscription(self, sub: Subscription, require_connected: bool = True):
+        try:
+            await self._command(sub.message, require_connected=require_connected, subscription=sub)
+        except HAWebSocketError:
+            self._subscriptions.pop(sub.id, None)
+            raise
+
+    async def _subscribe(self, message: Dict[str, Any], callback: EventCallback) -> Subscription:
+        sub = Subscription(self, message, callback)
+        if not self._connected.is_set():
+            self._unsent.append(sub)  # picked up by _on_connect
+            return sub
+        try:
+            await self._send_subscription(sub)
+        except (ConnectionError, asyncio.TimeoutError):
+            self._subscriptions.pop(sub.id, None)
+            self._unsent.append(sub)  # sent again on the next connect
+        return sub
+
+    async def _unsubscribe(self, sub: Subscription):
+        if sub in self._unsent:
+            self._unsent.remove(sub)
+            return
+        if self._subscriptions.pop(sub.id, None) is None:
+            return
+        if sub.message.get("type") in ("subscribe_events", "subscribe_trigger", "render_template") and self.connected:
+            try:
+                await self._command({"type": "unsubscribe_events", "subscription": sub.id})
+            except (HAWebSocketError, ConnectionError, asyncio.TimeoutError) as e:
+                log.debug(f"Unsubscribe of {sub} failed: {e}")
+
+    # ──────────────────────────────────────────────────────────────────────
+    # 🌐 Public API (any thread / any loop)
+    # ──────────────────────────────────────────────────────────────────────
+
+    def submit(self, coro) -> "concurrent.futures.Future":
+        """Schedule a coroutine on the manager loop without waiting for it."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _wait(self, coro, timeout: Optional[float] = None) -> Any:
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Blocking WebSocket call from a manager callback; use the async API instead")
+        return self.submit(coro).result(timeout)
+
+    async def _await(self, coro) -> Any:
+        if asyncio.get_running_loop() is self._loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def request(self, type: str, timeout: Optional[float] = None, **data) -> Any:
+        """Send a command and block for its `result`."""
+        return self._wait(self._command({"type": type, **data}, timeout=timeout))
+
+    async def arequest(self, type: str, timeout: Optional[float] = None, **data) -> Any:
+        """Send a command from any event loop and await its `result`."""
+        return await self._await(self._command({"type": type, **data}, timeout=timeout))
+
+    def subscribe(self, type: str, callback: EventCallback, **data) -> Subscription:
+        """
+        Subscribe (e.g. `subscribe_events`, `subscribe_trigger`, `render_template`).
+        `callback(event)` runs on the manager loop: keep it quick, or make it async.
+        """
+        return self._wait(self._subscribe({"type": type, **data}, callback))
+
+    async def asubscribe(self, type: str, callback: EventCallback, **data) -> Subscription:
+        return await self._await(self._subscribe({"type": type, **data}, callback))
+
+    async def _first_event(self, message: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        future = self._loop.create_future()
+
+        def resolve(event):
+            if not future.done():
+                future.set_result(event)
+
+        sub = await self._subscribe(message, resolve)
+        try:
+            return await asyncio.wait_for(future, timeout or self.request_timeout)
+        finally:
+            await self._unsubscribe(sub)
+
+    def first_event(self, type: str, timeout: Optional[float] = None, **data) -> Dict[str, Any]:
+        """Subscribe, wait for the first event (e.g. a `render_template` result), then unsubscribe."""
+        return self._wait(self._first_event({"type": type, **data}, timeout))
+
+    async def afirst_event(self, type: str, timeout: Optional[float] = None, **data) -> Dict[str, Any]:
+        return await self._await(self._first_event({"type": type, **data}, timeout))
+
+    def unsubscribe(self, sub: Subscription, wait: bool = True):
+        """Drop a subscription; `wait=False` returns without waiting for Home Assistant's ack."""
+        if threading.current_thread() is self._thread:
+            self._loop.create_task(self._unsubscribe(sub))
+        elif wait:
+            self._wait(self._unsubscribe(sub))
+        else:
+            self.submit(self._unsubscribe(sub))
+
+    def ping(self) -> float:
+        """Round-trip a `ping`; returns latency in milliseconds."""
+        return self._wait(self._ping())
+
+    async def aping(self) -> float:
+        return await self._await(self._ping())
+
+    def add_connect_hook(self, hook: ConnectHook):
+        """Run `hook(manager)` after every (re)connect, once subscriptions are restored."""
+        self._connect_hooks.append(hook)
+
+    def remove_connect_hook(self, hook: ConnectHook):
+        if hook in self._connect_hooks:
+            self._connect_hooks.remove(hook)
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        async def waiter():
+            await asyncio.wait_for(self._connected.wait(), timeout)
+        try:
+            self._wait(waiter())
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def close(self):
+        if self._thread is None:
+            return
+        async def shutdown():
+            self._stopping = True
+            self._stop_event.set()
+            if self._ws is not None:
+                await self._ws.close()
+        if self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop)
+        self._thread.join(timeout=5)
+        self._thread = None
+        log.debug("🔌 Closed Home Assistant WebSocket manager")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ♻️ Process-wide manager
+# ──────────────────────────────────────────────────────────────────────────────
+
+_manager: Optional[WebSocketManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_ws_manager() -> WebSocketManager:
+    """Return the shared WebSocket manager, connecting it on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            env = get_env(safe=True)
+            if not env or not (env.HA_WS_URL or env.HA_API_URL) or not env.HA_API_TOKEN:
+                raise RuntimeError("WebSocket client requires HA_WS_URL (or HA_API_URL) and HA_API_TOKEN to be set.")
+            _manager = WebSocketManager(
+                get_ws_url(env),
+                env.HA_API_TOKEN.get_secret_value(),
+                ping_interval=env.HA_WS_PING_INTERVAL,
+                request_timeout=env.HA_WS_REQUEST_TIMEOUT,
+            ).start()
+    return _manager
+
+
+def close_ws_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close()
+            _manager = None
+
+
+atexit.register(close_ws_manager)
@@ -1,11 +1,13 @@
 from fastapi import HTTPException
 from homer.api.core import HomerAPI, register_api
 from homer.utils.logger import get_module_logger
+from modules.netbox.async_client import close_async_netbox_client
 
 # Route modules (with routers exposed)
-from modules.netbox.routes.dcim import devices, interfaces, racks
+from modules.netbox.routes.dcim import devices, interfaces, rack_rollup, racks
 from modules.netbox.routes.ipam import ip_addresses, prefixes
 from modules.netbox.routes.tenancy import tenants
+from modules.netbox.routes import graphql, metadata, reconcile, topology, webhook
 
 log = get_module_logger("netbox-api")
 
@@ -20,19 +22,37 @@ class NetboxAPI(HomerAPI):
         async def ping():
             """Quick NetBox health check."""
             try:
-                from modules.netbox.client import get_netbox_client
-                nb = get_netbox_client()
-                return {"status": "ok", "version": nb.version}
+                from modules.netbox.async_client import get_async_netbox_client
+                nbx = get_async_netbox_client()
+                return {"status": "ok", "version": await nbx.version()}
             except HTTPException as e:
                 return {"status": "error", "message": e.detail}
             except Exception as e:
                 log.exception("❌ NetBox ping failed")
                 return {"status": "error", "message": str(e)}
 
+        # Release the shared async connection pool on shutdown
+        self.router.add_event_handler("shutdown", close_async_netbox_client)
+
         # Grouped route registration
         self.router.include_router(devices.router, prefix="/devices", tags=["dcim"])
         self.router.include_router(interfaces.router, prefix="/interfaces", tags=["dcim"])
+        self.router.include_router(rack_rollup.router, prefix="/racks", tags=["dcim"])
         self.router.include_router(racks.router, prefix="/racks", tags=["dcim"])
         self.router.include_router(ip_addresses.router, prefix="/ip-addresses", tags=["ipam"])
         self.router.include_router(prefixes.router, prefix="/prefixes", tags=["ipam"])
         self.router.include_router(tenants.router, prefix="/tenants", tags=["tenancy"])
+        self.router.include_router(graphql.router, prefix="/graphql", tags=["graphql"])
+        self.router.include_router(metadata.router, prefix="/metadata", tags=["metadata"])
+        self.router.include_router(reconcile.router, prefix="/reconcile", tags=["reconcile"])
+        self.router.include_router(topology.router, prefix="/topology", tags=["topology"])
+
+
+@register_api
+class NetboxWebhookAPI(HomerAPI):
+    """Mounts the NetBox change receiver next to the other webhooks (`/webhook/netbox`)."""
+    def __init__(self):
+        super().__init__(prefix="/webhook")
+
+    def register_routes(self):
+        self.router.include_router(webhook.router)
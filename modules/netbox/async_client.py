@@ -0,0 +1,233 @@
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Union
+import httpx
+from modules.netbox.logic.compact import compact_page
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox-async-client")
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_DELETE_CHUNK_SIZE = 500
+
+_client: Optional["AsyncNetbox"] = None
+
+
+class NetboxRequestError(Exception):
+    """Raised when NetBox answers an async request with an error status."""
+    def __init__(self, status_code: int, error: Any):
+        self.status_code = status_code
+        self.error = error
+        super().__init__(f"{status_code}: {error}")
+
+
+class AsyncEndpoint:
+    """Async counterpart of a pynetbox Endpoint, returning plain dicts."""
+
+    def __init__(self, api: "AsyncNetbox", path: str):
+        self.api = api
+        self.name = path.split("/")[-1]
+        self.url = f"{path.strip('/')}/"
+
+    def _detail(self, id: int, suffix: str = "") -> str:
+        return f"{self.url}{id}/{suffix}"
+
+    async def all(
+        self,
+        limit: int = 0,
+        offset: Optional[int] = None,
+        fields: Optional[str] = None,
+        brief: bool = False,
+        compact: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Return all objects, or a single page when `limit` is set."""
+        return await self.filter(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
+
+    async def filter(
+        self,
+        *args: str,
+        limit: int = 0,
+        offset: Optional[int] = None,
+        fields: Optional[str] = None,
+        brief: bool = False,
+        compact: bool = False,
+        **kwargs: Any,
+    ) -> List[Dict[str, Any]]:
+        """Return objects matching filters; remaining pages are fetched concurrently.
+
+        `fields` (comma-separated) and `brief` are passed through to NetBox to trim
+        each object to the requested columns. `compact` collapses nested objects to
+        id/display refs as each page arrives.
+        """
+        shape = compact_page if compact else (lambda results: results)
+        params = dict(kwargs)
+        if args:
+            params["q"] = " ".join(args)
+        if fields:
+            params["fields"] = fields
+        if brief:
+            params["brief"] = 1
+        if limit:
+            params.update({"limit": limit, "offset": offset or 0})
+            page = await self.api.request("GET", self.url, params=params)
+            return shape(page["results"])
+
+        start = offset or 0
+        page_size = self.api.page_size
+        first = await self.api.request("GET", self.url, params={**params, "limit": page_size, "offset": start})
+        results = shape(first["results"])
+        total = first["count"]
+        del first
+
+        async def fetch(o: int) -> List[Dict[str, Any]]:
+            page = await self.api.request("GET", self.url, params={**params, "limit": page_size, "offset": o})
+            return shape(page["results"])
+
+        pages = await asyncio.gather(*(fetch(o) for o in range(start + page_size, total, page_size)))
+        for page in pages:
+            results.extend(page)
+        return results
+
+    async def get(self, id: Optional[int] = None, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """Return one object by ID or by filters that match exactly one object."""
+        if id is not None:
+            try:
+                return await self.api.request("GET", self._detail(id))
+            except NetboxRequestError as e:
+                if e.status_code == 404:
+                    return None
+                raise
+        matches = await self.filter(limit=2, **kwargs)
+        if len(matches) > 1:
+            raise ValueError("get() returned more than one result; use filter() or add filters")
+        return matches[0] if matches else None
+
+    async def count(self, *args: str, **kwargs: Any) -> int:
+        """Return the number of objects matching filters."""
+        params = dict(kwargs, limit=1)
+        if args:
+            params["q"] = " ".join(args)
+        page = await self.api.request("GET", self.url, params=params)
+        return page["count"]
+
+    async def create(self, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Create one or more objects."""
+        return await self.api.request("POST", self.url, json=data)
+
+    async def update(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bulk update objects (each must include `id`)."""
+        return await self.api.request("PATCH", self.url, json=updates)
+
+    async def patch(self, id: int, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a single object by ID."""
+        return await self.api.request("PATCH", self._detail(id), json=changes)
+
+    async def delete(self, ids: List[int]) -> bool:
+        """Bulk delete objects by ID."""
+        await self.api.request("DELETE", self.url, json=[{"id": i} for i in ids])
+        return True
+
+    async def ids(self, **kwargs: Any) -> List[int]:
+        """Return IDs of objects matching filters using ID-only pages."""
+        records = await self.filter(fields="id", brief=True, **kwargs)
+        return [r["id"] for r in records]
+
+    async def delete_filtered(self, chunk_size: int = DEFAULT_DELETE_CHUNK_SIZE, **kwargs: Any) -> int:
+        """Delete objects matching filters in bulk chunks; return the number deleted."""
+        ids = await self.ids(**kwargs)
+        chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+        await asyncio.gather(*(self.delete(chunk) for chunk in chunks))
+        return len(ids)
+
+    async def choices(self) -> Dict[str, Any]:
+        """Return choice values for this endpoint's fields."""
+        options = await self.api.request("OPTIONS", self.url)
+        actions = options.get("actions", {})
+        post_data = actions.get("POST") or actions.get("PUT") or {}
+        return {
+            field: meta["choices"]
+            for field, meta in post_data.items()
+            if "choices" in meta
+        }
+
+    async def list_available(self, id: int, kind: str) -> List[Dict[str, Any]]:
+        """List available IPs/prefixes/VLANs under an object (`kind` e.g. 'available-ips')."""
+        data = await self.api.request("GET", self._detail(id, f"{kind}/"))
+        return data["results"] if isinstance(data, dict) and "results" in data else data
+
+    async def create_available(self, id: int, kind: str, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Any:
+        """Allocate available IPs/prefixes/VLANs under an object."""
+        return await self.api.request("POST", self._detail(id, f"{kind}/"), json=data)
+
+
+class AsyncNetbox:
+    """Process-wide async NetBox client backed by one pooled httpx.AsyncClient."""
+
+    def __init__(self, url: str, token: str, max_connections: int = DEFAULT_MAX_CONNECTIONS, page_size: int = DEFAULT_PAGE_SIZE):
+        self.page_size = page_size
+        self._endpoints: Dict[str, AsyncEndpoint] = {}
+        self.http = httpx.AsyncClient(
+            base_url=f"{url.rstrip('/')}/api/",
+            headers={
+                "Authorization": f"Token {token}",
+                "Accept": "application/json",
+            },
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+
+    def endpoint(self, path: str) -> AsyncEndpoint:
+        """Return the endpoint for a dotted path such as 'ipam.prefixes'."""
+        key = path.strip().strip("/").replace("/", ".").replace("-", "_")
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            url_path = key.replace(".", "/").replace("_", "-")
+            endpoint = self._endpoints[key] = AsyncEndpoint(self, url_path)
+        return endpoint
+
+    async def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None, json: Any = None) -> Any:
+        resp = await self.http.request(method, path, params=params, json=json)
+        if resp.status_code >= 400:
+            try:
+                error = resp.json()
+            except ValueError:
+                error = resp.text
+            raise NetboxRequestError(resp.status_code, error)
+        if resp.status_code == 204 or not resp.content:
+            return None
+        return resp.json()
+
+    async def version(self) -> str:
+        resp = await self.http.get("")
+        return resp.headers.get("API-Version", "")
+
+    async def aclose(self):
+        await self.http.aclose()
+
+
+def get_async_netbox_client() -> AsyncNetbox:
+    """Return the shared async NetBox client, initializing if needed."""
+    global _client
+    if _client is None:
+        try:
+            _client = AsyncNetbox(
+                os.environ["NETBOX_URL"],
+                os.environ["NETBOX_TOKEN"],
+                max_connections=int(os.getenv("NETBOX_ASYNC_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            )
+            log.info("✅ Async NetBox client initialized")
+        except KeyError as e:
+            log.error(f"❌ Missing required environment variable: {e.args[0]}")
+            raise
+    return _client
+
+
+async def close_async_netbox_client():
+    """Close the shared async client's connection pool (FastAPI shutdown hook)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        log.info("🔌 Async NetBox client closed")
@@ -0,0 +1,139 @@
+
+"""Compare peak RSS of bulk NetBox results as pynetbox Records vs compact dicts.
+
+Runs each mode in a fresh interpreter over synthetic device pages shaped like
+NetBox's `/api/dcim/devices/` output, so no NetBox instance is needed:
+
+    python -m modules.netbox.benchmarks.compact_rss --count 100000
+
+Modes:
+  records  Record per object, then dict(record) for output (previous CLI path)
+  raw      decoded JSON dicts kept as-is
+  compact  compact_record() applied page by page (nested objects -> id/display)
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+MODES = ("records", "raw", "compact")
+PAGE_SIZE = 1000
+
+
+def _ref(kind: str, id: int, name: str, **extra):
+    return {
+        "id": id,
+        "url": f"http://netbox.local/api/{kind}/{id}/",
+        "display_url": f"http://netbox.local/{kind}/{id}/",
+        "display": name,
+        "name": name,
+        "slug": name.lower().replace(" ", "-"),
+        "description": "",
+        **extra,
+    }
+
+
+def _device(i: int) -> dict:
+    site = i % 20
+    return {
+        "id": i,
+        "url": f"http://netbox.local/api/dcim/devices/{i}/",
+        "display_url": f"http://netbox.local/dcim/devices/{i}/",
+        "display": f"device-{i:06d}",
+        "name": f"device-{i:06d}",
+        "device_type": _ref("dcim/device-types", i % 15, f"Model {i % 15}",
+                            manufacturer=_ref("dcim/manufacturers", i % 5, f"Vendor {i % 5}")),
+        "role": _ref("dcim/device-roles", i % 6, f"Role {i % 6}"),
+        "tenant": _ref("tenancy/tenants", i % 10, f"Tenant {i % 10}"),
+        "platform": _ref("dcim/platforms", i % 4, f"Platform {i % 4}"),
+        "serial": f"SN{i:010d}",
+        "asset_tag": None,
+        "site": _ref("dcim/sites", site, f"Site {site}"),
+        "location": None,
+        "rack": _ref("dcim/racks", i % 400, f"R{i % 400:03d}"),
+        "position": float(i % 42 + 1),
+        "face": {"value": "front", "label": "Front"},
+        "status": {"value": "active", "label": "Active"},
+        "airflow": None,
+        "primary_ip4": {
+            "id": i,
+            "url": f"http://netbox.local/api/ipam/ip-addresses/{i}/",
+            "display": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}/24",
+            "family": {"value": 4, "label": "IPv4"},
+            "address": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}/24",
+            "description": "",
+        },
+        "primary_ip6": None,
+        "comments": "",
+        "tags": [_ref("extras/tags", t, f"tag-{t}", color="9e9e9e") for t in range(i % 3)],
+        "custom_fields": {"owner": f"team-{i % 8}", "warranty": None},
+        "created": "2024-01-01T00:00:00Z",
+        "last_updated": "2024-06-01T12:00:00Z",
+        "interface_count": 48,
+    }
+
+
+def _pages(count: int):
+    """Yield decoded JSON pages, as if they had just come off the wire."""
+    for start in range(0, count, PAGE_SIZE):
+        text = json.dumps({"count": count, "results": [_device(i) for i in range(start, min(start + PAGE_SIZE, count))]})
+        yield json.loads(text)["results"]
+
+
+def _run(mode: str, count: int) -> dict:
+    started = time.perf_counter()
+    if mode == "records":
+        import pynetbox
+        from pynetbox.core.response import Record
+
+        api = pynetbox.api("http://netbox.local", token="0" * 40)
+        endpoint = api.dcim.devices
+        records = []
+        for page in _pages(count):
+            records.extend(Record(obj, api, endpoint) for obj in page)
+        results = [dict(r) for r in records]
+    elif mode == "raw":
+        results = []
+        for page in _pages(count):
+            results.extend(page)
+    else:
+        from modules.netbox.logic.compact import compact_page
+
+        results = []
+        for page in _pages(count):
+            results.extend(compact_page(page))
+
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    return {"mode": mode, "count": len(results), "peak_rss_mb": round(peak_kb / 1024, 1), "seconds": round(elapsed, 2)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="Number of synthetic devices.")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes to run.")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_run(args.child, args.count)))
+        return
+
+    rows = []
+    for mode in args.modes.split(","):
+        out = subprocess.run(
+            [sys.executable, "-m", "modules.netbox.benchmarks.compact_rss", "--child", mode, "--count", str(args.count)],
+            check=True, capture_output=True, text=True,
+        )
+        rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'mode':<10}{'objects':>10}{'peak RSS (MB)':>16}{'seconds':>10}")
+    for row in rows:
+        print(f"{row['mode']:<10}{row['count']:>10}{row['peak_rss_mb']:>16}{row['seconds']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -60,6 +60,26 @@ from modules.netbox.cli_functions.tenancy.tenants import cli as tenants_cli
 
 cli.add_command(tenants_cli)
 
+# GraphQL
+from modules.netbox.cli_functions.graphql import cli as graphql_cli
+
+cli.add_command(graphql_cli)
+
+# Topology
+from modules.netbox.cli_functions.topology import cli as topology_cli
+
+cli.add_command(topology_cli)
+
+# Reconciliation
+from modules.netbox.cli_functions.reconcile import cli as reconcile_cli
+
+cli.add_command(reconcile_cli)
+
+# Batch / script mode
+from modules.netbox.cli_functions.shell import cli as shell_cli
+
+cli.add_command(shell_cli)
+
 # Utilities
 from modules.netbox.cli_functions import utils as utils_cli
 
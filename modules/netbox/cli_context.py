@@ -1,7 +1,8 @@
 
 import click
 import functools
-from modules.netbox.client import get_netbox_client
+from typing import Optional
+from modules.netbox.client import get_netbox_client, resolve_endpoint
 
 
 class NetboxContext:
@@ -13,17 +14,25 @@ class NetboxContext:
         """
         Resolve a dotted endpoint path (e.g., 'ipam.prefixes') to pynetbox endpoint.
         """
-        obj = self.client
-        for part in path.strip().split("."):
-            obj = getattr(obj, part)
-        return obj
+        return resolve_endpoint(path)
+
+
+_context: Optional[NetboxContext] = None
+
+
+def get_netbox_context() -> NetboxContext:
+    """Return the process-wide NetboxContext, creating it on first use."""
+    global _context
+    if _context is None:
+        _context = NetboxContext()
+    return _context
 
 
 def pass_netbox_context(func):
-    """Injects a NetboxContext instance into the CLI function."""
+    """Injects the shared NetboxContext instance into the CLI function."""
     @click.pass_context
     @functools.wraps(func)
     def wrapper(click_ctx, *args, **kwargs):
-        ctx = NetboxContext()
+        ctx = get_netbox_context()
         return func(ctx, *args, **kwargs)
     return wrapper
@@ -3,7 +3,7 @@ import json
 import click
 from typing import Optional
 
-from modules.netbox.cli_functions.dcim import devices as device_logic
+from modules.netbox.logic.dcim import devices as device_logic
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.cli.dcim.devices")
@@ -18,9 +18,12 @@ def cli():
 @cli.command("all")
 @click.option("--limit", default=0, help="Max number of devices to fetch.")
 @click.option("--offset", default=None, type=int, help="Offset for pagination.")
-def get_all(limit: int, offset: Optional[int]):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def get_all(limit: int, offset: Optional[int], fields: Optional[str], brief: bool, compact: bool):
     """Fetch all devices."""
-    records = device_logic.get_all_devices(limit=limit, offset=offset)
+    records = device_logic.get_all_devices(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     click.echo(json.dumps([dict(r) for r in records], indent=2))
 
 
@@ -39,10 +42,13 @@ def get_device(id: Optional[int], filters):
 
 @cli.command("filter")
 @click.option("--filter", "filters", multiple=True, help="Filter as key=value.")
-def filter_devices(filters):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def filter_devices(filters, fields: Optional[str], brief: bool, compact: bool):
     """Filter devices using NetBox query parameters."""
     kwargs = dict(kv.split("=", 1) for kv in filters)
-    results = device_logic.filter_devices(**kwargs)
+    results = device_logic.filter_devices(fields=fields, brief=brief, compact=compact, **kwargs)
     click.echo(json.dumps([dict(r) for r in results], indent=2))
 
 
@@ -3,7 +3,7 @@ import json
 import click
 from typing import Optional
 
-from modules.netbox.cli_functions.dcim import interfaces as interface_logic
+from modules.netbox.logic.dcim import interfaces as interface_logic
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.cli.dcim.interfaces")
@@ -18,9 +18,12 @@ def cli():
 @cli.command("all")
 @click.option("--limit", default=0, help="Max number of interfaces to fetch.")
 @click.option("--offset", type=int, default=None, help="Offset for pagination.")
-def get_all(limit, offset):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def get_all(limit, offset, fields, brief, compact):
     """Fetch all interfaces."""
-    records = interface_logic.get_all_interfaces(limit=limit, offset=offset)
+    records = interface_logic.get_all_interfaces(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     click.echo(json.dumps([dict(r) for r in records], indent=2))
 
 
@@ -39,10 +42,13 @@ def get_interface(id, filters):
 
 @cli.command("filter")
 @click.option("--filter", "filters", multiple=True, help="Filter as key=value.")
-def filter_interfaces(filters):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def filter_interfaces(filters, fields, brief, compact):
     """Filter interfaces using NetBox query parameters."""
     kwargs = dict(kv.split("=", 1) for kv in filters)
-    results = interface_logic.filter_interfaces(**kwargs)
+    results = interface_logic.filter_interfaces(fields=fields, brief=brief, compact=compact, **kwargs)
     click.echo(json.dumps([dict(r) for r in results], indent=2))
 
 
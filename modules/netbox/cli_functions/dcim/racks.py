@@ -3,7 +3,8 @@ import json
 import click
 from typing import Optional
 
-from modules.netbox.cli_functions.dcim import racks as rack_logic
+from modules.netbox.logic.dcim import racks as rack_logic
+from modules.netbox.logic.dcim import rack_rollup
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.cli.dcim.racks")
@@ -18,9 +19,12 @@ def cli():
 @cli.command("all")
 @click.option("--limit", default=0, help="Max number of racks to fetch.")
 @click.option("--offset", type=int, default=None, help="Offset for pagination.")
-def get_all(limit, offset):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def get_all(limit, offset, fields, brief, compact):
     """Fetch all racks."""
-    records = rack_logic.get_all_racks(limit=limit, offset=offset)
+    records = rack_logic.get_all_racks(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     click.echo(json.dumps([dict(r) for r in records], indent=2))
 
 
@@ -39,10 +43,13 @@ def get_rack(id, filters):
 
 @cli.command("filter")
 @click.option("--filter", "filters", multiple=True, help="Filter as key=value.")
-def filter_racks(filters):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def filter_racks(filters, fields, brief, compact):
     """Filter racks using NetBox query parameters."""
     kwargs = dict(kv.split("=", 1) for kv in filters)
-    results = rack_logic.filter_racks(**kwargs)
+    results = rack_logic.filter_racks(fields=fields, brief=brief, compact=compact, **kwargs)
     click.echo(json.dumps([dict(r) for r in results], indent=2))
 
 
@@ -114,6 +121,35 @@ def patch_rack(rack_name, site, data):
         click.echo(f"Failed to update rack '{rack_name}' at site '{site}'", err=True)
 
 
+@cli.command("rollup")
+@click.option("--site-id", type=int, default=None, help="Limit the report to one site.")
+@click.option("--by", type=click.Choice(["site", "tenant"]), default="site", show_default=True, help="Aggregate per site or per tenant.")
+@click.option("--per-rack", is_flag=True, help="Show per-rack rollups instead of aggregates.")
+@click.option("--no-power", is_flag=True, help="Skip fetching power ports.")
+@click.option("--json", "as_json", is_flag=True, help="Output raw JSON.")
+def rollup(site_id, by, per_rack, no_power, as_json):
+    """Capacity report (free U, power, weight, tenant occupancy) from one bulk pass."""
+    if per_rack:
+        rows = rack_rollup.get_rack_rollups(site_id=site_id, include_power=not no_power)
+        label = "name"
+    else:
+        report = rack_rollup.get_rollup_report(site_id=site_id, by=by, include_power=not no_power)
+        rows = report[by + "s"]
+        label = by
+    if as_json:
+        click.echo(json.dumps(report if not per_rack else rows, indent=2))
+        return
+    click.echo(f"{label:<32}{'racks':>7}{'U used':>9}{'U free':>9}{'util':>8}{'alloc W':>10}")
+    for row in rows:
+        # Rollup rows are cached; build the display name without touching them
+        name = f"{(row['site'] or {}).get('display')}/{row['name']}" if per_rack else row[label]
+        util = f"{row['utilisation']:.0%}" if "utilisation" in row else "-"
+        click.echo(
+            f"{str(name)[:31]:<32}{row.get('racks', 1):>7}{row['u_used']:>9.1f}"
+            f"{row.get('u_free', 0):>9.1f}{util:>8}{row.get('power_allocated_w', 0):>10}"
+        )
+
+
 def load_json_arg(arg: str):
     """Load JSON from a string or @file path."""
     if arg.startswith("@"):
@@ -0,0 +1,67 @@
+
+import json
+import click
+from typing import Optional
+
+from modules.netbox.logic import graphql as gql_logic
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.cli.graphql")
+
+
+@click.group("graphql")
+def cli():
+    """Single round-trip NetBox reads via GraphQL."""
+    pass
+
+
+@cli.command("query")
+@click.option("--query", "query", required=True, help="GraphQL query string or @file.graphql.")
+@click.option("--variables", default=None, help="JSON string or @file.json with query variables.")
+def run_query(query: str, variables: Optional[str]):
+    """Execute a raw GraphQL query."""
+    query_text = load_text_arg(query)
+    variables_data = json.loads(load_text_arg(variables)) if variables else None
+    result = gql_logic.execute_query(query_text, variables_data)
+    click.echo(json.dumps(result, indent=2))
+
+
+@cli.command("device")
+@click.argument("device_id", type=int)
+def device_detail(device_id: int):
+    """Show a device with its rack, tenant, interfaces and IPs."""
+    device = gql_logic.get_device_detail(device_id)
+    if device:
+        click.echo(json.dumps(device, indent=2))
+    else:
+        click.echo("Device not found", err=True)
+
+
+@cli.command("rack")
+@click.argument("rack_id", type=int)
+def rack_inventory(rack_id: int):
+    """Show a rack with all mounted devices."""
+    rack = gql_logic.get_rack_inventory(rack_id)
+    if rack:
+        click.echo(json.dumps(rack, indent=2))
+    else:
+        click.echo("Rack not found", err=True)
+
+
+@cli.command("prefix-utilisation")
+@click.argument("prefix")
+def prefix_utilisation(prefix: str):
+    """Show a prefix with its children, IPs and utilisation."""
+    result = gql_logic.get_prefix_utilisation(prefix)
+    if result:
+        click.echo(json.dumps(result, indent=2))
+    else:
+        click.echo("Prefix not found", err=True)
+
+
+def load_text_arg(arg: str) -> str:
+    """Load text from a string or @file path."""
+    if arg.startswith("@"):
+        with open(arg[1:], "r") as f:
+            return f.read()
+    return arg
@@ -3,7 +3,7 @@ import json
 import click
 from typing import Optional
 
-from modules.netbox.cli_functions.ipam import ip_addresses as ip_logic
+from modules.netbox.logic.ipam import ip_addresses as ip_logic
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.cli.ipam.ip_addresses")
@@ -18,9 +18,12 @@ def cli():
 @cli.command("all")
 @click.option("--limit", default=0, help="Max number of IPs to fetch.")
 @click.option("--offset", type=int, default=None, help="Offset for pagination.")
-def get_all(limit, offset):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def get_all(limit, offset, fields, brief, compact):
     """Fetch all IP addresses."""
-    records = ip_logic.get_all_ip_addresses(limit=limit, offset=offset)
+    records = ip_logic.get_all_ip_addresses(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     click.echo(json.dumps([dict(r) for r in records], indent=2))
 
 
@@ -39,10 +42,13 @@ def get_ip(id, filters):
 
 @cli.command("filter")
 @click.option("--filter", "filters", multiple=True, help="Filter as key=value.")
-def filter_ips(filters):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def filter_ips(filters, fields, brief, compact):
     """Filter IP addresses."""
     kwargs = dict(kv.split("=", 1) for kv in filters)
-    records = ip_logic.filter_ip_addresses(**kwargs)
+    records = ip_logic.filter_ip_addresses(fields=fields, brief=brief, compact=compact, **kwargs)
     click.echo(json.dumps([dict(r) for r in records], indent=2))
 
 
@@ -3,7 +3,7 @@ import json
 import click
 from typing import Optional
 
-from modules.netbox.cli_functions.ipam import prefixes as prefix_logic
+from modules.netbox.logic.ipam import prefixes as prefix_logic
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.cli.ipam.prefixes")
@@ -18,9 +18,12 @@ def cli():
 @cli.command("all")
 @click.option("--limit", default=0, help="Limit number of prefixes.")
 @click.option("--offset", type=int, default=None, help="Pagination offset.")
-def get_all(limit, offset):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def get_all(limit, offset, fields, brief, compact):
     """List all prefixes."""
-    records = prefix_logic.get_all_prefixes(limit=limit, offset=offset)
+    records = prefix_logic.get_all_prefixes(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     click.echo(json.dumps([dict(r) for r in records], indent=2))
 
 
@@ -39,10 +42,13 @@ def get_prefix(id, filters):
 
 @cli.command("filter")
 @click.option("--filter", "filters", multiple=True, help="Filter as key=value.")
-def filter_prefixes(filters):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def filter_prefixes(filters, fields, brief, compact):
     """Filter prefixes by keyword arguments."""
     kwargs = dict(kv.split("=", 1) for kv in filters)
-    records = prefix_logic.filter_prefixes(**kwargs)
+    records = prefix_logic.filter_prefixes(fields=fields, brief=brief, compact=compact, **kwargs)
     click.echo(json.dumps([dict(r) for r in records], indent=2))
 
 
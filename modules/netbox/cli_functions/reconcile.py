@@ -0,0 +1,50 @@
+
+import json
+import click
+
+from modules.netbox.logic import reconcile as reconcile_logic
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.cli.reconcile")
+
+
+@click.command("reconcile")
+@click.option("--file", "path", required=True, type=click.Path(exists=True), help="Desired-state YAML or JSON file.")
+@click.option("--dry-run", is_flag=True, help="Show the plan without writing to NetBox.")
+@click.option("--batch-size", default=reconcile_logic.DEFAULT_BATCH_SIZE, show_default=True, help="Objects per bulk write.")
+@click.option("--workers", default=reconcile_logic.DEFAULT_WORKERS, show_default=True, help="Parallel write batches.")
+@click.option("--json", "as_json", is_flag=True, help="Print the full plan and results as JSON.")
+def cli(path: str, dry_run: bool, batch_size: int, workers: int, as_json: bool):
+    """Reconcile NetBox against a desired-state file, writing only what changed."""
+    specs = reconcile_logic.load_desired_state(path)
+    results = reconcile_logic.reconcile(specs, dry_run=dry_run, batch_size=batch_size, workers=workers)
+
+    if as_json:
+        click.echo(json.dumps(results, indent=2, default=str))
+        return
+
+    for entry in results:
+        plan = entry["plan"]
+        click.echo(f"📋 {plan['endpoint']}")
+        for obj in plan["create"]:
+            click.echo(f"  + create {json.dumps(obj, default=str)}")
+        for patch in plan["update"]:
+            fields = {k: v for k, v in patch.items() if k != "id"}
+            click.echo(f"  ~ update id={patch['id']} {json.dumps(fields, default=str)}")
+        for obj_id in plan["delete"]:
+            click.echo(f"  - delete id={obj_id}")
+        click.echo(
+            f"  {len(plan['create'])} to create, {len(plan['update'])} to update, "
+            f"{len(plan['delete'])} to delete, {plan['unchanged']} unchanged"
+        )
+        result = entry.get("result")
+        if result:
+            click.echo(
+                f"  ✅ created {result['created']}, updated {result['updated']}, "
+                f"deleted {result['deleted']} in {result['elapsed_seconds']}s"
+            )
+            for error in result["errors"]:
+                click.echo(f"  ❌ {error['op']} batch of {error['count']} failed: {error['error']}", err=True)
+
+    if dry_run:
+        click.echo("Dry run — no changes written.")
@@ -0,0 +1,162 @@
+
+import io
+import shlex
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import click
+
+from modules.netbox.cli_context import get_netbox_context
+from modules.netbox.client import preload_endpoints
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.cli.shell")
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """Routes writes to a per-thread buffer when one is set, else to the real stream."""
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._local = threading.local()
+
+    @property
+    def encoding(self):
+        return getattr(self._fallback, "encoding", "utf-8")
+
+    def capture(self, buffer: Optional[io.StringIO]):
+        self._local.buffer = buffer
+
+    def write(self, s: str) -> int:
+        return (getattr(self._local, "buffer", None) or self._fallback).write(s)
+
+    def flush(self):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            self._fallback.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _read_script(source) -> List[Tuple[int, List[str]]]:
+    """Parse script lines into (line number, argv) pairs, skipping blanks and comments."""
+    commands = []
+    for lineno, line in enumerate(source, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        argv = shlex.split(line)
+        if argv and argv[0] in ("homer", "netbox"):
+            argv = argv[1:] if argv[0] == "netbox" else argv[2:]
+        commands.append((lineno, argv))
+    return commands
+
+
+def _run_command(root: click.Group, argv: List[str]) -> int:
+    """Invoke one netbox CLI command in-process; return its exit code."""
+    if argv and argv[0] == "shell":
+        click.echo("❌ Nested shells are not supported", err=True)
+        return 1
+    try:
+        root.main(args=argv, prog_name="netbox", standalone_mode=False)
+        return 0
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted", err=True)
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        log.exception(f"Command failed: {' '.join(argv)}")
+        click.echo(f"❌ {type(e).__name__}: {e}", err=True)
+        return 1
+
+
+def _run_sequential(root, commands, fail_fast: bool) -> int:
+    failures = 0
+    for lineno, argv in commands:
+        code = _run_command(root, argv)
+        if code:
+            failures += 1
+            if fail_fast:
+                click.echo(f"❌ Stopping at line {lineno}", err=True)
+                break
+    return failures
+
+
+def _run_pipelined(root, commands, workers: int) -> int:
+    """Run commands concurrently, emitting each command's output in script order."""
+    stdout = _ThreadLocalStream(sys.stdout)
+    stderr = _ThreadLocalStream(sys.stderr)
+
+    def task(argv):
+        out, err = io.StringIO(), io.StringIO()
+        stdout.capture(out)
+        stderr.capture(err)
+        try:
+            return _run_command(root, argv), out.getvalue(), err.getvalue()
+        finally:
+            stdout.capture(None)
+            stderr.capture(None)
+
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = stdout, stderr
+    failures = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(task, argv) for _, argv in commands]
+            for future in futures:
+                code, out, err = future.result()
+                real_stdout.write(out)
+                real_stderr.write(err)
+                failures += 1 if code else 0
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+    return failures
+
+
+@click.command("shell")
+@click.option("--script", "script", type=click.File("r"), default=None,
+              help="File of netbox commands, one per line ('-' for stdin). Interactive if omitted.")
+@click.option("--workers", default=1, show_default=True,
+              help="Run script commands concurrently over the shared session (output stays in order).")
+@click.option("--fail-fast", is_flag=True, help="Stop at the first failing command (sequential mode only).")
+def cli(script, workers: int, fail_fast: bool):
+    """Run many NetBox commands in one process over one pooled session."""
+    from modules.netbox.cli import cli as root
+
+    get_netbox_context()
+    preload_endpoints()
+
+    if script is None:
+        click.echo("📡 NetBox shell — type commands without the 'netbox' prefix, 'exit' to quit.")
+        while True:
+            try:
+                line = input("netbox> ")
+            except EOFError:
+                break
+            if line.strip() in ("exit", "quit"):
+                break
+            for _, argv in _read_script([line]):
+                _run_command(root, argv)
+        return
+
+    commands = _read_script(script)
+    started = time.monotonic()
+    if workers > 1:
+        failures = _run_pipelined(root, commands, workers)
+    else:
+        failures = _run_sequential(root, commands, fail_fast)
+    elapsed = time.monotonic() - started
+
+    log.info(f"🏁 Ran {len(commands)} command(s) in {elapsed:.2f}s with {failures} failure(s)")
+    if failures:
+        raise SystemExit(1)
@@ -3,7 +3,7 @@ import json
 import click
 from typing import Optional
 
-from modules.netbox.cli_functions.tenancy import tenants as tenant_logic
+from modules.netbox.logic.tenancy import tenants as tenant_logic
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.cli.tenancy.tenants")
@@ -18,9 +18,12 @@ def cli():
 @cli.command("all")
 @click.option("--limit", default=0, help="Limit number of tenants.")
 @click.option("--offset", type=int, default=None, help="Pagination offset.")
-def get_all(limit, offset):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def get_all(limit, offset, fields, brief, compact):
     """Retrieve all tenants."""
-    tenants = tenant_logic.get_all_tenants(limit=limit, offset=offset)
+    tenants = tenant_logic.get_all_tenants(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     click.echo(json.dumps([dict(t) for t in tenants], indent=2))
 
 
@@ -39,10 +42,13 @@ def get_tenant(id, filters):
 
 @cli.command("filter")
 @click.option("--filter", "filters", multiple=True, help="Filter as key=value.")
-def filter_tenants(filters):
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
+def filter_tenants(filters, fields, brief, compact):
     """Filter tenants by field values."""
     kwargs = dict(kv.split("=", 1) for kv in filters)
-    tenants = tenant_logic.filter_tenants(**kwargs)
+    tenants = tenant_logic.filter_tenants(fields=fields, brief=brief, compact=compact, **kwargs)
     click.echo(json.dumps([dict(t) for t in tenants], indent=2))
 
 
@@ -0,0 +1,61 @@
+import json
+import click
+
+from modules.netbox.logic import topology as topology_logic
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.cli.topology")
+
+
+@click.group("topology")
+def cli():
+    """Cable topology queries from a bulk-loaded graph index."""
+    pass
+
+
+@cli.command("stats")
+def stats():
+    """Load the index and show its size."""
+    click.echo(json.dumps(topology_logic.get_topology_index().stats(), indent=2))
+
+
+@cli.command("trace")
+@click.argument("port_id", type=int)
+@click.option("--kind", default="interface", show_default=True, help="Port kind: interface, frontport, rearport, ...")
+def trace(port_id: int, kind: str):
+    """Trace a port end-to-end through patch panels."""
+    try:
+        paths = topology_logic.get_topology_index().trace(kind, port_id)
+    except KeyError as e:
+        click.echo(e.args[0], err=True)
+        return
+    for path in paths:
+        click.echo(" → ".join(
+            f"[cable {hop['id']}]" if hop["kind"] == "cable" else f"{hop['device_name']}:{hop['name']}"
+            for hop in path
+        ))
+
+
+@cli.command("neighbours")
+@click.argument("device_id", type=int)
+def neighbours(device_id: int):
+    """List devices connected to a device."""
+    try:
+        links = topology_logic.get_topology_index().neighbours(device_id)
+    except KeyError as e:
+        click.echo(e.args[0], err=True)
+        return
+    click.echo(json.dumps(links, indent=2))
+
+
+@cli.command("blast-radius")
+@click.argument("device_id", type=int)
+@click.option("--root", "roots", multiple=True, type=int, help="Device ID that defines 'connected' (repeatable).")
+def blast_radius(device_id: int, roots):
+    """Show devices that lose connectivity if a device fails."""
+    try:
+        result = topology_logic.get_topology_index().blast_radius(device_id, roots=list(roots))
+    except KeyError as e:
+        click.echo(e.args[0], err=True)
+        return
+    click.echo(json.dumps(result, indent=2))
@@ -4,6 +4,7 @@ import click
 from typing import Optional
 from homer.modules.netbox.logic import utils as nb_utils
 from modules.netbox.cli_context import pass_netbox_context
+from modules.netbox.logic import metadata_cache
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.cli.utils")
@@ -19,11 +20,14 @@ def cli():
 @click.argument("endpoint_path")
 @click.option("--limit", default=0, help="Limit the number of results.")
 @click.option("--offset", default=None, type=int, help="Offset for paginated results.")
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
 @pass_netbox_context
-def get_all(ctx, endpoint_path: str, limit: int, offset: Optional[int]):
+def get_all(ctx, endpoint_path: str, limit: int, offset: Optional[int], fields: Optional[str], brief: bool, compact: bool):
     """Fetch all records from the specified NetBox endpoint."""
     endpoint = ctx.resolve_endpoint(endpoint_path)
-    records = nb_utils.get_all(endpoint, limit=limit, offset=offset)
+    records = nb_utils.get_all(endpoint, limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     click.echo(json.dumps([nb_utils.serialize_record(r) for r in records], indent=2))
 
 
@@ -46,12 +50,15 @@ def get_single(ctx, endpoint_path: str, id: Optional[int], filters):
 @cli.command("filter")
 @click.argument("endpoint_path")
 @click.option("--filter", "filters", multiple=True, help="Filter parameters in key=value format.")
+@click.option("--fields", default=None, help="Comma-separated fields to return (e.g. id,name).")
+@click.option("--brief", is_flag=True, help="Return NetBox's brief representation.")
+@click.option("--compact", is_flag=True, help="Return plain dicts with nested objects as id/display refs (lower memory).")
 @pass_netbox_context
-def filter_objects(ctx, endpoint_path: str, filters):
+def filter_objects(ctx, endpoint_path: str, filters, fields: Optional[str], brief: bool, compact: bool):
     """Filter records from an endpoint."""
     endpoint = ctx.resolve_endpoint(endpoint_path)
     kwargs = dict(kv.split("=", 1) for kv in filters)
-    results = nb_utils.filter_objects(endpoint, **kwargs)
+    results = nb_utils.filter_objects(endpoint, fields=fields, brief=brief, compact=compact, **kwargs)
     click.echo(json.dumps([nb_utils.serialize_record(r) for r in results], indent=2))
 
 
@@ -70,12 +77,13 @@ def count(ctx, endpoint_path: str, filters):
 @cli.command("create")
 @click.argument("endpoint_path")
 @click.option("--data", required=True, help="JSON string or @file.json with record(s) to create.")
+@click.option("--validate", is_flag=True, help="Check choice fields against cached choices before sending.")
 @pass_netbox_context
-def create(ctx, endpoint_path: str, data: str):
+def create(ctx, endpoint_path: str, data: str, validate: bool):
     """Create records on the specified endpoint."""
     endpoint = ctx.resolve_endpoint(endpoint_path)
     payload = load_json_arg(data)
-    created = nb_utils.create_objects(endpoint, payload)
+    created = nb_utils.create_objects(endpoint, payload, validate=validate)
     if isinstance(created, list):
         click.echo(json.dumps([nb_utils.serialize_record(r) for r in created], indent=2))
     else:
@@ -85,12 +93,13 @@ def create(ctx, endpoint_path: str, data: str):
 @cli.command("update")
 @click.argument("endpoint_path")
 @click.option("--data", required=True, help="JSON string or @file.json with updates (must include id).")
+@click.option("--validate", is_flag=True, help="Check choice fields against cached choices before sending.")
 @pass_netbox_context
-def update(ctx, endpoint_path: str, data: str):
+def update(ctx, endpoint_path: str, data: str, validate: bool):
     """Update one or more records on an endpoint."""
     endpoint = ctx.resolve_endpoint(endpoint_path)
     payload = load_json_arg(data)
-    updated = nb_utils.update_objects(endpoint, payload)
+    updated = nb_utils.update_objects(endpoint, payload, validate=validate)
     click.echo(json.dumps([nb_utils.serialize_record(r) for r in updated], indent=2))
 
 
@@ -116,14 +125,38 @@ def delete(ctx, endpoint_path: str, ids: Optional[str], filters):
 
 @cli.command("choices")
 @click.argument("endpoint_path")
+@click.option("--refresh", is_flag=True, help="Bypass the choices cache and refetch from NetBox.")
 @pass_netbox_context
-def choices(ctx, endpoint_path: str):
+def choices(ctx, endpoint_path: str, refresh: bool):
     """Return available choices from an endpoint."""
     endpoint = ctx.resolve_endpoint(endpoint_path)
-    result = nb_utils.get_choices(endpoint)
+    result = nb_utils.get_choices(endpoint, refresh=refresh)
     click.echo(json.dumps(result, indent=2))
 
 
+@cli.command("invalidate-choices")
+@click.argument("endpoint_path", required=False)
+def invalidate_choices(endpoint_path: Optional[str]):
+    """Drop cached choices for an endpoint, or for all endpoints."""
+    removed = metadata_cache.invalidate_choices(endpoint_path)
+    click.echo(f"Invalidated {removed} cached choice set(s)")
+
+
+@cli.command("validate")
+@click.argument("endpoint_path")
+@click.option("--data", required=True, help="JSON string or @file.json with the payload to check.")
+@pass_netbox_context
+def validate(ctx, endpoint_path: str, data: str):
+    """Validate a create/update payload against cached choices."""
+    endpoint = ctx.resolve_endpoint(endpoint_path)
+    errors = metadata_cache.validate_payload(endpoint, load_json_arg(data))
+    if errors:
+        for error in errors:
+            click.echo(f"❌ {error}", err=True)
+        raise SystemExit(1)
+    click.echo("✅ Payload is valid")
+
+
 def load_json_arg(arg: str):
     """Load JSON from a string or file reference."""
     if arg.startswith("@"):
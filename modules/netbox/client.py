@@ -1,12 +1,47 @@
 
 import os
-from typing import Optional
-from pynetbox.core.api import Api  
+import threading
+from typing import Dict, Iterable, Optional
+from pynetbox.core.api import Api
+from pynetbox.core.endpoint import Endpoint
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox-client")
 
-_client: Optional[Api] = None  
+_client: Optional[Api] = None
+_endpoints: Dict[str, Endpoint] = {}
+_endpoints_lock = threading.Lock()
+
+DEFAULT_POOL_SIZE = 20
+
+# Endpoints used by HOMER's logic layer; resolved once and reused for the process lifetime
+ENDPOINT_PATHS = (
+    "dcim.devices",
+    "dcim.interfaces",
+    "dcim.racks",
+    "dcim.sites",
+    "dcim.cables",
+    "ipam.ip_addresses",
+    "ipam.prefixes",
+    "tenancy.tenants",
+)
+
+
+def _tune_session(api: Api):
+    """Mount a pooled, retrying HTTP adapter on the pynetbox session."""
+    pool_size = int(os.getenv("NETBOX_POOL_SIZE", DEFAULT_POOL_SIZE))
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    api.http_session.mount("http://", adapter)
+    api.http_session.mount("https://", adapter)
+    log.debug(f"🔌 NetBox session pool size: {pool_size}")
 
 
 def get_netbox_client() -> Api:
@@ -16,7 +51,9 @@ def get_netbox_client() -> Api:
         try:
             url = os.environ["NETBOX_URL"]
             token = os.environ["NETBOX_TOKEN"]
-            _client = Api(url, token=token)
+            threaded = os.getenv("NETBOX_THREADING", "false").lower() in ("true", "yes", "1")
+            _client = Api(url, token=token, threading=threaded)
+            _tune_session(_client)
             log.info("✅ NetBox client initialized")
         except KeyError as e:
             missing = e.args[0]
@@ -26,3 +63,32 @@ def get_netbox_client() -> Api:
             log.exception("❌ Failed to initialize NetBox client")
             raise
     return _client
+
+
+def _normalize_path(path: str) -> str:
+    return path.strip().strip("/").replace("/", ".").replace("-", "_")
+
+
+def resolve_endpoint(path: str) -> Endpoint:
+    """Resolve a dotted endpoint path (e.g. 'ipam.prefixes') to a cached pynetbox endpoint."""
+    key = _normalize_path(path)
+    endpoint = _endpoints.get(key)
+    if endpoint is not None:
+        return endpoint
+
+    with _endpoints_lock:
+        endpoint = _endpoints.get(key)
+        if endpoint is None:
+            obj = get_netbox_client()
+            for part in key.split("."):
+                obj = getattr(obj, part)
+            endpoint = _endpoints[key] = obj
+    return endpoint
+
+
+def preload_endpoints(paths: Iterable[str] = ENDPOINT_PATHS) -> Dict[str, Endpoint]:
+    """Resolve a set of endpoint paths up front and return the endpoint map."""
+    for path in paths:
+        resolve_endpoint(path)
+    log.debug(f"📍 Preloaded {len(_endpoints)} NetBox endpoint(s)")
+    return dict(_endpoints)
@@ -1,4 +1,5 @@
 
+from typing import Optional
 from pydantic import BaseModel, HttpUrl, SecretStr
 from pathlib import Path
 from homer.utils.config import register_module_env, write_env_example
@@ -10,6 +11,15 @@ from homer.utils.config import register_module_env, write_env_example
 class NetboxEnv(BaseModel):
     NETBOX_URL: HttpUrl               # e.g. http://localhost:8000
     NETBOX_TOKEN: SecretStr           # API token with access rights to NetBox
+    NETBOX_POOL_SIZE: int = 20        # Pooled HTTP connections shared by all NetBox calls
+    NETBOX_THREADING: bool = False    # Let pynetbox fetch result pages in parallel
+    NETBOX_ASYNC_MAX_CONNECTIONS: int = 100  # Connection pool for async API routes
+    NETBOX_CACHE_DIR: str = "/tmp/homer-netbox-cache"  # Persistent metadata cache location
+    NETBOX_CHOICES_TTL: int = 86400   # Seconds before cached choices are refetched
+    NETBOX_ROLLUP_TTL: int = 300      # Seconds a rack capacity rollup is cached
+    NETBOX_TOPOLOGY_TTL: int = 3600   # Seconds before the cable topology index is reloaded
+    NETBOX_WEBHOOK_SECRET: Optional[SecretStr] = None  # Shared secret for /webhook/netbox signatures
+    NETBOX_WEBHOOK_DEDUPE_TTL: int = 3600  # Seconds a delivery is remembered for replay protection
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 🧩 Register this module's .env file and validation schema
@@ -0,0 +1,47 @@
+
+import sys
+from typing import Any, Dict, List, Optional
+
+# Hyperlinks NetBox adds to every object; never needed in bulk results
+LINK_KEYS = frozenset({"url", "display_url"})
+
+
+def _intern(value: Any) -> Any:
+    """Share repeated short strings (site names, statuses) across records."""
+    return sys.intern(value) if isinstance(value, str) and len(value) <= 64 else value
+
+
+def compact_ref(value: Dict[str, Any]) -> Any:
+    """Collapse a nested object to a small reference.
+
+    Choice fields (`{"value", "label"}`) become their value; related objects
+    become `{"id", "display"}`; anything else (custom fields, config) is kept.
+    """
+    if "value" in value and "label" in value:
+        return _intern(value["value"])
+    if "id" in value:
+        display = value.get("display") or value.get("name") or value.get("address") or value.get("prefix")
+        return {"id": value["id"], "display": _intern(display)}
+    return value
+
+
+def compact_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return compact_ref(value)
+    if isinstance(value, list):
+        return [compact_value(v) for v in value]
+    return _intern(value)
+
+
+def compact_record(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a flat dict for one API object, nested records left as ID/display refs."""
+    return {
+        key: compact_value(value)
+        for key, value in obj.items()
+        if key not in LINK_KEYS
+    }
+
+
+def compact_page(results: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Compact one page of results, letting the raw page be freed afterwards."""
+    return [compact_record(obj) for obj in results or []]
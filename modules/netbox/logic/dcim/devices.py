@@ -3,23 +3,37 @@ from typing import Any, Optional, Union, List, Dict
 from pynetbox.core.response import Record
 from pynetbox.core.query import RequestError
 from modules.netbox.client import get_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices
+from modules.netbox.logic import utils as nb_utils
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.dcim.devices")
 
 
-def get_all_devices(limit: int = 0, offset: Optional[int] = None) -> List[Record]:
+def get_all_devices(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Retrieve all devices from NetBox."""
     nb = get_netbox_client()
     log.debug("Fetching all devices")
-    return list(nb.dcim.devices.all(limit=limit, offset=offset))
+    return nb_utils.get_all(nb.dcim.devices, limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
 
 
-def filter_devices(*args: str, **kwargs: Any) -> List[Record]:
+def filter_devices(
+    *args: str,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+    **kwargs: Any,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Filter devices using full-text or keyword filters."""
     nb = get_netbox_client()
     log.debug(f"Filtering devices with args={args}, kwargs={kwargs}")
-    return list(nb.dcim.devices.filter(*args, **kwargs))
+    return nb_utils.filter_objects(nb.dcim.devices, *args, fields=fields, brief=brief, compact=compact, **kwargs)
 
 
 def get_device(id: Optional[int] = None, **kwargs) -> Optional[Record]:
@@ -81,20 +95,18 @@ def delete_devices(
 def delete_devices_by_filter(**kwargs) -> bool:
     """Delete all devices matching a filter query."""
     nb = get_netbox_client()
-    records = list(nb.dcim.devices.filter(**kwargs))
-    log.warning(f"Deleting {len(records)} devices by filter: {kwargs}")
     try:
-        return nb.dcim.devices.delete(records)
+        return nb_utils.delete_filtered(nb.dcim.devices, **kwargs)
     except RequestError as e:
         log.error(f"Filtered device deletion failed: {e.error}")
         raise
 
 
-def get_device_choices() -> Dict[str, Any]:
+def get_device_choices(refresh: bool = False) -> Dict[str, Any]:
     """Return valid choices for device fields (role, status, etc.)."""
     nb = get_netbox_client()
     log.debug("Fetching device choices")
-    return nb.dcim.devices.choices()
+    return get_cached_choices(nb.dcim.devices, refresh=refresh)
 
 
 def get_device_dict(device: Union[int, str, Record]) -> Optional[Dict[str, Any]]:
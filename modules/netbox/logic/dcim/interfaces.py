@@ -3,23 +3,37 @@ from typing import Any, Optional, Union, List, Dict
 from pynetbox.core.response import Record
 from pynetbox.core.query import RequestError
 from modules.netbox.client import get_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices
+from modules.netbox.logic import utils as nb_utils
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.dcim.interfaces")
 
 
-def get_all_interfaces(limit: int = 0, offset: Optional[int] = None) -> List[Record]:
+def get_all_interfaces(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Retrieve all interfaces from NetBox."""
     nb = get_netbox_client()
     log.debug("Fetching all interfaces")
-    return list(nb.dcim.interfaces.all(limit=limit, offset=offset))
+    return nb_utils.get_all(nb.dcim.interfaces, limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
 
 
-def filter_interfaces(*args: str, **kwargs: Any) -> List[Record]:
+def filter_interfaces(
+    *args: str,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+    **kwargs: Any,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Filter interfaces using full-text or keyword filters."""
     nb = get_netbox_client()
     log.debug(f"Filtering interfaces with args={args}, kwargs={kwargs}")
-    return list(nb.dcim.interfaces.filter(*args, **kwargs))
+    return nb_utils.filter_objects(nb.dcim.interfaces, *args, fields=fields, brief=brief, compact=compact, **kwargs)
 
 
 def get_interface(id: Optional[int] = None, **kwargs) -> Optional[Record]:
@@ -81,20 +95,18 @@ def delete_interfaces(
 def delete_interfaces_by_filter(**kwargs) -> bool:
     """Delete all interfaces matching a filter query."""
     nb = get_netbox_client()
-    records = list(nb.dcim.interfaces.filter(**kwargs))
-    log.warning(f"Deleting {len(records)} interfaces by filter: {kwargs}")
     try:
-        return nb.dcim.interfaces.delete(records)
+        return nb_utils.delete_filtered(nb.dcim.interfaces, **kwargs)
     except RequestError as e:
         log.error(f"Filtered interface deletion failed: {e.error}")
         raise
 
 
-def get_interface_choices() -> Dict[str, Any]:
+def get_interface_choices(refresh: bool = False) -> Dict[str, Any]:
     """Return valid choices for interface fields (type, mode, etc.)."""
     nb = get_netbox_client()
     log.debug("Fetching interface choices")
-    return nb.dcim.interfaces.choices()
+    return get_cached_choices(nb.dcim.interfaces, refresh=refresh)
 
 
 def get_interface_dict(interface: Union[int, str, Record], device: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,244 @@
+
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from modules.netbox.client import resolve_endpoint
+from modules.netbox.logic import utils as nb_utils
+from modules.netbox.logic.webhooks import register_hook
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.dcim.rack_rollup")
+
+DEFAULT_ROLLUP_TTL = 300
+WEIGHT_TO_KG = {"kg": 1.0, "g": 0.001, "lb": 0.45359237, "oz": 0.028349523125}
+
+# Occupancy bitmaps are Python ints with one bit per half-unit, so 0.5U devices fit
+# and every rack-wide or site-wide count is a handful of bitwise ops + bit_count()
+HALF_UNITS = 2
+
+
+def _ref_id(value: Any) -> Optional[int]:
+    return value.get("id") if isinstance(value, dict) else value
+
+
+def _choice(value: Any) -> Any:
+    return value.get("value") if isinstance(value, dict) else value
+
+
+def _weight_kg(weight: Optional[float], unit: Any) -> float:
+    if not weight:
+        return 0.0
+    return float(weight) * WEIGHT_TO_KG.get(_choice(unit) or "kg", 1.0)
+
+
+def _mask(start_bit: int, bits: int) -> int:
+    return ((1 << bits) - 1) << start_bit if bits > 0 else 0
+
+
+def _largest_free_block(used: int, total_bits: int) -> float:
+    """Longest run of free half-units in a bitmap, in rack units."""
+    best = run = 0
+    free = ~used & ((1 << total_bits) - 1)
+    while free:
+        if free & 1:
+            run += 1
+            best = max(best, run)
+        else:
+            run = 0
+        free >>= 1
+    return best / HALF_UNITS
+
+
+def load_inventory(site_id: Optional[int] = None, include_power: bool = True, workers: int = 4) -> Dict[str, List[Dict[str, Any]]]:
+    """Fetch racks, racked devices, device types and power ports in parallel bulk pages."""
+    scope = {"site_id": site_id} if site_id else {}
+    sources = {
+        "dcim.racks": scope,
+        "dcim.devices": scope,
+        "dcim.device_types": {},
+    }
+    if include_power:
+        sources["dcim.power_ports"] = scope
+
+    def fetch(path: str) -> List[Dict[str, Any]]:
+        return list(nb_utils.iter_compact(resolve_endpoint(path), **sources[path]))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(sources, pool.map(fetch, sources)))
+
+
+def compute_rack_rollups(inventory: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Build per-rack occupancy bitmaps and metrics in one pass over the inventory."""
+    device_types = {
+        dt["id"]: (float(dt.get("u_height") or 0), bool(dt.get("is_full_depth", True)), _weight_kg(dt.get("weight"), dt.get("weight_unit")))
+        for dt in inventory["dcim.device_types"]
+    }
+    power: Dict[int, Tuple[int, int]] = defaultdict(lambda: (0, 0))
+    for port in inventory.get("dcim.power_ports", []):
+        device_id = _ref_id(port.get("device"))
+        allocated, maximum = power[device_id]
+        power[device_id] = (allocated + (port.get("allocated_draw") or 0), maximum + (port.get("maximum_draw") or 0))
+
+    racks: Dict[int, Dict[str, Any]] = {}
+    for rack in inventory["dcim.racks"]:
+        u_height = int(rack.get("u_height") or 42)
+        racks[rack["id"]] = {
+            "id": rack["id"],
+            "name": rack.get("name"),
+            "site": rack.get("site"),
+            "tenant": rack.get("tenant"),
+            "status": _choice(rack.get("status")),
+            "u_height": u_height,
+            "starting_unit": int(rack.get("starting_unit") or 1),
+            "front": 0,
+            "rear": 0,
+            "devices": 0,
+            "tenant_bits": defaultdict(int),
+            "power_allocated_w": 0,
+            "power_maximum_w": 0,
+            "weight_kg": _weight_kg(rack.get("weight"), rack.get("weight_unit")),
+            "max_weight_kg": _weight_kg(rack.get("max_weight"), rack.get("weight_unit")),
+        }
+
+    for device in inventory["dcim.devices"]:
+        rack = racks.get(_ref_id(device.get("rack")))
+        if rack is None:
+            continue
+        rack["devices"] += 1
+        u_height, full_depth, weight = device_types.get(_ref_id(device.get("device_type")), (0.0, True, 0.0))
+        allocated, maximum = power.get(device["id"], (0, 0))
+        rack["power_allocated_w"] += allocated
+        rack["power_maximum_w"] += maximum
+        rack["weight_kg"] += weight
+        position = device.get("position")
+        if position is None or not u_height:
+            continue  # Non-racked (0U, child or unpositioned) devices use no units
+        start_bit = max(0, int((float(position) - rack["starting_unit"]) * HALF_UNITS))
+        bits = _mask(start_bit, int(u_height * HALF_UNITS))
+        face = _choice(device.get("face")) or "front"
+        if full_depth or face == "front":
+            rack["front"] |= bits
+        if full_depth or face == "rear":
+            rack["rear"] |= bits
+        tenant = device.get("tenant") or rack["tenant"]
+        rack["tenant_bits"][tenant.get("display") if tenant else None] |= bits
+
+    rollups = []
+    for rack in racks.values():
+        total_bits = rack["u_height"] * HALF_UNITS
+        used = (rack["front"] | rack["rear"]) & ((1 << total_bits) - 1)
+        u_used = used.bit_count() / HALF_UNITS
+        rollups.append({
+            "id": rack["id"],
+            "name": rack["name"],
+            "site": rack["site"],
+            "tenant": rack["tenant"],
+            "status": rack["status"],
+            "u_total": rack["u_height"],
+            "u_used": u_used,
+            "u_free": rack["u_height"] - u_used,
+            "u_free_front": rack["u_height"] - rack["front"].bit_count() / HALF_UNITS,
+            "u_free_rear": rack["u_height"] - rack["rear"].bit_count() / HALF_UNITS,
+            "largest_free_block_u": _largest_free_block(used, total_bits),
+            "utilisation": round(u_used / rack["u_height"], 4) if rack["u_height"] else 0.0,
+            "devices": rack["devices"],
+            "tenant_u": {t: b.bit_count() / HALF_UNITS for t, b in rack["tenant_bits"].items()},
+            "power_allocated_w": rack["power_allocated_w"],
+            "power_maximum_w": rack["power_maximum_w"],
+            "weight_kg": round(rack["weight_kg"], 2),
+            "max_weight_kg": round(rack["max_weight_kg"], 2),
+            # One character per half-unit from the starting unit upwards ('1' = occupied)
+            "occupancy": format(used, f"0{total_bits}b")[::-1] if total_bits else "",
+        })
+    return rollups
+
+
+def aggregate(rack_rollups: Iterable[Dict[str, Any]], by: str = "site") -> List[Dict[str, Any]]:
+    """Sum rack rollups per site, or per occupying tenant when `by='tenant'`."""
+    groups: Dict[Any, Dict[str, Any]] = {}
+
+    def group(key: Any, label: Any) -> Dict[str, Any]:
+        if key not in groups:
+            if by == "tenant":
+                groups[key] = {"tenant": label, "racks": 0, "u_used": 0.0}
+            else:
+                groups[key] = {"site": label, "racks": 0, "u_total": 0, "u_used": 0.0, "u_free": 0.0,
+                               "largest_free_block_u": 0.0, "devices": 0,
+                               "power_allocated_w": 0, "power_maximum_w": 0, "weight_kg": 0.0}
+        return groups[key]
+
+    for rack in rack_rollups:
+        if by == "tenant":
+            for tenant, units in rack["tenant_u"].items():
+                entry = group(tenant, tenant)
+                entry["racks"] += 1
+                entry["u_used"] += units
+            continue
+        site = rack["site"] or {}
+        entry = group(site.get("id"), site.get("display"))
+        entry["racks"] += 1
+        for key in ("u_total", "u_used", "u_free", "devices", "power_allocated_w", "power_maximum_w", "weight_kg"):
+            entry[key] += rack[key]
+        entry["largest_free_block_u"] = max(entry["largest_free_block_u"], rack["largest_free_block_u"])
+
+    for entry in groups.values():
+        if "weight_kg" in entry:
+            entry["weight_kg"] = round(entry["weight_kg"], 2)
+        if entry.get("u_total"):
+            entry["utilisation"] = round(entry["u_used"] / entry["u_total"], 4)
+    return sorted(groups.values(), key=lambda e: str(e[by]))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🧠 Cached report + webhook invalidation
+# ──────────────────────────────────────────────────────────────────────────────
+
+_reports: Dict[Tuple[Optional[int], bool], Tuple[float, List[Dict[str, Any]]]] = {}
+_reports_lock = threading.Lock()
+
+
+def _cached_rollups(site_id: Optional[int], include_power: bool, refresh: bool) -> Tuple[float, List[Dict[str, Any]]]:
+    ttl = int(os.getenv("NETBOX_ROLLUP_TTL", DEFAULT_ROLLUP_TTL))
+    key = (site_id, include_power)
+    with _reports_lock:
+        cached = _reports.get(key)
+        if cached and not refresh and time.time() - cached[0] < ttl:
+            return cached
+        started = time.monotonic()
+        rollups = compute_rack_rollups(load_inventory(site_id, include_power=include_power))
+        _reports[key] = (time.time(), rollups)
+        log.info(f"📊 Rolled up {len(rollups)} racks in {time.monotonic() - started:.2f}s")
+        return _reports[key]
+
+
+def get_rack_rollups(site_id: Optional[int] = None, include_power: bool = True, refresh: bool = False) -> List[Dict[str, Any]]:
+    """Return per-rack rollups, computed from one bulk pass and cached for NETBOX_ROLLUP_TTL."""
+    return _cached_rollups(site_id, include_power, refresh)[1]
+
+
+def get_rollup_report(site_id: Optional[int] = None, by: str = "site", include_power: bool = True, refresh: bool = False) -> Dict[str, Any]:
+    """Datacentre capacity report: totals plus per-site or per-tenant aggregates."""
+    if by not in ("site", "tenant"):
+        raise ValueError("by must be 'site' or 'tenant'")
+    generated_at, rollups = _cached_rollups(site_id, include_power, refresh)
+    return {
+        "generated_at": generated_at,
+        "racks": len(rollups),
+        "u_total": sum(r["u_total"] for r in rollups),
+        "u_used": sum(r["u_used"] for r in rollups),
+        "u_free": sum(r["u_free"] for r in rollups),
+        "devices": sum(r["devices"] for r in rollups),
+        by + "s": aggregate(rollups, by=by),
+    }
+
+
+def invalidate_rollups(change: Optional[Dict[str, Any]] = None):
+    with _reports_lock:
+        _reports.clear()
+
+
+for _path in ("dcim.racks", "dcim.devices", "dcim.device_types", "dcim.power_ports"):
+    register_hook(_path, invalidate_rollups)
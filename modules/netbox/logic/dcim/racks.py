@@ -3,23 +3,37 @@ from typing import Any, Optional, Union, List, Dict
 from pynetbox.core.response import Record
 from pynetbox.core.query import RequestError
 from modules.netbox.client import get_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices
+from modules.netbox.logic import utils as nb_utils
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.dcim.racks")
 
 
-def get_all_racks(limit: int = 0, offset: Optional[int] = None) -> List[Record]:
+def get_all_racks(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Retrieve all racks from NetBox."""
     nb = get_netbox_client()
     log.debug("Fetching all racks")
-    return list(nb.dcim.racks.all(limit=limit, offset=offset))
+    return nb_utils.get_all(nb.dcim.racks, limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
 
 
-def filter_racks(*args: str, **kwargs: Any) -> List[Record]:
+def filter_racks(
+    *args: str,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+    **kwargs: Any,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Filter racks using full-text or keyword filters."""
     nb = get_netbox_client()
     log.debug(f"Filtering racks with args={args}, kwargs={kwargs}")
-    return list(nb.dcim.racks.filter(*args, **kwargs))
+    return nb_utils.filter_objects(nb.dcim.racks, *args, fields=fields, brief=brief, compact=compact, **kwargs)
 
 
 def get_rack(id: Optional[int] = None, **kwargs) -> Optional[Record]:
@@ -81,20 +95,18 @@ def delete_racks(
 def delete_racks_by_filter(**kwargs) -> bool:
     """Delete all racks matching a filter query."""
     nb = get_netbox_client()
-    records = list(nb.dcim.racks.filter(**kwargs))
-    log.warning(f"Deleting {len(records)} racks by filter: {kwargs}")
     try:
-        return nb.dcim.racks.delete(records)
+        return nb_utils.delete_filtered(nb.dcim.racks, **kwargs)
     except RequestError as e:
         log.error(f"Filtered rack deletion failed: {e.error}")
         raise
 
 
-def get_rack_choices() -> Dict[str, Any]:
+def get_rack_choices(refresh: bool = False) -> Dict[str, Any]:
     """Return valid choices for rack fields (status, role, etc.)."""
     nb = get_netbox_client()
     log.debug("Fetching rack choices")
-    return nb.dcim.racks.choices()
+    return get_cached_choices(nb.dcim.racks, refresh=refresh)
 
 
 def get_rack_dict(rack: Union[int, str, Record], site: Optional[str] = None) -> Optional[Dict[str, Any]]:
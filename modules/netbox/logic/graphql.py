@@ -0,0 +1,186 @@
+
+import ipaddress
+import json
+from typing import Any, Dict, List, Optional, Union
+from modules.netbox.client import get_netbox_client
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.graphql")
+
+
+class GraphQLError(Exception):
+    """Raised when NetBox returns errors for a GraphQL query."""
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        messages = "; ".join(str(e.get("message", e)) for e in errors)
+        super().__init__(messages or "GraphQL query failed")
+
+
+def get_graphql_url() -> str:
+    """Return the NetBox GraphQL endpoint derived from the REST base URL."""
+    nb = get_netbox_client()
+    return nb.base_url.rsplit("/api", 1)[0] + "/graphql/"
+
+
+def execute_query(query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Run a GraphQL query against NetBox and return its `data` payload."""
+    nb = get_netbox_client()
+    url = get_graphql_url()
+    headers = {
+        "Authorization": f"Token {nb.token}",
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+    body: Dict[str, Any] = {"query": query}
+    if variables:
+        body["variables"] = variables
+
+    log.debug(f"Executing GraphQL query against {url}")
+    resp = nb.http_session.post(url, headers=headers, json=body)
+    resp.raise_for_status()
+    payload = resp.json()
+    if payload.get("errors"):
+        log.error(f"GraphQL query failed: {payload['errors']}")
+        raise GraphQLError(payload["errors"])
+    return payload.get("data") or {}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🧩 Prebuilt composite queries
+# ──────────────────────────────────────────────────────────────────────────────
+
+DEVICE_DETAIL_QUERY = """
+query {
+  device(id: %(id)d) {
+    id
+    name
+    serial
+    status
+    role { id name }
+    device_type { id model u_height manufacturer { id name } }
+    site { id name }
+    rack { id name u_height }
+    position
+    face
+    tenant { id name }
+    primary_ip4 { id address }
+    primary_ip6 { id address }
+    interfaces {
+      id
+      name
+      type
+      enabled
+      mac_address
+      ip_addresses { id address status dns_name }
+    }
+  }
+}
+"""
+
+RACK_INVENTORY_QUERY = """
+query {
+  rack(id: %(id)d) {
+    id
+    name
+    status
+    u_height
+    site { id name }
+    location { id name }
+    tenant { id name }
+    devices {
+      id
+      name
+      status
+      position
+      face
+      device_type { id model u_height }
+      role { id name }
+      tenant { id name }
+    }
+  }
+}
+"""
+
+PREFIX_UTILISATION_QUERY = """
+query {
+  prefix_list(prefix: %(prefix)s) {
+    id
+    prefix
+    status
+    is_pool
+    vrf { id name }
+    site { id name }
+    tenant { id name }
+  }
+  child_prefixes: prefix_list(within: %(prefix)s) { id prefix status }
+  ip_address_list(parent: %(prefix)s) { id address status }
+}
+"""
+
+
+def get_device_detail(device_id: int) -> Optional[Dict[str, Any]]:
+    """Return a device with its rack, tenant, interfaces and IPs in one round-trip."""
+    log.debug(f"Fetching device detail for ID {device_id}")
+    data = execute_query(DEVICE_DETAIL_QUERY % {"id": int(device_id)})
+    return data.get("device")
+
+
+def get_rack_inventory(rack_id: int) -> Optional[Dict[str, Any]]:
+    """Return a rack with every mounted device and its type, role and tenant."""
+    log.debug(f"Fetching rack inventory for ID {rack_id}")
+    data = execute_query(RACK_INVENTORY_QUERY % {"id": int(rack_id)})
+    rack = data.get("rack")
+    if rack:
+        used = sum(
+            (d.get("device_type") or {}).get("u_height") or 0
+            for d in rack.get("devices", [])
+            if d.get("position") is not None
+        )
+        rack["u_used"] = used
+        rack["u_free"] = max((rack.get("u_height") or 0) - used, 0)
+    return rack
+
+
+def get_prefix_utilisation(prefix: str) -> Optional[Dict[str, Any]]:
+    """Return a prefix with child prefixes, IPs and computed utilisation."""
+    network = ipaddress.ip_network(prefix, strict=False)
+    log.debug(f"Fetching prefix utilisation for {network}")
+    data = execute_query(PREFIX_UTILISATION_QUERY % {"prefix": json.dumps(str(network))})
+
+    matches = data.get("prefix_list") or []
+    if not matches:
+        return None
+
+    children = [
+        p for p in data.get("child_prefixes") or []
+        if p.get("prefix") != str(network)
+    ]
+    addresses = data.get("ip_address_list") or []
+
+    if children:
+        used = _count_covered(network, [p["prefix"] for p in children])
+    else:
+        used = len({a["address"].split("/")[0] for a in addresses})
+
+    size = network.num_addresses
+    if network.version == 4 and network.prefixlen < 31 and not children:
+        size -= 2  # Network and broadcast are not assignable
+
+    result = dict(matches[0])
+    result.update({
+        "child_prefixes": children,
+        "ip_addresses": addresses,
+        "size": size,
+        "used": used,
+        "utilisation": round(used / size * 100, 2) if size > 0 else 0.0,
+    })
+    return result
+
+
+def _count_covered(parent: Union[ipaddress.IPv4Network, ipaddress.IPv6Network], prefixes: List[str]) -> int:
+    """Count addresses in `parent` covered by `prefixes`, ignoring overlaps."""
+    networks = [
+        n for n in (ipaddress.ip_network(p, strict=False) for p in prefixes)
+        if n.version == parent.version and n.subnet_of(parent)
+    ]
+    return sum(n.num_addresses for n in ipaddress.collapse_addresses(networks))
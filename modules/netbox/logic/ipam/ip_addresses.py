@@ -3,23 +3,37 @@ from typing import Any, Dict, List, Optional, Union
 from pynetbox.core.response import Record
 from pynetbox.core.query import RequestError
 from modules.netbox.client import get_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices
+from modules.netbox.logic import utils as nb_utils
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.ipam.ip_addresses")
 
 
-def get_all_ip_addresses(limit: int = 0, offset: Optional[int] = None) -> List[Record]:
+def get_all_ip_addresses(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Retrieve all IP addresses from NetBox."""
     nb = get_netbox_client()
     log.debug("Fetching all IP addresses")
-    return list(nb.ipam.ip_addresses.all(limit=limit, offset=offset))
+    return nb_utils.get_all(nb.ipam.ip_addresses, limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
 
 
-def filter_ip_addresses(*args: str, **kwargs: Any) -> List[Record]:
+def filter_ip_addresses(
+    *args: str,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+    **kwargs: Any,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Filter IP addresses using full-text or keyword filters."""
     nb = get_netbox_client()
     log.debug(f"Filtering IP addresses with args={args}, kwargs={kwargs}")
-    return list(nb.ipam.ip_addresses.filter(*args, **kwargs))
+    return nb_utils.filter_objects(nb.ipam.ip_addresses, *args, fields=fields, brief=brief, compact=compact, **kwargs)
 
 
 def get_ip_address(id: Optional[int] = None, **kwargs) -> Optional[Record]:
@@ -81,20 +95,18 @@ def delete_ip_addresses(
 def delete_ip_addresses_by_filter(**kwargs) -> bool:
     """Delete all IP addresses matching a filter query."""
     nb = get_netbox_client()
-    records = list(nb.ipam.ip_addresses.filter(**kwargs))
-    log.warning(f"Deleting {len(records)} IP address(es) by filter: {kwargs}")
     try:
-        return nb.ipam.ip_addresses.delete(records)
+        return nb_utils.delete_filtered(nb.ipam.ip_addresses, **kwargs)
     except RequestError as e:
         log.error(f"Filtered IP address deletion failed: {e.error}")
         raise
 
 
-def get_ip_address_choices() -> Dict[str, Any]:
+def get_ip_address_choices(refresh: bool = False) -> Dict[str, Any]:
     """Return valid choices for IP address fields (status, role, etc.)."""
     nb = get_netbox_client()
     log.debug("Fetching IP address choices")
-    return nb.ipam.ip_addresses.choices()
+    return get_cached_choices(nb.ipam.ip_addresses, refresh=refresh)
 
 
 def assign_ip_to_interface(
@@ -3,23 +3,37 @@ from typing import Any, Dict, List, Optional, Union
 from pynetbox.core.response import Record
 from pynetbox.core.query import RequestError
 from modules.netbox.client import get_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices
+from modules.netbox.logic import utils as nb_utils
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.ipam.prefixes")
 
 
-def get_all_prefixes(limit: int = 0, offset: Optional[int] = None) -> List[Record]:
+def get_all_prefixes(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Retrieve all prefixes from NetBox."""
     nb = get_netbox_client()
     log.debug("Fetching all prefixes")
-    return list(nb.ipam.prefixes.all(limit=limit, offset=offset))
+    return nb_utils.get_all(nb.ipam.prefixes, limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
 
 
-def filter_prefixes(*args: str, **kwargs: Any) -> List[Record]:
+def filter_prefixes(
+    *args: str,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+    **kwargs: Any,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Filter prefixes with keyword or freeform search."""
     nb = get_netbox_client()
     log.debug(f"Filtering prefixes with args={args}, kwargs={kwargs}")
-    return list(nb.ipam.prefixes.filter(*args, **kwargs))
+    return nb_utils.filter_objects(nb.ipam.prefixes, *args, fields=fields, brief=brief, compact=compact, **kwargs)
 
 
 def get_prefix(id: Optional[int] = None, **kwargs) -> Optional[Record]:
@@ -81,20 +95,18 @@ def delete_prefixes(
 def delete_prefixes_by_filter(**kwargs) -> bool:
     """Delete prefixes that match a given filter query."""
     nb = get_netbox_client()
-    records = list(nb.ipam.prefixes.filter(**kwargs))
-    log.warning(f"Deleting {len(records)} prefix(es) by filter: {kwargs}")
     try:
-        return nb.ipam.prefixes.delete(records)
+        return nb_utils.delete_filtered(nb.ipam.prefixes, **kwargs)
     except RequestError as e:
         log.error(f"Filtered prefix deletion failed: {e.error}")
         raise
 
 
-def get_prefix_choices() -> Dict[str, Any]:
+def get_prefix_choices(refresh: bool = False) -> Dict[str, Any]:
     """Return available field choices for prefixes (e.g., status)."""
     nb = get_netbox_client()
     log.debug("Fetching prefix choices")
-    return nb.ipam.prefixes.choices()
+    return get_cached_choices(nb.ipam.prefixes, refresh=refresh)
 
 
 def get_available_ips(prefix_id: int) -> List[str]:
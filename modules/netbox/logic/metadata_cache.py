@@ -0,0 +1,179 @@
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from pynetbox.core.endpoint import Endpoint
+from modules.netbox.async_client import get_async_netbox_client
+from modules.netbox.client import resolve_endpoint
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.metadata_cache")
+
+DEFAULT_CACHE_DIR = "/tmp/homer-netbox-cache"
+DEFAULT_CHOICES_TTL = 24 * 3600  # Choices change only on NetBox upgrades/config edits
+
+
+class ChoicesCache:
+    """Per-endpoint cache of `choices()` metadata, persisted as JSON on disk."""
+
+    def __init__(self, path: Path, ttl: int):
+        self.path = path
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text())
+            self._entries = {k: (v["fetched_at"], v["choices"]) for k, v in raw.items()}
+            log.debug(f"📥 Loaded {len(self._entries)} cached choice set(s) from {self.path}")
+        except Exception as e:
+            log.warning(f"⚠️ Ignoring unreadable choices cache at {self.path}: {e}")
+            self._entries = {}
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({
+                k: {"fetched_at": ts, "choices": choices}
+                for k, (ts, choices) in self._entries.items()
+            }))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log.warning(f"⚠️ Could not persist choices cache to {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return cached choices for `key` if present and fresh."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[0] < self.ttl:
+                return entry[1]
+            return None
+
+    def set(self, key: str, choices: Dict[str, Any]):
+        """Store choices for `key` and persist the cache."""
+        with self._lock:
+            self._load()
+            self._entries[key] = (time.time(), choices)
+            self._save()
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """Drop one endpoint (or every endpoint when `key` is None); return entries removed."""
+        with self._lock:
+            self._load()
+            if key is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                removed = 1 if self._entries.pop(key, None) is not None else 0
+            self._save()
+            log.info(f"🧹 Invalidated {removed} cached choice set(s){f' for {key}' if key else ''}")
+            return removed
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            self._load()
+            return sorted(self._entries)
+
+
+_cache: Optional[ChoicesCache] = None
+
+
+def get_choices_cache() -> ChoicesCache:
+    """Return the process-wide choices cache, initializing it from the environment."""
+    global _cache
+    if _cache is None:
+        cache_dir = Path(os.getenv("NETBOX_CACHE_DIR", DEFAULT_CACHE_DIR))
+        ttl = int(os.getenv("NETBOX_CHOICES_TTL", DEFAULT_CHOICES_TTL))
+        _cache = ChoicesCache(cache_dir / "choices.json", ttl)
+    return _cache
+
+
+def endpoint_key(endpoint: Union[Endpoint, str]) -> str:
+    """Normalize an Endpoint or path ('ipam/prefixes', 'ipam.prefixes') to 'ipam.prefixes'."""
+    if isinstance(endpoint, Endpoint):
+        path = endpoint.url.split("/api/", 1)[-1]
+    else:
+        path = endpoint
+    return path.strip("/").replace("/", ".").replace("-", "_")
+
+
+def get_cached_choices(endpoint: Union[Endpoint, str], refresh: bool = False) -> Dict[str, Any]:
+    """Return choices for an endpoint, fetching from NetBox only on a miss or refresh."""
+    key = endpoint_key(endpoint)
+    cache = get_choices_cache()
+    if not refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            log.debug(f"Choices cache hit for {key}")
+            return cached
+
+    ep = endpoint if isinstance(endpoint, Endpoint) else resolve_endpoint(key)
+    log.debug(f"Choices cache miss for {key}; fetching from NetBox")
+    choices = ep.choices()
+    cache.set(key, choices)
+    return choices
+
+
+async def get_cached_choices_async(endpoint_path: str, refresh: bool = False) -> Dict[str, Any]:
+    """Async variant of get_cached_choices for FastAPI routes, fetching via the async client."""
+    key = endpoint_key(endpoint_path)
+    cache = get_choices_cache()
+    if not refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    log.debug(f"Choices cache miss for {key}; fetching from NetBox (async)")
+    choices = await get_async_netbox_client().endpoint(key).choices()
+    cache.set(key, choices)
+    return choices
+
+
+def invalidate_choices(endpoint: Optional[Union[Endpoint, str]] = None) -> int:
+    """Invalidate cached choices for one endpoint, or all endpoints."""
+    key = endpoint_key(endpoint) if endpoint is not None else None
+    return get_choices_cache().invalidate(key)
+
+
+def validate_payload(
+    endpoint: Union[Endpoint, str],
+    payload: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
+) -> List[str]:
+    """Check choice fields in a create/update payload against cached choices.
+
+    Returns a list of human-readable errors; an empty list means the payload is valid.
+    """
+    choices = get_cached_choices(endpoint)
+    allowed = {
+        field: {str(c.get("value")) for c in options if isinstance(c, dict)}
+        for field, options in choices.items()
+        if isinstance(options, list)
+    }
+    items = [payload] if isinstance(payload, dict) else list(payload)
+
+    errors = []
+    for index, item in enumerate(items):
+        for field, value in item.items():
+            if field not in allowed or value is None:
+                continue
+            if isinstance(value, dict):
+                value = value.get("value")
+            if str(value) not in allowed[field]:
+                prefix = f"[{index}] " if len(items) > 1 else ""
+                errors.append(
+                    f"{prefix}{field}: '{value}' is not a valid choice "
+                    f"(expected one of: {', '.join(sorted(allowed[field]))})"
+                )
+    return errors
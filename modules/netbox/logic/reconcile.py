@@ -0,0 +1,245 @@
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import yaml
+from pynetbox.core.query import RequestError
+from modules.netbox.client import resolve_endpoint
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.reconcile")
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_WORKERS = 4
+
+# Desired-state spec (YAML or JSON), one mapping or a list of them applied in order:
+#
+#   endpoint: dcim.devices
+#   key: [name, site]            # natural key; related refs match on the id/slug/name they give
+#   scope: {tenant: acme}        # optional filters bounding the current-state fetch
+#   delete_missing: false        # delete in-scope objects absent from `objects`
+#   objects:
+#     - {name: sw1, site: {slug: dc1}, status: active, role: {slug: access}}
+
+
+def load_desired_state(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Load one or more desired-state specs from a YAML or JSON file."""
+    text = Path(path).read_text()
+    data = json.loads(text) if str(path).endswith(".json") else yaml.safe_load(text)
+    return normalize_specs(data)
+
+
+def normalize_specs(data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Return a list of validated specs from a single spec or list of specs."""
+    specs = data if isinstance(data, list) else [data]
+    for spec in specs:
+        missing = [f for f in ("endpoint", "key", "objects") if f not in spec]
+        if missing:
+            raise ValueError(f"Desired-state spec missing field(s): {', '.join(missing)}")
+        if isinstance(spec["key"], str):
+            spec["key"] = [spec["key"]]
+    return specs
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔍 Comparison helpers
+# ──────────────────────────────────────────────────────────────────────────────
+
+REF_ATTRS = ("id", "slug", "name", "value")
+
+
+def _key_value(value: Any) -> Any:
+    """Reduce a field value to a hashable natural-key component."""
+    if isinstance(value, dict):
+        for attr in ("slug", "name", "value", "id"):
+            if value.get(attr) is not None:
+                return str(value[attr])
+        return None
+    return None if value is None else str(value)
+
+
+def natural_key(obj: Dict[str, Any], key_fields: Sequence[str]) -> Tuple[Any, ...]:
+    """Return a display form of an object's natural key (used in messages)."""
+    return tuple(_key_value(obj.get(field)) for field in key_fields)
+
+
+def _current_alternatives(value: Any) -> List[Tuple[Optional[str], str]]:
+    # A current related object can be matched by any of its identifying attributes
+    if isinstance(value, dict):
+        return [(attr, str(value[attr])) for attr in REF_ATTRS if value.get(attr) is not None]
+    return [(None, None if value is None else str(value))]
+
+
+def _desired_alternatives(value: Any) -> List[Tuple[Optional[str], str]]:
+    # A desired ref matches only on the attribute it actually gives, in precedence order
+    if isinstance(value, dict):
+        for attr in REF_ATTRS:
+            if value.get(attr) is not None:
+                return [(attr, str(value[attr]))]
+        return [(None, None)]
+    if value is None:
+        return [(None, None)]
+    if isinstance(value, int) and not isinstance(value, bool):
+        return [(None, str(value)), ("id", str(value))]
+    return [(None, str(value)), ("slug", str(value)), ("name", str(value)), ("value", str(value))]
+
+
+def _key_candidates(obj: Dict[str, Any], key_fields: Sequence[str], desired: bool) -> List[Tuple[Any, ...]]:
+    """Every concrete key tuple an object can be looked up or indexed under."""
+    alternatives = _desired_alternatives if desired else _current_alternatives
+    return [tuple(c) for c in product(*(alternatives(obj.get(field)) for field in key_fields))]
+
+
+def values_match(desired: Any, current: Any) -> bool:
+    """Return True if a desired field value is already satisfied by the current value."""
+    if desired is None or current is None:
+        return desired is None and current is None
+
+    if isinstance(current, dict):
+        if isinstance(desired, dict):
+            return all(k in current and values_match(v, current[k]) for k, v in desired.items())
+        if "value" in current and "label" in current:
+            return desired == current["value"]  # Choice field
+        if isinstance(desired, int):
+            return desired == current.get("id")
+        return str(desired) in {str(current.get(a)) for a in ("slug", "name", "display") if current.get(a) is not None}
+
+    if isinstance(current, list) and isinstance(desired, list):
+        if len(desired) != len(current):
+            return False
+        return all(any(values_match(d, c) for c in current) for d in desired)
+
+    return desired == current
+
+
+def diff_object(desired: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Return only the fields of `desired` that differ from `current`."""
+    return {
+        field: value for field, value in desired.items()
+        if not values_match(value, current.get(field))
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🧮 Planning
+# ──────────────────────────────────────────────────────────────────────────────
+
+def fetch_current_state(endpoint_path: str, scope: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Fetch every in-scope object for an endpoint in bulk."""
+    endpoint = resolve_endpoint(endpoint_path)
+    log.debug(f"Fetching current state for {endpoint_path} with scope={scope}")
+    records = endpoint.filter(**scope) if scope else endpoint.all()
+    return [dict(r) for r in records]
+
+
+def plan_reconcile(spec: Dict[str, Any], current: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Compute the minimal create/update/delete plan for one desired-state spec."""
+    key_fields = spec["key"]
+    if current is None:
+        current = fetch_current_state(spec["endpoint"], spec.get("scope"))
+
+    index: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for obj in current:
+        for k in _key_candidates(obj, key_fields, desired=False):
+            if k in index and index[k]["id"] != obj["id"]:
+                log.warning(f"Duplicate natural key {k} on {spec['endpoint']}; keeping ID {index[k]['id']}")
+                continue
+            index.setdefault(k, obj)
+
+    creates, updates, seen, matched = [], [], set(), set()
+    unchanged = 0
+    for desired in spec["objects"]:
+        k = natural_key(desired, key_fields)
+        if k in seen:
+            raise ValueError(f"Duplicate natural key {k} in desired state for {spec['endpoint']}")
+        seen.add(k)
+
+        existing = next((index[c] for c in _key_candidates(desired, key_fields, desired=True) if c in index), None)
+        if existing is None:
+            creates.append(desired)
+            continue
+        matched.add(existing["id"])
+        patch = diff_object(desired, existing)
+        if patch:
+            updates.append({"id": existing["id"], **patch})
+        else:
+            unchanged += 1
+
+    deletes = []
+    if spec.get("delete_missing"):
+        deletes = [obj["id"] for obj in current if obj["id"] not in matched]
+
+    plan = {
+        "endpoint": spec["endpoint"],
+        "create": creates,
+        "update": updates,
+        "delete": deletes,
+        "unchanged": unchanged,
+    }
+    log.info(
+        f"📋 Plan for {spec['endpoint']}: {len(creates)} create, {len(updates)} update, "
+        f"{len(deletes)} delete, {unchanged} unchanged"
+    )
+    return plan
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🚀 Applying
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def apply_plan(
+    plan: Dict[str, Any],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+) -> Dict[str, Any]:
+    """Apply a plan with batched bulk writes dispatched in parallel."""
+    endpoint = resolve_endpoint(plan["endpoint"])
+    ops = {
+        "create": endpoint.create,
+        "update": endpoint.update,
+        "delete": endpoint.delete,
+    }
+    result: Dict[str, Any] = {"endpoint": plan["endpoint"], "errors": []}
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        # Creates and updates run before deletes so replaced objects never vanish first
+        for op in ("create", "update", "delete"):
+            batches = _chunks(plan[op], batch_size)
+            futures = [(batch, pool.submit(ops[op], batch)) for batch in batches]
+            done = 0
+            for batch, future in futures:
+                try:
+                    future.result()
+                    done += len(batch)
+                except RequestError as e:
+                    log.error(f"Batch {op} failed on {plan['endpoint']}: {e.error}")
+                    result["errors"].append({"op": op, "count": len(batch), "error": str(e.error)})
+            result[f"{op}d"] = done
+
+    result["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    return result
+
+
+def reconcile(
+    specs: List[Dict[str, Any]],
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+) -> List[Dict[str, Any]]:
+    """Plan (and unless `dry_run`, apply) every spec in order."""
+    results = []
+    for spec in specs:
+        plan = plan_reconcile(spec)
+        entry = {"plan": plan}
+        if not dry_run:
+            entry["result"] = apply_plan(plan, batch_size=batch_size, workers=workers)
+        results.append(entry)
+    return results
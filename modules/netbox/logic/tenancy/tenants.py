@@ -3,23 +3,37 @@ from typing import Any, Dict, List, Optional, Union
 from pynetbox.core.response import Record
 from pynetbox.core.query import RequestError
 from modules.netbox.client import get_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices
+from modules.netbox.logic import utils as nb_utils
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.tenancy.tenants")
 
 
-def get_all_tenants(limit: int = 0, offset: Optional[int] = None) -> List[Record]:
+def get_all_tenants(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Retrieve all tenants."""
     nb = get_netbox_client()
     log.debug("Fetching all tenants")
-    return list(nb.tenancy.tenants.all(limit=limit, offset=offset))
+    return nb_utils.get_all(nb.tenancy.tenants, limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
 
 
-def filter_tenants(*args: str, **kwargs: Any) -> List[Record]:
+def filter_tenants(
+    *args: str,
+    fields: Optional[Union[str, List[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+    **kwargs: Any,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Filter tenants with freeform or named arguments."""
     nb = get_netbox_client()
     log.debug(f"Filtering tenants with args={args}, kwargs={kwargs}")
-    return list(nb.tenancy.tenants.filter(*args, **kwargs))
+    return nb_utils.filter_objects(nb.tenancy.tenants, *args, fields=fields, brief=brief, compact=compact, **kwargs)
 
 
 def get_tenant(id: Optional[int] = None, **kwargs) -> Optional[Record]:
@@ -89,20 +103,18 @@ def delete_tenants(tenants: Union[List[Record], List[int]]) -> bool:
 def delete_tenants_by_filter(**kwargs) -> bool:
     """Delete all tenants matching filter criteria."""
     nb = get_netbox_client()
-    tenants = list(nb.tenancy.tenants.filter(**kwargs))
-    log.warning(f"Deleting {len(tenants)} tenants matching filter: {kwargs}")
     try:
-        return nb.tenancy.tenants.delete(tenants)
+        return nb_utils.delete_filtered(nb.tenancy.tenants, **kwargs)
     except RequestError as e:
         log.error(f"Filtered tenant deletion failed: {e.error}")
         raise
 
 
-def get_tenant_choices() -> Dict[str, Any]:
+def get_tenant_choices(refresh: bool = False) -> Dict[str, Any]:
     """Return tenant-related choice fields."""
     nb = get_netbox_client()
     log.debug("Fetching tenant choices")
-    return nb.tenancy.tenants.choices()
+    return get_cached_choices(nb.tenancy.tenants, refresh=refresh)
 
 
 def get_tenant_dict(tenant: Union[int, Record]) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,354 @@
+
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from modules.netbox.client import resolve_endpoint
+from modules.netbox.logic import utils as nb_utils
+from modules.netbox.logic.webhooks import register_hook
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.topology")
+
+DEFAULT_TOPOLOGY_TTL = 3600  # Webhook deltas keep the index fresh between reloads
+
+# Cable termination object types ('dcim.interface') and their endpoints
+PORT_ENDPOINTS = {
+    "interface": "dcim.interfaces",
+    "frontport": "dcim.front_ports",
+    "rearport": "dcim.rear_ports",
+}
+
+Node = Tuple[str, int]  # (termination kind, object id), e.g. ('interface', 12)
+
+
+def _ref_id(value: Any) -> Optional[int]:
+    return value.get("id") if isinstance(value, dict) else value
+
+
+class TopologyIndex:
+    """In-memory cable graph of devices, ports and cables with path queries."""
+
+    def __init__(self):
+        self.devices: Dict[int, Dict[str, Any]] = {}
+        self.nodes: Dict[Node, Dict[str, Any]] = {}
+        self.device_nodes: Dict[int, Set[Node]] = defaultdict(set)
+        self.cables: Dict[int, Tuple[Tuple[Node, ...], Tuple[Node, ...]]] = {}
+        self.peers: Dict[Node, List[Tuple[Node, int]]] = defaultdict(list)
+        self.front_to_rear: Dict[int, Tuple[int, int]] = {}
+        self.rear_to_front: Dict[Tuple[int, int], int] = {}
+        self.loaded_at = 0.0
+        self._links: Optional[Dict[int, List[Dict[str, Any]]]] = None
+        self._lock = threading.RLock()
+
+    # ── Loading / incremental updates ────────────────────────────────────────
+
+    def load(self, workers: int = 5):
+        """Bulk-load devices, ports and cables from NetBox in parallel raw pages."""
+        sources = {
+            "dcim.devices": {},
+            "dcim.interfaces": {"brief": 1},
+            "dcim.front_ports": {},
+            "dcim.rear_ports": {"brief": 1},
+            "dcim.cables": {},
+        }
+        started = time.monotonic()
+
+        def fetch(path: str) -> List[Dict[str, Any]]:
+            return list(nb_utils.iter_raw(resolve_endpoint(path), **sources[path]))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pages = dict(zip(sources, pool.map(fetch, sources)))
+
+        with self._lock:
+            for obj in pages["dcim.devices"]:
+                self.upsert_device(obj)
+            for obj in pages["dcim.interfaces"]:
+                self.upsert_port("interface", obj)
+            for obj in pages["dcim.front_ports"]:
+                self.upsert_port("frontport", obj)
+            for obj in pages["dcim.rear_ports"]:
+                self.upsert_port("rearport", obj)
+            for obj in pages["dcim.cables"]:
+                self.upsert_cable(obj)
+            self.loaded_at = time.time()
+        log.info(
+            f"🕸️ Topology loaded: {len(self.devices)} devices, {len(self.nodes)} ports, "
+            f"{len(self.cables)} cables in {time.monotonic() - started:.2f}s"
+        )
+
+    def upsert_device(self, obj: Dict[str, Any]):
+        with self._lock:
+            self.devices[obj["id"]] = {
+                "id": obj["id"],
+                "name": obj.get("name") or obj.get("display"),
+                "site": _ref_id(obj.get("site")),
+                "role": _ref_id(obj.get("role") or obj.get("device_role")),
+            }
+            self._links = None
+
+    def remove_device(self, device_id: int):
+        with self._lock:
+            self.devices.pop(device_id, None)
+            for node in list(self.device_nodes.pop(device_id, ())):
+                self.remove_port(node[0], node[1])
+            self._links = None
+
+    def upsert_port(self, kind: str, obj: Dict[str, Any]):
+        with self._lock:
+            node = (kind, obj["id"])
+            device_id = _ref_id(obj.get("device"))
+            previous = self.nodes.get(node)
+            if previous and previous["device"] != device_id:
+                self.device_nodes[previous["device"]].discard(node)
+            self.nodes[node] = {"kind": kind, "id": obj["id"], "device": device_id, "name": obj.get("name") or obj.get("display")}
+            if device_id is not None:
+                self.device_nodes[device_id].add(node)
+            if kind == "frontport" and obj.get("rear_port"):
+                self._unlink_front(obj["id"])
+                rear = (_ref_id(obj["rear_port"]), obj.get("rear_port_position") or 1)
+                self.front_to_rear[obj["id"]] = rear
+                self.rear_to_front[rear] = obj["id"]
+            self._links = None
+
+    def remove_port(self, kind: str, port_id: int):
+        with self._lock:
+            node = (kind, port_id)
+            info = self.nodes.pop(node, None)
+            if info and info["device"] is not None:
+                self.device_nodes[info["device"]].discard(node)
+            if kind == "frontport":
+                self._unlink_front(port_id)
+            for peer, cable_id in self.peers.pop(node, []):
+                self.peers[peer] = [(n, c) for n, c in self.peers.get(peer, []) if n != node]
+            self._links = None
+
+    def _unlink_front(self, front_id: int):
+        rear = self.front_to_rear.pop(front_id, None)
+        if rear is not None and self.rear_to_front.get(rear) == front_id:
+            del self.rear_to_front[rear]
+
+    def _termination_nodes(self, terminations: Iterable[Dict[str, Any]]) -> Tuple[Node, ...]:
+        nodes = []
+        for term in terminations or []:
+            kind = (term.get("object_type") or term.get("termination_type") or "").split(".")[-1]
+            obj = term.get("object") or {}
+            object_id = term.get("object_id") or obj.get("id")
+            if not kind or object_id is None:
+                continue
+            node = (kind, object_id)
+            if node not in self.nodes:
+                # Console/power ports, circuit terminations: keep what the cable tells us
+                self.upsert_port(kind, {"id": object_id, **obj})
+            nodes.append(node)
+        return tuple(nodes)
+
+    def upsert_cable(self, obj: Dict[str, Any]):
+        with self._lock:
+            self.remove_cable(obj["id"])
+            a_side = self._termination_nodes(obj.get("a_terminations"))
+            b_side = self._termination_nodes(obj.get("b_terminations"))
+            self.cables[obj["id"]] = (a_side, b_side)
+            for a in a_side:
+                for b in b_side:
+                    self.peers[a].append((b, obj["id"]))
+                    self.peers[b].append((a, obj["id"]))
+            self._links = None
+
+    def remove_cable(self, cable_id: int):
+        with self._lock:
+            sides = self.cables.pop(cable_id, None)
+            if not sides:
+                return
+            for node in sides[0] + sides[1]:
+                self.peers[node] = [(n, c) for n, c in self.peers.get(node, []) if c != cable_id]
+            self._links = None
+
+    def apply_change(self, change: Dict[str, Any]):
+        """Apply a webhook change record (see logic.webhooks.parse_change)."""
+        endpoint, data, deleted = change["endpoint"], change["data"], change["event"] == "deleted"
+        with self._lock:
+            if endpoint == "dcim.cables":
+                if deleted:
+                    self.remove_cable(data["id"])
+                else:
+                    self.upsert_cable(data)
+            elif endpoint == "dcim.devices":
+                if deleted:
+                    self.remove_device(data["id"])
+                else:
+                    self.upsert_device(data)
+            else:
+                kind = next(k for k, path in PORT_ENDPOINTS.items() if path == endpoint)
+                if deleted:
+                    self.remove_port(kind, data["id"])
+                else:
+                    self.upsert_port(kind, data)
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def _hop(self, node: Node) -> Dict[str, Any]:
+        info = self.nodes.get(node) or {"kind": node[0], "id": node[1], "device": None, "name": None}
+        device = self.devices.get(info["device"]) if info["device"] is not None else None
+        return {**info, "device_name": device["name"] if device else None}
+
+    def _passthrough(self, node: Node, position: Optional[int]) -> Tuple[Optional[Node], Optional[int]]:
+        """Cross a patch panel: front port → rear port (carrying position), rear → matching front."""
+        kind, port_id = node
+        if kind == "frontport" and port_id in self.front_to_rear:
+            rear_id, rear_position = self.front_to_rear[port_id]
+            return ("rearport", rear_id), rear_position
+        if kind == "rearport":
+            front_id = self.rear_to_front.get((port_id, position or 1))
+            if front_id is not None:
+                return ("frontport", front_id), None
+        return None, None
+
+    def _walk(self, node: Node, position: Optional[int], path: List[Dict[str, Any]], seen: Set[Node]) -> List[List[Dict[str, Any]]]:
+        paths = []
+        for peer, cable_id in self.peers.get(node, []):
+            if peer in seen:
+                continue
+            hops = path + [{"kind": "cable", "id": cable_id}, self._hop(peer)]
+            through, next_position = self._passthrough(peer, position)
+            if through is None or through in seen:
+                paths.append(hops)
+                continue
+            hops.append(self._hop(through))
+            paths.extend(self._walk(through, next_position, hops, seen | {peer, through}))
+        return paths or [path]
+
+    def trace(self, kind: str, port_id: int) -> List[List[Dict[str, Any]]]:
+        """Return every end-to-end cable path from a port, through patch panels."""
+        with self._lock:
+            node = (kind, port_id)
+            if node not in self.nodes:
+                raise KeyError(f"{kind} {port_id} is not in the topology index")
+            return self._walk(node, None, [self._hop(node)], {node})
+
+    def links(self) -> Dict[int, List[Dict[str, Any]]]:
+        """Device-to-device links from traced interface paths (patch panels become `via`)."""
+        with self._lock:
+            if self._links is not None:
+                return self._links
+            links: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+            for node, info in self.nodes.items():
+                if node[0] != "interface" or info["device"] is None or not self.peers.get(node):
+                    continue
+                for path in self._walk(node, None, [self._hop(node)], {node}):
+                    end = path[-1]
+                    # Only interface-to-interface paths are links; open trunks end on panel ports
+                    if end.get("kind") != "interface" or end["device"] in (None, info["device"]):
+                        continue
+                    links[info["device"]].append({
+                        "interface": {"id": info["id"], "name": info["name"]},
+                        "device": {"id": end["device"], "name": end["device_name"]},
+                        "remote": {"kind": end["kind"], "id": end["id"], "name": end["name"]},
+                        "cables": [h["id"] for h in path if h["kind"] == "cable"],
+                        "via": sorted({h["device"] for h in path[1:-1] if h["kind"] != "cable" and h["device"] is not None}),
+                    })
+            self._links = dict(links)
+            return self._links
+
+    def neighbours(self, device_id: int) -> List[Dict[str, Any]]:
+        """Devices reachable over one end-to-end cable path from `device_id`."""
+        if device_id not in self.devices:
+            raise KeyError(f"Device {device_id} is not in the topology index")
+        return self.links().get(device_id, [])
+
+    def _adjacency(self, failed: Optional[int] = None) -> Dict[int, Set[int]]:
+        graph: Dict[int, Set[int]] = defaultdict(set)
+        for device_id, device_links in self.links().items():
+            if device_id == failed:
+                continue
+            for link in device_links:
+                peer = link["device"]["id"]
+                if peer == failed or failed in link["via"]:
+                    continue
+                graph[device_id].add(peer)
+                graph[peer].add(device_id)
+        return graph
+
+    @staticmethod
+    def _reachable(graph: Dict[int, Set[int]], starts: Iterable[int]) -> Set[int]:
+        seen = set(starts)
+        queue = deque(seen)
+        while queue:
+            for peer in graph.get(queue.popleft(), ()):
+                if peer not in seen:
+                    seen.add(peer)
+                    queue.append(peer)
+        return seen
+
+    def blast_radius(self, device_id: int, roots: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """Devices that lose connectivity if `device_id` (or a patch panel) fails.
+
+        With `roots` (e.g. core switches), affected devices are those no longer
+        reachable from any root. Without, they are devices cut off from the largest
+        remaining part of the failed device's component.
+        """
+        with self._lock:
+            if device_id not in self.devices:
+                raise KeyError(f"Device {device_id} is not in the topology index")
+            before = self._adjacency()
+            after = self._adjacency(failed=device_id)
+            roots = [r for r in (roots or []) if r != device_id]
+            if roots:
+                lost = self._reachable(before, roots) - self._reachable(after, roots) - {device_id}
+            else:
+                component = self._reachable(before, [device_id]) - {device_id}
+                remaining, parts = set(component), []
+                while remaining:
+                    part = self._reachable(after, [next(iter(remaining))]) & component
+                    parts.append(part)
+                    remaining -= part
+                largest = max(parts, key=len) if parts else set()
+                lost = component - largest
+            affected = [self.devices.get(d) or {"id": d, "name": None} for d in sorted(lost)]
+            return {
+                "device": self.devices[device_id],
+                "roots": roots,
+                "count": len(affected),
+                "affected": affected,
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "devices": len(self.devices),
+                "ports": len(self.nodes),
+                "cables": len(self.cables),
+                "loaded_at": self.loaded_at,
+            }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🧠 Process-wide index + webhook deltas
+# ──────────────────────────────────────────────────────────────────────────────
+
+_index: Optional[TopologyIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_topology_index(refresh: bool = False) -> TopologyIndex:
+    """Return the shared topology index, (re)loading it when missing, stale or forced."""
+    global _index
+    ttl = int(os.getenv("NETBOX_TOPOLOGY_TTL", DEFAULT_TOPOLOGY_TTL))
+    with _index_lock:
+        if refresh or _index is None or time.time() - _index.loaded_at > ttl:
+            index = TopologyIndex()
+            index.load()
+            _index = index
+        return _index
+
+
+def _apply_topology_change(change: Dict[str, Any]):
+    # Only keep an index fresh once something has loaded it
+    if _index is not None and change.get("data", {}).get("id") is not None:
+        _index.apply_change(change)
+
+
+for _path in ("dcim.devices", "dcim.cables", *PORT_ENDPOINTS.values()):
+    register_hook(_path, _apply_topology_change)
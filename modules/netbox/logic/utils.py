@@ -1,16 +1,48 @@
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
 from pynetbox.core.response import Record, RecordSet
 from pynetbox.core.query import RequestError
 from pynetbox.core.endpoint import Endpoint
+from modules.netbox.logic.compact import compact_record
+from modules.netbox.logic.metadata_cache import get_cached_choices, validate_payload
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.utils")
 
-
-def get_all(endpoint: Endpoint, limit: int = 0, offset: Optional[int] = None) -> List[Record]:
-    """Return all objects from a given NetBox endpoint."""
+PAGE_SIZE = 1000
+ID_PAGE_SIZE = 1000
+DELETE_CHUNK_SIZE = 500
+
+
+def projection(fields: Optional[Union[str, Sequence[str]]] = None, brief: bool = False) -> Dict[str, Any]:
+    """Build NetBox query params that limit the fields returned per object."""
+    params: Dict[str, Any] = {}
+    if fields:
+        params["fields"] = fields if isinstance(fields, str) else ",".join(fields)
+    if brief:
+        params["brief"] = 1
+    return params
+
+
+def get_all(
+    endpoint: Endpoint,
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[Union[str, Sequence[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+) -> Union[List[Record], List[Dict[str, Any]]]:
+    """Return all objects from a given NetBox endpoint.
+
+    With `compact`, returns plain dicts built straight from the JSON pages
+    (see `iter_compact`) instead of pynetbox Records.
+    """
     log.debug(f"Fetching all records from {endpoint.name}")
+    params = projection(fields, brief)
+    if compact:
+        return list(iter_compact(endpoint, limit=limit, offset=offset, **params))
+    if params:
+        return list(endpoint.filter(limit=limit, offset=offset, **params))
     return list(endpoint.all(limit=limit, offset=offset))
 
 
@@ -23,10 +55,73 @@ def get_object(endpoint: Endpoint, id: Optional[int] = None, **kwargs) -> Option
     return endpoint.get(**kwargs)
 
 
-def filter_objects(endpoint: Endpoint, *args: str, **kwargs: Any) -> List[Record]:
+def filter_objects(
+    endpoint: Endpoint,
+    *args: str,
+    fields: Optional[Union[str, Sequence[str]]] = None,
+    brief: bool = False,
+    compact: bool = False,
+    **kwargs: Any,
+) -> Union[List[Record], List[Dict[str, Any]]]:
     """Return a filtered list of objects from the endpoint."""
     log.debug(f"Filtering on {endpoint.name} with args={args}, kwargs={kwargs}")
-    return list(endpoint.filter(*args, **kwargs))
+    if compact:
+        return list(iter_compact(endpoint, *args, **kwargs, **projection(fields, brief)))
+    return list(endpoint.filter(*args, **kwargs, **projection(fields, brief)))
+
+
+def iter_raw(
+    endpoint: Endpoint,
+    *args: str,
+    limit: int = 0,
+    offset: Optional[int] = None,
+    page_size: int = PAGE_SIZE,
+    **filters: Any,
+) -> Iterator[Dict[str, Any]]:
+    """Yield objects as decoded JSON, page by page, without building Records.
+
+    With `limit`, only that slice is fetched; otherwise `next` links are
+    followed until the result set is exhausted.
+    """
+    headers = {"Accept": "application/json"}
+    if endpoint.api.token:
+        headers["Authorization"] = f"Token {endpoint.api.token}"
+    url = f"{endpoint.url}/"
+    params: Optional[Dict[str, Any]] = {**filters, "limit": limit or page_size, "offset": offset or 0}
+    if args:
+        params["q"] = " ".join(args)
+    while url:
+        resp = endpoint.api.http_session.get(url, headers=headers, params=params)
+        if not resp.ok:
+            raise RequestError(resp)
+        page = resp.json()
+        yield from page["results"]
+        if limit:
+            break
+        url, params = page.get("next"), None  # `next` already carries the query string
+
+
+def iter_compact(endpoint: Endpoint, *args: str, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """Yield compact dicts (nested records as ID/display refs) for matching objects."""
+    for obj in iter_raw(endpoint, *args, **kwargs):
+        yield compact_record(obj)
+
+
+def iter_ids(endpoint: Endpoint, page_size: int = ID_PAGE_SIZE, **filters: Any) -> Iterator[int]:
+    """Yield IDs of objects matching filters from ID-only pages, without building Records."""
+    for obj in iter_raw(endpoint, page_size=page_size, **filters, **projection("id", brief=True)):
+        yield obj["id"]
+
+
+def delete_ids(endpoint: Endpoint, ids: Sequence[int], chunk_size: int = DELETE_CHUNK_SIZE) -> int:
+    """Delete objects by ID in bulk chunks; return the number deleted."""
+    deleted = 0
+    for start in range(0, len(ids), chunk_size):
+        chunk = list(ids[start:start + chunk_size])
+        endpoint.delete(chunk)
+        deleted += len(chunk)
+        log.debug(f"Deleted {deleted}/{len(ids)} from {endpoint.name}")
+    return deleted
 
 
 def count_objects(endpoint: Endpoint, *args: str, **kwargs: Any) -> int:
@@ -35,8 +130,14 @@ def count_objects(endpoint: Endpoint, *args: str, **kwargs: Any) -> int:
     return endpoint.count(*args, **kwargs)
 
 
-def create_objects(endpoint: Endpoint, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Union[Record, List[Record]]:
+def create_objects(
+    endpoint: Endpoint,
+    data: Union[Dict[str, Any], List[Dict[str, Any]]],
+    validate: bool = False,
+) -> Union[Record, List[Record]]:
     """Create one or more objects on the endpoint."""
+    if validate:
+        validate_choices(endpoint, data)
     log.info(f"Creating objects on {endpoint.name}")
     try:
         return endpoint.create(data)
@@ -45,8 +146,14 @@ def create_objects(endpoint: Endpoint, data: Union[Dict[str, Any], List[Dict[str
         raise
 
 
-def update_objects(endpoint: Endpoint, updates: Union[List[Dict[str, Any]], List[Record]]) -> List[Record]:
+def update_objects(
+    endpoint: Endpoint,
+    updates: Union[List[Dict[str, Any]], List[Record]],
+    validate: bool = False,
+) -> List[Record]:
     """Update multiple objects (must include `id`)."""
+    if validate:
+        validate_choices(endpoint, [u for u in updates if isinstance(u, dict)])
     log.info(f"Updating objects on {endpoint.name}")
     try:
         return endpoint.update(updates)
@@ -76,25 +183,36 @@ def delete_objects(endpoint: Endpoint, objects: Union[List[Record], List[int], R
 
 
 def delete_filtered(endpoint: Endpoint, **filters) -> bool:
-    """Delete objects based on filters."""
-    records = list(endpoint.filter(**filters))
-    log.warning(f"Deleting {len(records)} filtered records from {endpoint.name} with {filters}")
+    """Delete objects based on filters, scanning IDs only and deleting in chunks."""
     try:
-        return endpoint.delete(records)
+        # IDs are collected before deleting so offset-based paging stays stable
+        ids = list(iter_ids(endpoint, **filters))
+        log.warning(f"Deleting {len(ids)} filtered records from {endpoint.name} with {filters}")
+        if not ids:
+            return False
+        return delete_ids(endpoint, ids) == len(ids)
     except RequestError as e:
         log.error(f"Delete by filter failed on {endpoint.name}: {e.error}")
         raise
 
 
-def get_choices(endpoint: Endpoint) -> Dict[str, Any]:
+def get_choices(endpoint: Endpoint, refresh: bool = False) -> Dict[str, Any]:
     """Return choice values from the endpoint (e.g., status, role)."""
     log.debug(f"Getting choices for {endpoint.name}")
-    return endpoint.choices()
+    return get_cached_choices(endpoint, refresh=refresh)
+
+
+def validate_choices(endpoint: Endpoint, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> None:
+    """Raise ValueError if the payload uses a value not in the endpoint's cached choices."""
+    errors = validate_payload(endpoint, data)
+    if errors:
+        log.error(f"Payload validation failed on {endpoint.name}: {errors}")
+        raise ValueError("; ".join(errors))
 
 
-def serialize_record(record: Record) -> Dict[str, Any]:
-    """Return a dict representation of a Record object."""
-    return dict(record)
+def serialize_record(record: Union[Record, Dict[str, Any]]) -> Dict[str, Any]:
+    """Return a dict representation of a Record object (compact dicts pass through)."""
+    return record if isinstance(record, dict) else dict(record)
 
 
 def safe_full_details(record: Record) -> bool:
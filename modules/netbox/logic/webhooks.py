@@ -0,0 +1,128 @@
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from modules.netbox.logic.metadata_cache import invalidate_choices
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.webhooks")
+
+DEFAULT_DEDUPE_TTL = 3600
+_MAX_DELIVERIES = 10000
+
+ChangeHook = Callable[[Dict[str, Any]], None]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔐 Signature validation
+# ──────────────────────────────────────────────────────────────────────────────
+
+def get_webhook_secret() -> Optional[str]:
+    return os.getenv("NETBOX_WEBHOOK_SECRET") or None
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """Check NetBox's `X-Hook-Signature` (hex HMAC-SHA512 of the raw body)."""
+    if not signature:
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha512).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔁 Delivery dedupe (NetBox retries resend the same payload)
+# ──────────────────────────────────────────────────────────────────────────────
+
+_deliveries: "OrderedDict[str, float]" = OrderedDict()
+_deliveries_lock = threading.Lock()
+
+
+def delivery_key(payload: Dict[str, Any], body: bytes) -> str:
+    """Identify a delivery by originating request + object + event, else by body digest."""
+    data = payload.get("data") or {}
+    if payload.get("request_id") and data.get("id") is not None:
+        return f"{payload['request_id']}:{payload.get('model')}:{data['id']}:{payload.get('event')}"
+    return hashlib.sha256(body).hexdigest()
+
+
+def remember_delivery(key: str) -> bool:
+    """Record a delivery; return False if it was already seen within the TTL."""
+    ttl = int(os.getenv("NETBOX_WEBHOOK_DEDUPE_TTL", DEFAULT_DEDUPE_TTL))
+    now = time.time()
+    with _deliveries_lock:
+        while _deliveries:
+            oldest, seen_at = next(iter(_deliveries.items()))
+            if now - seen_at <= ttl and len(_deliveries) < _MAX_DELIVERIES:
+                break
+            _deliveries.pop(oldest)
+        if key in _deliveries:
+            return False
+        _deliveries[key] = now
+        return True
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🧩 Change parsing + in-process delta dispatch
+# ──────────────────────────────────────────────────────────────────────────────
+
+def endpoint_from_url(url: Optional[str]) -> Optional[str]:
+    """Map an object URL ('.../api/dcim/devices/12/') to its endpoint key ('dcim.devices')."""
+    if not url or "/api/" not in url:
+        return None
+    parts = [p for p in url.split("/api/", 1)[1].split("/") if p]
+    if parts and parts[-1].isdigit():
+        parts = parts[:-1]
+    return ".".join(parts).replace("-", "_") or None
+
+
+def parse_change(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a NetBox webhook payload into a change record for hooks."""
+    data = payload.get("data") or {}
+    snapshots = payload.get("snapshots") or {}
+    return {
+        "event": payload.get("event"),
+        "endpoint": endpoint_from_url(data.get("url")),
+        "model": payload.get("model"),
+        "id": data.get("id"),
+        "data": data,
+        "prechange": snapshots.get("prechange"),
+        "request_id": payload.get("request_id"),
+        "timestamp": payload.get("timestamp"),
+    }
+
+
+_change_hooks: Dict[str, List[ChangeHook]] = {}
+
+
+def register_hook(endpoint: str, callback: ChangeHook):
+    """
+    Register a callback applied to every change on `endpoint` ('dcim.devices'),
+    or on every endpoint with '*'.
+    """
+    _change_hooks.setdefault(endpoint, []).append(callback)
+    log.debug(f"✅ Registered NetBox change hook for {endpoint}: {callback.__name__}")
+
+
+def dispatch_change(change: Dict[str, Any]) -> int:
+    """Apply a change to every matching hook in-process; return the number of hooks run."""
+    hooks = _change_hooks.get(change["endpoint"], []) + _change_hooks.get("*", [])
+    for hook in hooks:
+        try:
+            hook(change)
+        except Exception as e:
+            log.exception(f"❌ Error in {hook.__name__} for {change['endpoint']}#{change['id']}: {e}")
+    return len(hooks)
+
+
+def _invalidate_choices_on_choice_set_change(change: Dict[str, Any]):
+    # Custom field choice sets feed validation across endpoints; drop them all
+    removed = invalidate_choices()
+    log.info(f"🧹 {change['endpoint']} changed; invalidated {removed} cached choice set(s)")
+
+
+register_hook("extras.custom_fields", _invalidate_choices_on_choice_set_change)
+register_hook("extras.custom_field_choice_sets", _invalidate_choices_on_choice_set_change)
@@ -1,63 +1,83 @@
 
 from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query
-from pynetbox.core.query import RequestError
-from modules.netbox.client import get_netbox_client
+from fastapi import APIRouter, HTTPException, Query, Request
+from modules.netbox.async_client import NetboxRequestError, get_async_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices_async
+from modules.netbox.routes.utils import query_filters
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.routes.dcim.devices")
 
 router = APIRouter(tags=["dcim.devices"])
 
+ENDPOINT = "dcim.devices"
+
 
 @router.get("/", response_model=List[Dict[str, Any]])
-def list_devices(limit: int = 0, offset: Optional[int] = None):
+async def list_devices(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """Get all devices."""
     try:
-        nb = get_netbox_client()
-        devices = nb.dcim.devices.all(limit=limit, offset=offset)
-        return [dict(d) for d in devices]
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        return await endpoint.all(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     except Exception:
         log.exception("Failed to list devices")
         raise HTTPException(status_code=500, detail="Unable to fetch devices")
 
 
 @router.get("/search", response_model=List[Dict[str, Any]])
-def search_devices(q: Optional[str] = None, **filters: Any):
+async def search_devices(
+    request: Request,
+    q: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """Filter devices with freeform q or keyword filters."""
     try:
-        nb = get_netbox_client()
-        if q:
-            results = nb.dcim.devices.filter(q, **filters)
-        else:
-            results = nb.dcim.devices.filter(**filters)
-        return [dict(d) for d in results]
+        filters = query_filters(request, exclude={"q", "fields", "brief", "compact"})
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        args = (q,) if q else ()
+        return await endpoint.filter(*args, fields=fields, brief=brief, compact=compact, **filters)
     except Exception:
         log.exception("Failed to filter devices")
         raise HTTPException(status_code=500, detail="Device filter failed")
 
 
 @router.get("/count", response_model=Dict[str, int])
-def count_devices(**filters: Any):
+async def count_devices(request: Request):
     """Count devices matching filters."""
     try:
-        nb = get_netbox_client()
-        return {"count": nb.dcim.devices.count(**filters)}
+        return {"count": await get_async_netbox_client().endpoint(ENDPOINT).count(**query_filters(request))}
     except Exception:
         log.exception("Count failed")
         raise HTTPException(status_code=500, detail="Count operation failed")
 
 
+@router.get("/choices", response_model=Dict[str, Any])
+async def get_device_choices(refresh: bool = False):
+    """Get choices for device fields (status, role, etc.)."""
+    try:
+        return await get_cached_choices_async(ENDPOINT, refresh=refresh)
+    except Exception:
+        log.exception("Failed to fetch device choices")
+        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
+
+
 @router.get("/{device_id}", response_model=Dict[str, Any])
-def get_device_by_id(device_id: int):
+async def get_device_by_id(device_id: int):
     """Fetch a single device by ID."""
     try:
-        nb = get_netbox_client()
-        device = nb.dcim.devices.get(device_id)
+        device = await get_async_netbox_client().endpoint(ENDPOINT).get(device_id)
         if not device:
             raise HTTPException(status_code=404, detail="Device not found")
-        return dict(device)
+        return device
     except HTTPException:
         raise
     except Exception:
@@ -66,15 +86,11 @@ def get_device_by_id(device_id: int):
 
 
 @router.post("/", response_model=Union[Dict[str, Any], List[Dict[str, Any]]])
-def create_devices(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
+async def create_devices(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
     """Create one or more devices."""
     try:
-        nb = get_netbox_client()
-        result = nb.dcim.devices.create(payload)
-        if isinstance(result, list):
-            return [dict(d) for d in result]
-        return dict(result)
-    except RequestError as e:
+        return await get_async_netbox_client().endpoint(ENDPOINT).create(payload)
+    except NetboxRequestError as e:
         log.error(f"Device creation failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
@@ -83,16 +99,14 @@ def create_devices(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
 
 
 @router.patch("/{device_id}", response_model=Dict[str, bool])
-def update_device(device_id: int, updates: Dict[str, Any]):
+async def update_device(device_id: int, updates: Dict[str, Any]):
     """Patch a device by ID."""
     try:
-        nb = get_netbox_client()
-        device = nb.dcim.devices.get(device_id)
-        if not device:
+        await get_async_netbox_client().endpoint(ENDPOINT).patch(device_id, updates)
+        return {"success": True}
+    except NetboxRequestError as e:
+        if e.status_code == 404:
             raise HTTPException(status_code=404, detail="Device not found")
-        success = device.update(updates)
-        return {"success": success}
-    except RequestError as e:
         log.error(f"Update failed for device {device_id}: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
@@ -101,13 +115,12 @@ def update_device(device_id: int, updates: Dict[str, Any]):
 
 
 @router.delete("/", response_model=Dict[str, bool])
-def delete_devices_by_ids(ids: List[int] = Query(..., description="List of device IDs")):
+async def delete_devices_by_ids(ids: List[int] = Query(..., description="List of device IDs")):
     """Bulk delete devices by IDs."""
     try:
-        nb = get_netbox_client()
-        deleted = nb.dcim.devices.delete(ids)
+        deleted = await get_async_netbox_client().endpoint(ENDPOINT).delete(ids)
         return {"deleted": deleted}
-    except RequestError as e:
+    except NetboxRequestError as e:
         log.error(f"Bulk delete failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
@@ -116,29 +129,16 @@ def delete_devices_by_ids(ids: List[int] = Query(..., description="List of devic
 
 
 @router.delete("/filter", response_model=Dict[str, Any])
-def delete_devices_by_filter(**filters: Any):
+async def delete_devices_by_filter(request: Request):
     """Delete devices using filter criteria."""
     try:
-        nb = get_netbox_client()
-        records = list(nb.dcim.devices.filter(**filters))
-        if not records:
+        count = await get_async_netbox_client().endpoint(ENDPOINT).delete_filtered(**query_filters(request))
+        if not count:
             return {"deleted": False, "message": "No matching devices"}
-        deleted = nb.dcim.devices.delete(records)
-        return {"deleted": deleted}
-    except RequestError as e:
+        return {"deleted": True, "count": count}
+    except NetboxRequestError as e:
         log.error(f"Filtered delete failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
         log.exception("Unexpected error during filtered delete")
         raise HTTPException(status_code=500, detail="Internal server error")
-
-
-@router.get("/choices", response_model=Dict[str, Any])
-def get_device_choices():
-    """Get choices for device fields (status, role, etc.)."""
-    try:
-        nb = get_netbox_client()
-        return nb.dcim.devices.choices()
-    except Exception:
-        log.exception("Failed to fetch device choices")
-        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
@@ -1,59 +1,83 @@
 
 from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query
-from pynetbox.core.query import RequestError
-from modules.netbox.client import get_netbox_client
+from fastapi import APIRouter, HTTPException, Query, Request
+from modules.netbox.async_client import NetboxRequestError, get_async_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices_async
+from modules.netbox.routes.utils import query_filters
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.routes.dcim.interfaces")
 
 router = APIRouter(tags=["dcim.interfaces"])
 
+ENDPOINT = "dcim.interfaces"
+
 
 @router.get("/", response_model=List[Dict[str, Any]])
-def list_interfaces(limit: int = 0, offset: Optional[int] = None):
+async def list_interfaces(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """Get all interfaces."""
     try:
-        nb = get_netbox_client()
-        return [dict(i) for i in nb.dcim.interfaces.all(limit=limit, offset=offset)]
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        return await endpoint.all(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     except Exception:
         log.exception("Failed to list interfaces")
         raise HTTPException(status_code=500, detail="Unable to fetch interfaces")
 
 
 @router.get("/search", response_model=List[Dict[str, Any]])
-def search_interfaces(q: Optional[str] = None, **filters: Any):
+async def search_interfaces(
+    request: Request,
+    q: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """Filter interfaces using query or keyword filters."""
     try:
-        nb = get_netbox_client()
-        results = nb.dcim.interfaces.filter(q, **filters) if q else nb.dcim.interfaces.filter(**filters)
-        return [dict(i) for i in results]
+        filters = query_filters(request, exclude={"q", "fields", "brief", "compact"})
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        args = (q,) if q else ()
+        return await endpoint.filter(*args, fields=fields, brief=brief, compact=compact, **filters)
     except Exception:
         log.exception("Failed to filter interfaces")
         raise HTTPException(status_code=500, detail="Interface filter failed")
 
 
 @router.get("/count", response_model=Dict[str, int])
-def count_interfaces(**filters: Any):
+async def count_interfaces(request: Request):
     """Count interfaces matching filters."""
     try:
-        nb = get_netbox_client()
-        return {"count": nb.dcim.interfaces.count(**filters)}
+        return {"count": await get_async_netbox_client().endpoint(ENDPOINT).count(**query_filters(request))}
     except Exception:
-        log.exception("Interface count failed")
+        log.exception("Count failed")
         raise HTTPException(status_code=500, detail="Count operation failed")
 
 
+@router.get("/choices", response_model=Dict[str, Any])
+async def get_interface_choices(refresh: bool = False):
+    """Get choices for interface fields (type, mode, etc.)."""
+    try:
+        return await get_cached_choices_async(ENDPOINT, refresh=refresh)
+    except Exception:
+        log.exception("Failed to fetch interface choices")
+        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
+
+
 @router.get("/{interface_id}", response_model=Dict[str, Any])
-def get_interface_by_id(interface_id: int):
+async def get_interface_by_id(interface_id: int):
     """Fetch a single interface by ID."""
     try:
-        nb = get_netbox_client()
-        interface = nb.dcim.interfaces.get(interface_id)
+        interface = await get_async_netbox_client().endpoint(ENDPOINT).get(interface_id)
         if not interface:
             raise HTTPException(status_code=404, detail="Interface not found")
-        return dict(interface)
+        return interface
     except HTTPException:
         raise
     except Exception:
@@ -62,15 +86,11 @@ def get_interface_by_id(interface_id: int):
 
 
 @router.post("/", response_model=Union[Dict[str, Any], List[Dict[str, Any]]])
-def create_interfaces(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
+async def create_interfaces(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
     """Create one or more interfaces."""
     try:
-        nb = get_netbox_client()
-        result = nb.dcim.interfaces.create(payload)
-        if isinstance(result, list):
-            return [dict(i) for i in result]
-        return dict(result)
-    except RequestError as e:
+        return await get_async_netbox_client().endpoint(ENDPOINT).create(payload)
+    except NetboxRequestError as e:
         log.error(f"Interface creation failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
@@ -79,31 +99,28 @@ def create_interfaces(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
 
 
 @router.patch("/{interface_id}", response_model=Dict[str, bool])
-def update_interface(interface_id: int, updates: Dict[str, Any]):
+async def update_interface(interface_id: int, updates: Dict[str, Any]):
     """Patch an interface by ID."""
     try:
-        nb = get_netbox_client()
-        interface = nb.dcim.interfaces.get(interface_id)
-        if not interface:
+        await get_async_netbox_client().endpoint(ENDPOINT).patch(interface_id, updates)
+        return {"success": True}
+    except NetboxRequestError as e:
+        if e.status_code == 404:
             raise HTTPException(status_code=404, detail="Interface not found")
-        success = interface.update(updates)
-        return {"success": success}
-    except RequestError as e:
         log.error(f"Update failed for interface {interface_id}: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
-        log.exception("Unexpected error during interface update")
+        log.exception("Unexpected error during update")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.delete("/", response_model=Dict[str, bool])
-def delete_interfaces_by_ids(ids: List[int] = Query(..., description="List of interface IDs")):
+async def delete_interfaces_by_ids(ids: List[int] = Query(..., description="List of interface IDs")):
     """Bulk delete interfaces by IDs."""
     try:
-        nb = get_netbox_client()
-        deleted = nb.dcim.interfaces.delete(ids)
+        deleted = await get_async_netbox_client().endpoint(ENDPOINT).delete(ids)
         return {"deleted": deleted}
-    except RequestError as e:
+    except NetboxRequestError as e:
         log.error(f"Bulk delete failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
@@ -112,29 +129,16 @@ def delete_interfaces_by_ids(ids: List[int] = Query(..., description="List of in
 
 
 @router.delete("/filter", response_model=Dict[str, Any])
-def delete_interfaces_by_filter(**filters: Any):
+async def delete_interfaces_by_filter(request: Request):
     """Delete interfaces using filter criteria."""
     try:
-        nb = get_netbox_client()
-        records = list(nb.dcim.interfaces.filter(**filters))
-        if not records:
+        count = await get_async_netbox_client().endpoint(ENDPOINT).delete_filtered(**query_filters(request))
+        if not count:
             return {"deleted": False, "message": "No matching interfaces"}
-        deleted = nb.dcim.interfaces.delete(records)
-        return {"deleted": deleted}
-    except RequestError as e:
+        return {"deleted": True, "count": count}
+    except NetboxRequestError as e:
         log.error(f"Filtered delete failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
         log.exception("Unexpected error during filtered delete")
         raise HTTPException(status_code=500, detail="Internal server error")
-
-
-@router.get("/choices", response_model=Dict[str, Any])
-def get_interface_choices():
-    """Get choices for interface fields (type, mode, etc.)."""
-    try:
-        nb = get_netbox_client()
-        return nb.dcim.interfaces.choices()
-    except Exception:
-        log.exception("Failed to fetch interface choices")
-        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
@@ -0,0 +1,37 @@
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from modules.netbox.logic.dcim import rack_rollup
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.routes.dcim.rack_rollup")
+
+# Mounted under /racks ahead of the CRUD router so '/rollup' is not taken as a rack ID
+router = APIRouter(tags=["dcim.racks"])
+
+
+@router.get("/rollup", response_model=Dict[str, Any])
+def get_rack_rollup(
+    site_id: Optional[int] = None,
+    by: str = Query("site", pattern="^(site|tenant)$", description="Aggregate per site or per occupying tenant"),
+    power: bool = Query(True, description="Include power draw from device power ports"),
+    refresh: bool = False,
+):
+    """Datacentre capacity report: free U, power, weight and tenant occupancy."""
+    try:
+        return rack_rollup.get_rollup_report(site_id=site_id, by=by, include_power=power, refresh=refresh)
+    except Exception:
+        log.exception("Rack rollup failed")
+        raise HTTPException(status_code=500, detail="Rack rollup failed")
+
+
+@router.get("/rollup/racks", response_model=List[Dict[str, Any]])
+def get_per_rack_rollup(site_id: Optional[int] = None, power: bool = True, refresh: bool = False):
+    """Per-rack occupancy bitmap, free U, largest free block, power and weight."""
+    try:
+        return rack_rollup.get_rack_rollups(site_id=site_id, include_power=power, refresh=refresh)
+    except Exception:
+        log.exception("Rack rollup failed")
+        raise HTTPException(status_code=500, detail="Rack rollup failed")
@@ -1,59 +1,83 @@
 
 from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query
-from pynetbox.core.query import RequestError
-from modules.netbox.client import get_netbox_client
+from fastapi import APIRouter, HTTPException, Query, Request
+from modules.netbox.async_client import NetboxRequestError, get_async_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices_async
+from modules.netbox.routes.utils import query_filters
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.routes.dcim.racks")
 
 router = APIRouter(tags=["dcim.racks"])
 
+ENDPOINT = "dcim.racks"
+
 
 @router.get("/", response_model=List[Dict[str, Any]])
-def list_racks(limit: int = 0, offset: Optional[int] = None):
+async def list_racks(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """Retrieve all racks."""
     try:
-        nb = get_netbox_client()
-        return [dict(r) for r in nb.dcim.racks.all(limit=limit, offset=offset)]
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        return await endpoint.all(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     except Exception:
         log.exception("Failed to list racks")
         raise HTTPException(status_code=500, detail="Unable to fetch racks")
 
 
 @router.get("/search", response_model=List[Dict[str, Any]])
-def search_racks(q: Optional[str] = None, **filters: Any):
+async def search_racks(
+    request: Request,
+    q: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """Filter racks using query or keyword arguments."""
     try:
-        nb = get_netbox_client()
-        results = nb.dcim.racks.filter(q, **filters) if q else nb.dcim.racks.filter(**filters)
-        return [dict(r) for r in results]
+        filters = query_filters(request, exclude={"q", "fields", "brief", "compact"})
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        args = (q,) if q else ()
+        return await endpoint.filter(*args, fields=fields, brief=brief, compact=compact, **filters)
     except Exception:
         log.exception("Failed to filter racks")
         raise HTTPException(status_code=500, detail="Rack filter failed")
 
 
 @router.get("/count", response_model=Dict[str, int])
-def count_racks(**filters: Any):
+async def count_racks(request: Request):
     """Count racks matching filters."""
     try:
-        nb = get_netbox_client()
-        return {"count": nb.dcim.racks.count(**filters)}
+        return {"count": await get_async_netbox_client().endpoint(ENDPOINT).count(**query_filters(request))}
     except Exception:
-        log.exception("Rack count failed")
+        log.exception("Count failed")
         raise HTTPException(status_code=500, detail="Count operation failed")
 
 
+@router.get("/choices", response_model=Dict[str, Any])
+async def get_rack_choices(refresh: bool = False):
+    """Get available rack field choices."""
+    try:
+        return await get_cached_choices_async(ENDPOINT, refresh=refresh)
+    except Exception:
+        log.exception("Failed to fetch rack choices")
+        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
+
+
 @router.get("/{rack_id}", response_model=Dict[str, Any])
-def get_rack_by_id(rack_id: int):
+async def get_rack_by_id(rack_id: int):
     """Fetch a single rack by ID."""
     try:
-        nb = get_netbox_client()
-        rack = nb.dcim.racks.get(rack_id)
+        rack = await get_async_netbox_client().endpoint(ENDPOINT).get(rack_id)
         if not rack:
             raise HTTPException(status_code=404, detail="Rack not found")
-        return dict(rack)
+        return rack
     except HTTPException:
         raise
     except Exception:
@@ -62,13 +86,11 @@ def get_rack_by_id(rack_id: int):
 
 
 @router.post("/", response_model=Union[Dict[str, Any], List[Dict[str, Any]]])
-def create_rack(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
+async def create_rack(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
     """Create one or more racks."""
     try:
-        nb = get_netbox_client()
-        result = nb.dcim.racks.create(payload)
-        return [dict(r) for r in result] if isinstance(result, list) else dict(result)
-    except RequestError as e:
+        return await get_async_netbox_client().endpoint(ENDPOINT).create(payload)
+    except NetboxRequestError as e:
         log.error(f"Rack creation failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
@@ -77,31 +99,29 @@ def create_rack(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
 
 
 @router.patch("/{rack_id}", response_model=Dict[str, bool])
-def update_rack(rack_id: int, updates: Dict[str, Any]):
+async def update_rack(rack_id: int, updates: Dict[str, Any]):
     """Update a single rack by ID."""
     try:
-        nb = get_netbox_client()
-        rack = nb.dcim.racks.get(rack_id)
-        if not rack:
+        await get_async_netbox_client().endpoint(ENDPOINT).patch(rack_id, updates)
+        return {"success": True}
+    except NetboxRequestError as e:
+        if e.status_code == 404:
             raise HTTPException(status_code=404, detail="Rack not found")
-        return {"success": rack.update(updates)}
-    except RequestError as e:
-        log.error(f"Rack update failed: {e.error}")
+        log.error(f"Update failed for rack {rack_id}: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
-        log.exception("Unexpected error during rack update")
+        log.exception("Unexpected error during update")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.delete("/", response_model=Dict[str, bool])
-def delete_racks_by_ids(ids: List[int] = Query(..., description="Rack IDs to delete")):
+async def delete_racks_by_ids(ids: List[int] = Query(..., description="List of rack IDs")):
     """Bulk delete racks by ID."""
     try:
-        nb = get_netbox_client()
-        deleted = nb.dcim.racks.delete(ids)
+        deleted = await get_async_netbox_client().endpoint(ENDPOINT).delete(ids)
         return {"deleted": deleted}
-    except RequestError as e:
-        log.error(f"Bulk rack delete failed: {e.error}")
+    except NetboxRequestError as e:
+        log.error(f"Bulk delete failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
         log.exception("Unexpected error during bulk delete")
@@ -109,29 +129,16 @@ def delete_racks_by_ids(ids: List[int] = Query(..., description="Rack IDs to del
 
 
 @router.delete("/filter", response_model=Dict[str, Any])
-def delete_racks_by_filter(**filters: Any):
+async def delete_racks_by_filter(request: Request):
     """Delete racks using filter criteria."""
     try:
-        nb = get_netbox_client()
-        records = list(nb.dcim.racks.filter(**filters))
-        if not records:
-            return {"deleted": False, "message": "No matching racks found"}
-        deleted = nb.dcim.racks.delete(records)
-        return {"deleted": deleted}
-    except RequestError as e:
-        log.error(f"Delete by filter failed: {e.error}")
+        count = await get_async_netbox_client().endpoint(ENDPOINT).delete_filtered(**query_filters(request))
+        if not count:
+            return {"deleted": False, "message": "No matching racks"}
+        return {"deleted": True, "count": count}
+    except NetboxRequestError as e:
+        log.error(f"Filtered delete failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
         log.exception("Unexpected error during filtered delete")
         raise HTTPException(status_code=500, detail="Internal server error")
-
-
-@router.get("/choices", response_model=Dict[str, Any])
-def get_rack_choices():
-    """Get available rack field choices."""
-    try:
-        nb = get_netbox_client()
-        return nb.dcim.racks.choices()
-    except Exception:
-        log.exception("Failed to retrieve rack choices")
-        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
@@ -0,0 +1,83 @@
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from modules.netbox.logic import graphql as gql_logic
+from modules.netbox.logic.graphql import GraphQLError
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.routes.graphql")
+
+router = APIRouter(tags=["graphql"])
+
+
+class GraphQLQuery(BaseModel):
+    query: str
+    variables: Optional[Dict[str, Any]] = None
+
+
+@router.post("/", response_model=Dict[str, Any])
+def run_query(payload: GraphQLQuery):
+    """Execute a raw GraphQL query against NetBox."""
+    try:
+        return gql_logic.execute_query(payload.query, payload.variables)
+    except GraphQLError as e:
+        raise HTTPException(status_code=400, detail=e.errors)
+    except Exception:
+        log.exception("GraphQL query failed")
+        raise HTTPException(status_code=500, detail="GraphQL query failed")
+
+
+@router.get("/devices/{device_id}", response_model=Dict[str, Any])
+def get_device_detail(device_id: int):
+    """Fetch a device with its rack, tenant, interfaces and IPs in one query."""
+    try:
+        device = gql_logic.get_device_detail(device_id)
+        if not device:
+            raise HTTPException(status_code=404, detail="Device not found")
+        return device
+    except HTTPException:
+        raise
+    except GraphQLError as e:
+        raise HTTPException(status_code=400, detail=e.errors)
+    except Exception:
+        log.exception(f"Failed to fetch device detail {device_id}")
+        raise HTTPException(status_code=500, detail="Error retrieving device detail")
+
+
+@router.get("/racks/{rack_id}", response_model=Dict[str, Any])
+def get_rack_inventory(rack_id: int):
+    """Fetch a rack with all mounted devices in one query."""
+    try:
+        rack = gql_logic.get_rack_inventory(rack_id)
+        if not rack:
+            raise HTTPException(status_code=404, detail="Rack not found")
+        return rack
+    except HTTPException:
+        raise
+    except GraphQLError as e:
+        raise HTTPException(status_code=400, detail=e.errors)
+    except Exception:
+        log.exception(f"Failed to fetch rack inventory {rack_id}")
+        raise HTTPException(status_code=500, detail="Error retrieving rack inventory")
+
+
+@router.get("/prefixes/utilisation", response_model=Dict[str, Any])
+def get_prefix_utilisation(prefix: str = Query(..., description="Prefix in CIDR notation")):
+    """Fetch a prefix with its children, IPs and utilisation in one query."""
+    try:
+        result = gql_logic.get_prefix_utilisation(prefix)
+        if not result:
+            raise HTTPException(status_code=404, detail="Prefix not found")
+        return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except GraphQLError as e:
+        raise HTTPException(status_code=400, detail=e.errors)
+    except Exception:
+        log.exception(f"Failed to fetch prefix utilisation for {prefix}")
+        raise HTTPException(status_code=500, detail="Error retrieving prefix utilisation")
@@ -1,73 +1,96 @@
 
 from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query
-from pynetbox.core.query import RequestError
-
-from modules.netbox.client import get_netbox_client
+from fastapi import APIRouter, HTTPException, Query, Request
+from modules.netbox.async_client import NetboxRequestError, get_async_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices_async
+from modules.netbox.routes.utils import query_filters
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.routes.ipam.prefixes")
 
 router = APIRouter(tags=["ipam.prefixes"])
 
+ENDPOINT = "ipam.prefixes"
+
 
 @router.get("/", response_model=List[Dict[str, Any]])
-def list_prefixes(limit: int = 0, offset: Optional[int] = None):
+async def list_prefixes(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """Retrieve all prefixes."""
     try:
-        nb = get_netbox_client()
-        return [dict(p) for p in nb.ipam.prefixes.all(limit=limit, offset=offset)]
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        return await endpoint.all(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
     except Exception:
         log.exception("Failed to list prefixes")
-        raise HTTPException(status_code=500, detail="Failed to list prefixes")
+        raise HTTPException(status_code=500, detail="Unable to fetch prefixes")
 
 
 @router.get("/search", response_model=List[Dict[str, Any]])
-def search_prefixes(q: Optional[str] = None, **filters: Any):
+async def search_prefixes(
+    request: Request,
+    q: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """Search or filter prefixes."""
     try:
-        nb = get_netbox_client()
-        results = nb.ipam.prefixes.filter(q, **filters) if q else nb.ipam.prefixes.filter(**filters)
-        return [dict(p) for p in results]
+        filters = query_filters(request, exclude={"q", "fields", "brief", "compact"})
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        args = (q,) if q else ()
+        return await endpoint.filter(*args, fields=fields, brief=brief, compact=compact, **filters)
     except Exception:
         log.exception("Failed to filter prefixes")
         raise HTTPException(status_code=500, detail="Prefix filter failed")
 
 
 @router.get("/count", response_model=Dict[str, int])
-def count_prefixes(**filters: Any):
+async def count_prefixes(request: Request):
     """Count matching prefixes."""
     try:
-        nb = get_netbox_client()
-        return {"count": nb.ipam.prefixes.count(**filters)}
+        return {"count": await get_async_netbox_client().endpoint(ENDPOINT).count(**query_filters(request))}
     except Exception:
-        log.exception("Failed to count prefixes")
+        log.exception("Count failed")
         raise HTTPException(status_code=500, detail="Count operation failed")
 
 
+@router.get("/choices", response_model=Dict[str, Any])
+async def get_prefix_choices(refresh: bool = False):
+    """Get choices for prefix fields."""
+    try:
+        return await get_cached_choices_async(ENDPOINT, refresh=refresh)
+    except Exception:
+        log.exception("Failed to fetch prefix choices")
+        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
+
+
 @router.get("/{prefix_id}", response_model=Dict[str, Any])
-def get_prefix(prefix_id: int):
+async def get_prefix(prefix_id: int):
     """Retrieve a single prefix by ID."""
     try:
-        nb = get_netbox_client()
-        prefix = nb.ipam.prefixes.get(prefix_id)
+        prefix = await get_async_netbox_client().endpoint(ENDPOINT).get(prefix_id)
         if not prefix:
             raise HTTPException(status_code=404, detail="Prefix not found")
-        return dict(prefix)
+        return prefix
+    except HTTPException:
+        raise
     except Exception:
-        log.exception(f"Failed to retrieve prefix {prefix_id}")
-        raise HTTPException(status_code=500, detail="Error fetching prefix")
+        log.exception(f"Failed to fetch prefix {prefix_id}")
+        raise HTTPException(status_code=500, detail="Error retrieving prefix")
 
 
 @router.post("/", response_model=Union[Dict[str, Any], List[Dict[str, Any]]])
-def create_prefix(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
+async def create_prefix(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
     """Create one or more prefixes."""
     try:
-        nb = get_netbox_client()
-        result = nb.ipam.prefixes.create(payload)
-        return [dict(p) for p in result] if isinstance(result, list) else dict(result)
-    except RequestError as e:
+        return await get_async_netbox_client().endpoint(ENDPOINT).create(payload)
+    except NetboxRequestError as e:
         log.error(f"Prefix creation failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
@@ -76,90 +99,77 @@ def create_prefix(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
 
 
 @router.patch("/{prefix_id}", response_model=Dict[str, bool])
-def patch_prefix(prefix_id: int, updates: Dict[str, Any]):
+async def patch_prefix(prefix_id: int, updates: Dict[str, Any]):
     """Patch an existing prefix by ID."""
     try:
-        nb = get_netbox_client()
-        prefix = nb.ipam.prefixes.get(prefix_id)
-        if not prefix:
+        await get_async_netbox_client().endpoint(ENDPOINT).patch(prefix_id, updates)
+        return {"success": True}
+    except NetboxRequestError as e:
+        if e.status_code == 404:
             raise HTTPException(status_code=404, detail="Prefix not found")
-        return {"success": prefix.update(updates)}
-    except RequestError as e:
-        log.error(f"Prefix update failed: {e.error}")
+        log.error(f"Update failed for prefix {prefix_id}: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
-        log.exception("Unexpected error during prefix update")
+        log.exception("Unexpected error during update")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.delete("/", response_model=Dict[str, Any])
-def delete_prefixes(ids: List[int] = Query(..., description="IDs of prefixes to delete")):
+@router.delete("/", response_model=Dict[str, bool])
+async def delete_prefixes(ids: List[int] = Query(..., description="List of prefix IDs")):
     """Delete one or more prefixes by ID."""
     try:
-        nb = get_netbox_client()
-        deleted = nb.ipam.prefixes.delete(ids)
+        deleted = await get_async_netbox_client().endpoint(ENDPOINT).delete(ids)
         return {"deleted": deleted}
-    except RequestError as e:
-        log.error(f"Prefix deletion failed: {e.error}")
+    except NetboxRequestError as e:
+        log.error(f"Bulk delete failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
-        log.exception("Unexpected error during prefix deletion")
+        log.exception("Unexpected error during bulk delete")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.delete("/filter", response_model=Dict[str, Any])
-def delete_prefixes_by_filter(**filters: Any):
+async def delete_prefixes_by_filter(request: Request):
     """Delete prefixes using filter criteria."""
     try:
-        nb = get_netbox_client()
-        records = list(nb.ipam.prefixes.filter(**filters))
-        if not records:
-            return {"deleted": False, "message": "No matching prefixes found"}
-        deleted = nb.ipam.prefixes.delete(records)
-        return {"deleted": deleted}
-    except RequestError as e:
-        log.error(f"Filtered prefix deletion failed: {e.error}")
+        count = await get_async_netbox_client().endpoint(ENDPOINT).delete_filtered(**query_filters(request))
+        if not count:
+            return {"deleted": False, "message": "No matching prefixes"}
+        return {"deleted": True, "count": count}
+    except NetboxRequestError as e:
+        log.error(f"Filtered delete failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
-        log.exception("Unexpected error during filtered prefix deletion")
+        log.exception("Unexpected error during filtered delete")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/choices", response_model=Dict[str, Any])
-def get_prefix_choices():
-    """Get choices for prefix fields."""
-    try:
-        nb = get_netbox_client()
-        return nb.ipam.prefixes.choices()
-    except Exception:
-        log.exception("Failed to retrieve prefix choices")
-        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
-
-
 @router.get("/{prefix_id}/available-ips", response_model=List[str])
-def get_available_ips(prefix_id: int):
+async def get_available_ips(prefix_id: int):
     """List available IPs inside a prefix."""
     try:
-        nb = get_netbox_client()
-        prefix = nb.ipam.prefixes.get(prefix_id)
-        if not prefix:
+        available = await get_async_netbox_client().endpoint(ENDPOINT).list_available(prefix_id, "available-ips")
+        return [ip["address"] for ip in available]
+    except NetboxRequestError as e:
+        if e.status_code == 404:
             raise HTTPException(status_code=404, detail="Prefix not found")
-        return [ip.address for ip in prefix.available_ips.list()]
+        log.error(f"Failed to fetch available IPs: {e.error}")
+        raise HTTPException(status_code=400, detail=e.error)
     except Exception:
         log.exception("Failed to fetch available IPs")
         raise HTTPException(status_code=500, detail="Unable to fetch available IPs")
 
 
 @router.post("/{prefix_id}/available-ips", response_model=List[Dict[str, Any]])
-def allocate_ips(prefix_id: int, count: int = 1):
+async def allocate_ips(prefix_id: int, count: int = 1):
     """Allocate one or more available IPs from a prefix."""
     try:
-        nb = get_netbox_client()
-        prefix = nb.ipam.prefixes.get(prefix_id)
-        if not prefix:
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        created = await endpoint.create_available(prefix_id, "available-ips", [{} for _ in range(count)])
+        return created if isinstance(created, list) else [created]
+    except NetboxRequestError as e:
+        if e.status_code == 404:
             raise HTTPException(status_code=404, detail="Prefix not found")
-        return [dict(ip) for ip in prefix.available_ips.create([{} for _ in range(count)])]
-    except RequestError as e:
         log.error(f"IP allocation failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
@@ -168,29 +178,30 @@ def allocate_ips(prefix_id: int, count: int = 1):
 
 
 @router.get("/{prefix_id}/available-child-prefixes", response_model=List[str])
-def get_child_prefixes(prefix_id: int):
+async def get_child_prefixes(prefix_id: int):
     """List available child prefixes within a parent prefix."""
     try:
-        nb = get_netbox_client()
-        prefix = nb.ipam.prefixes.get(prefix_id)
-        if not prefix:
+        available = await get_async_netbox_client().endpoint(ENDPOINT).list_available(prefix_id, "available-prefixes")
+        return [p["prefix"] for p in available]
+    except NetboxRequestError as e:
+        if e.status_code == 404:
             raise HTTPException(status_code=404, detail="Prefix not found")
-        return [p.prefix for p in prefix.available_prefixes.list()]
+        log.error(f"Failed to list child prefixes: {e.error}")
+        raise HTTPException(status_code=400, detail=e.error)
     except Exception:
         log.exception("Failed to list child prefixes")
         raise HTTPException(status_code=500, detail="Unable to list child prefixes")
 
 
 @router.post("/{prefix_id}/available-child-prefixes", response_model=Dict[str, Any])
-def create_child_prefix(prefix_id: int, prefix_length: int):
+async def create_child_prefix(prefix_id: int, prefix_length: int):
     """Create a new child prefix of specified length."""
     try:
-        nb = get_netbox_client()
-        prefix = nb.ipam.prefixes.get(prefix_id)
-        if not prefix:
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        return await endpoint.create_available(prefix_id, "available-prefixes", {"prefix_length": prefix_length})
+    except NetboxRequestError as e:
+        if e.status_code == 404:
             raise HTTPException(status_code=404, detail="Prefix not found")
-        return dict(prefix.available_prefixes.create({"prefix_length": prefix_length}))
-    except RequestError as e:
         log.error(f"Child prefix creation failed: {e.error}")
         raise HTTPException(status_code=400, detail=e.error)
     except Exception:
@@ -0,0 +1,48 @@
+
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import APIRouter, HTTPException, Query
+
+from modules.netbox.logic import metadata_cache
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.routes.metadata")
+
+router = APIRouter(tags=["metadata"])
+
+
+@router.get("/choices", response_model=List[str])
+def list_cached_choices():
+    """List endpoints with cached choices."""
+    return metadata_cache.get_choices_cache().keys()
+
+
+@router.get("/choices/{endpoint_path}", response_model=Dict[str, Any])
+def get_choices(endpoint_path: str, refresh: bool = False):
+    """Get cached choices for an endpoint (e.g. 'dcim.devices')."""
+    try:
+        return metadata_cache.get_cached_choices(endpoint_path, refresh=refresh)
+    except AttributeError:
+        raise HTTPException(status_code=404, detail=f"Unknown endpoint: {endpoint_path}")
+    except Exception:
+        log.exception(f"Failed to fetch choices for {endpoint_path}")
+        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
+
+
+@router.delete("/choices", response_model=Dict[str, int])
+def invalidate_choices(endpoint: Optional[str] = Query(None, description="Endpoint to invalidate; all if omitted")):
+    """Invalidate cached choices for one endpoint or all endpoints."""
+    return {"invalidated": metadata_cache.invalidate_choices(endpoint)}
+
+
+@router.post("/validate/{endpoint_path}", response_model=Dict[str, Any])
+def validate_payload(endpoint_path: str, payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
+    """Validate a create/update payload against cached choices without writing to NetBox."""
+    try:
+        errors = metadata_cache.validate_payload(endpoint_path, payload)
+        return {"valid": not errors, "errors": errors}
+    except AttributeError:
+        raise HTTPException(status_code=404, detail=f"Unknown endpoint: {endpoint_path}")
+    except Exception:
+        log.exception(f"Payload validation failed for {endpoint_path}")
+        raise HTTPException(status_code=500, detail="Validation failed")
@@ -0,0 +1,29 @@
+
+from typing import Any, Dict, List, Union
+
+from fastapi import APIRouter, HTTPException
+
+from modules.netbox.logic import reconcile as reconcile_logic
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.routes.reconcile")
+
+router = APIRouter(tags=["reconcile"])
+
+
+@router.post("/", response_model=List[Dict[str, Any]])
+def reconcile_desired_state(
+    payload: Union[Dict[str, Any], List[Dict[str, Any]]],
+    dry_run: bool = True,
+    batch_size: int = reconcile_logic.DEFAULT_BATCH_SIZE,
+    workers: int = reconcile_logic.DEFAULT_WORKERS,
+):
+    """Diff desired state against NetBox and apply the minimal changes (dry-run by default)."""
+    try:
+        specs = reconcile_logic.normalize_specs(payload)
+        return reconcile_logic.reconcile(specs, dry_run=dry_run, batch_size=batch_size, workers=workers)
+    except (ValueError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        log.exception("Reconciliation failed")
+        raise HTTPException(status_code=500, detail="Reconciliation failed")
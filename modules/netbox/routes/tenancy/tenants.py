@@ -1,113 +1,144 @@
 
 from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query
-from pynetbox.core.query import RequestError
-from pynetbox.core.response import Record
-
-from modules.netbox.client import get_netbox_client
+from fastapi import APIRouter, HTTPException, Query, Request
+from modules.netbox.async_client import NetboxRequestError, get_async_netbox_client
+from modules.netbox.logic.metadata_cache import get_cached_choices_async
+from modules.netbox.routes.utils import query_filters
 from homer.utils.logger import get_module_logger
 
 log = get_module_logger("netbox.routes.tenancy.tenants")
 
 router = APIRouter(tags=["tenancy.tenants"])
 
+ENDPOINT = "tenancy.tenants"
+
+
 @router.get("/", response_model=List[Dict[str, Any]])
-def list_tenants(limit: int = 0, offset: Optional[int] = None):
+async def list_tenants(
+    limit: int = 0,
+    offset: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """List all tenants."""
-    nb = get_netbox_client()
     try:
-        return [dict(t) for t in nb.tenancy.tenants.all(limit=limit, offset=offset)]
-    except Exception as e:
-        log.error(f"Failed to list tenants: {e}")
-        raise HTTPException(status_code=500, detail="Unable to list tenants")
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        return await endpoint.all(limit=limit, offset=offset, fields=fields, brief=brief, compact=compact)
+    except Exception:
+        log.exception("Failed to list tenants")
+        raise HTTPException(status_code=500, detail="Unable to fetch tenants")
 
 
 @router.get("/search", response_model=List[Dict[str, Any]])
-def search_tenants(q: Optional[str] = None, **filters):
+async def search_tenants(
+    request: Request,
+    q: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    brief: bool = False,
+    compact: bool = Query(False, description="Collapse nested objects to id/display refs"),
+):
     """Search or filter tenants."""
-    nb = get_netbox_client()
     try:
-        return [dict(t) for t in nb.tenancy.tenants.filter(q, **filters)]
-    except Exception as e:
-        log.error(f"Tenant filter failed: {e}")
+        filters = query_filters(request, exclude={"q", "fields", "brief", "compact"})
+        endpoint = get_async_netbox_client().endpoint(ENDPOINT)
+        args = (q,) if q else ()
+        return await endpoint.filter(*args, fields=fields, brief=brief, compact=compact, **filters)
+    except Exception:
+        log.exception("Failed to filter tenants")
         raise HTTPException(status_code=500, detail="Tenant filter failed")
 
 
-@router.get("/count")
-def count_tenants(**filters):
+@router.get("/count", response_model=Dict[str, int])
+async def count_tenants(request: Request):
     """Count tenants matching filters."""
-    nb = get_netbox_client()
     try:
-        return {"count": nb.tenancy.tenants.count(**filters)}
-    except Exception as e:
-        log.error(f"Count failed: {e}")
-        raise HTTPException(status_code=500, detail="Count failed")
+        return {"count": await get_async_netbox_client().endpoint(ENDPOINT).count(**query_filters(request))}
+    except Exception:
+        log.exception("Count failed")
+        raise HTTPException(status_code=500, detail="Count operation failed")
+
+
+@router.get("/choices", response_model=Dict[str, Any])
+async def get_tenant_choices(refresh: bool = False):
+    """Get tenant choice values."""
+    try:
+        return await get_cached_choices_async(ENDPOINT, refresh=refresh)
+    except Exception:
+        log.exception("Failed to fetch tenant choices")
+        raise HTTPException(status_code=500, detail="Unable to retrieve choices")
 
 
 @router.get("/{tenant_id}", response_model=Dict[str, Any])
-def get_tenant_by_id(tenant_id: int):
+async def get_tenant_by_id(tenant_id: int):
     """Get tenant by ID."""
-    nb = get_netbox_client()
-    tenant = nb.tenancy.tenants.get(tenant_id)
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-    return dict(tenant)
+    try:
+        tenant = await get_async_netbox_client().endpoint(ENDPOINT).get(tenant_id)
+        if not tenant:
+            raise HTTPException(status_code=404, detail="Tenant not found")
+        return tenant
+    except HTTPException:
+        raise
+    except Exception:
+        log.exception(f"Failed to fetch tenant {tenant_id}")
+        raise HTTPException(status_code=500, detail="Error retrieving tenant")
 
 
 @router.post("/", response_model=Union[Dict[str, Any], List[Dict[str, Any]]])
-def create_tenant(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
+async def create_tenant(payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
     """Create one or more tenants."""
-    nb = get_netbox_client()
     try:
-        result = nb.tenancy.tenants.create(payload)
-        return [dict(t) for t in result] if isinstance(result, list) else dict(result)
-    except RequestError as e:
+        return await get_async_netbox_client().endpoint(ENDPOINT).create(payload)
+    except NetboxRequestError as e:
         log.error(f"Tenant creation failed: {e.error}")
-        raise HTTPException(status_code=400, detail=str(e.error))
+        raise HTTPException(status_code=400, detail=e.error)
+    except Exception:
+        log.exception("Unexpected error during tenant creation")
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.patch("/{tenant_id}")
-def patch_tenant(tenant_id: int, updates: Dict[str, Any]):
+@router.patch("/{tenant_id}", response_model=Dict[str, bool])
+async def patch_tenant(tenant_id: int, updates: Dict[str, Any]):
     """Patch tenant by ID."""
-    nb = get_netbox_client()
-    tenant = nb.tenancy.tenants.get(tenant_id)
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
     try:
-        return {"success": tenant.update(updates)}
-    except RequestError as e:
-        log.error(f"Update failed: {e.error}")
-        raise HTTPException(status_code=400, detail=str(e.error))
-
-
-@router.delete("/", response_model=Dict[str, Any])
-def delete_tenants_by_ids(ids: List[int] = Query(...)):
+        await get_async_netbox_client().endpoint(ENDPOINT).patch(tenant_id, updates)
+        return {"success": True}
+    except NetboxRequestError as e:
+        if e.status_code == 404:
+            raise HTTPException(status_code=404, detail="Tenant not found")
+        log.error(f"Update failed for tenant {tenant_id}: {e.error}")
+        raise HTTPException(status_code=400, detail=e.error)
+    except Exception:
+        log.exception("Unexpected error during update")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.delete("/", response_model=Dict[str, bool])
+async def delete_tenants_by_ids(ids: List[int] = Query(..., description="List of tenant IDs")):
     """Delete tenants by ID list."""
-    nb = get_netbox_client()
     try:
-        return {"deleted": nb.tenancy.tenants.delete(ids)}
-    except RequestError as e:
-        log.error(f"Deletion failed: {e.error}")
-        raise HTTPException(status_code=400, detail=str(e.error))
-
-
-@router.delete("/filter")
-def delete_tenants_by_filter(**filters):
+        deleted = await get_async_netbox_client().endpoint(ENDPOINT).delete(ids)
+        return {"deleted": deleted}
+    except NetboxRequestError as e:
+        log.error(f"Bulk delete failed: {e.error}")
+        raise HTTPException(status_code=400, detail=e.error)
+    except Exception:
+        log.exception("Unexpected error during bulk delete")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.delete("/filter", response_model=Dict[str, Any])
+async def delete_tenants_by_filter(request: Request):
     """Delete tenants matching filters."""
-    nb = get_netbox_client()
-    tenants = list(nb.tenancy.tenants.filter(**filters))
-    if not tenants:
-        return {"deleted": False, "message": "No matching tenants"}
     try:
-        return {"deleted": nb.tenancy.tenants.delete(tenants)}
-    except RequestError as e:
-        log.error(f"Filter-based deletion failed: {e.error}")
-        raise HTTPException(status_code=400, detail=str(e.error))
-
-
-@router.get("/choices", response_model=Dict[str, Any])
-def get_tenant_choices():
-    """Get tenant choice values."""
-    nb = get_netbox_client()
-    return nb.tenancy.tenants.choices()
+        count = await get_async_netbox_client().endpoint(ENDPOINT).delete_filtered(**query_filters(request))
+        if not count:
+            return {"deleted": False, "message": "No matching tenants"}
+        return {"deleted": True, "count": count}
+    except NetboxRequestError as e:
+        log.error(f"Filtered delete failed: {e.error}")
+        raise HTTPException(status_code=400, detail=e.error)
+    except Exception:
+        log.exception("Unexpected error during filtered delete")
+        raise HTTPException(status_code=500, detail="Internal server error")
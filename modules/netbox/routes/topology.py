@@ -0,0 +1,76 @@
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from modules.netbox.logic import topology as topology_logic
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.routes.topology")
+
+router = APIRouter(tags=["topology"])
+
+
+@router.get("/stats", response_model=Dict[str, Any])
+def topology_stats():
+    """Size and load time of the cable topology index."""
+    try:
+        return topology_logic.get_topology_index().stats()
+    except Exception:
+        log.exception("Failed to load topology index")
+        raise HTTPException(status_code=500, detail="Unable to load topology")
+
+
+@router.post("/refresh", response_model=Dict[str, Any])
+def refresh_topology():
+    """Reload the topology index from NetBox."""
+    try:
+        return topology_logic.get_topology_index(refresh=True).stats()
+    except Exception:
+        log.exception("Failed to reload topology index")
+        raise HTTPException(status_code=500, detail="Unable to reload topology")
+
+
+@router.get("/trace/{kind}/{port_id}", response_model=List[List[Dict[str, Any]]])
+def trace_port(kind: str, port_id: int):
+    """Trace a port (interface, frontport, rearport, ...) end-to-end through patch panels."""
+    try:
+        return topology_logic.get_topology_index().trace(kind, port_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except Exception:
+        log.exception(f"Trace failed for {kind} {port_id}")
+        raise HTTPException(status_code=500, detail="Trace failed")
+
+
+@router.get("/interfaces/{interface_id}/trace", response_model=List[List[Dict[str, Any]]])
+def trace_interface(interface_id: int):
+    """Trace what an interface is patched to, end-to-end."""
+    return trace_port("interface", interface_id)
+
+
+@router.get("/devices/{device_id}/neighbours", response_model=List[Dict[str, Any]])
+def device_neighbours(device_id: int):
+    """Devices directly connected to a device (through any patch panels)."""
+    try:
+        return topology_logic.get_topology_index().neighbours(device_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except Exception:
+        log.exception(f"Neighbour lookup failed for device {device_id}")
+        raise HTTPException(status_code=500, detail="Neighbour lookup failed")
+
+
+@router.get("/devices/{device_id}/blast-radius", response_model=Dict[str, Any])
+def device_blast_radius(
+    device_id: int,
+    roots: Optional[List[int]] = Query(None, description="Device IDs that define 'connected' (e.g. core switches)"),
+):
+    """Devices that lose connectivity if this device fails."""
+    try:
+        return topology_logic.get_topology_index().blast_radius(device_id, roots=roots)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except Exception:
+        log.exception(f"Blast radius failed for device {device_id}")
+        raise HTTPException(status_code=500, detail="Blast radius failed")
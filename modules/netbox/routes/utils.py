@@ -0,0 +1,22 @@
+
+from typing import Any, Dict, Iterable
+
+from fastapi import Request
+
+
+def query_filters(request: Request, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """Collect NetBox filter parameters from the query string.
+
+    Repeated keys (e.g. `?site=a&site=b`) are kept as lists, as NetBox expects.
+    """
+    skip = set(exclude)
+    filters: Dict[str, Any] = {}
+    for key, value in request.query_params.multi_items():
+        if key in skip:
+            continue
+        if key in filters:
+            existing = filters[key]
+            filters[key] = existing + [value] if isinstance(existing, list) else [existing, value]
+        else:
+            filters[key] = value
+    return filters
@@ -0,0 +1,50 @@
+
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+
+from modules.netbox.logic import webhooks
+from homer.utils.logger import get_module_logger
+
+log = get_module_logger("netbox.routes.webhook")
+
+router = APIRouter(tags=["webhook"])
+
+
+@router.post("/netbox", response_model=Dict[str, Any])
+async def netbox_webhook(request: Request, x_hook_signature: Optional[str] = Header(None)):
+    """Receive a NetBox object-change webhook and apply it to local caches and indexes."""
+    secret = webhooks.get_webhook_secret()
+    if not secret:
+        log.error("❌ NETBOX_WEBHOOK_SECRET is not set; refusing NetBox webhook")
+        raise HTTPException(status_code=503, detail="NetBox webhook secret not configured")
+
+    # 🛡️ The signature covers the raw body, so verify before parsing
+    body = await request.body()
+    if not webhooks.verify_signature(body, x_hook_signature, secret):
+        log.warning("🚨 NetBox webhook with missing or invalid signature")
+        raise HTTPException(status_code=403, detail="Invalid signature")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body is not valid JSON")
+
+    delivery_id = webhooks.delivery_key(payload, body)
+    if not webhooks.remember_delivery(delivery_id):
+        log.warning(f"🚨 Duplicate NetBox delivery: {delivery_id}")
+        return {"status": "duplicate", "delivery_id": delivery_id}
+
+    change = webhooks.parse_change(payload)
+    log.info(f"📦 NetBox webhook: {change['event']} {change['endpoint']}#{change['id']}")
+    hooks = webhooks.dispatch_change(change)
+
+    return {
+        "status": "accepted",
+        "event": change["event"],
+        "endpoint": change["endpoint"],
+        "id": change["id"],
+        "hooks": hooks,
+        "delivery_id": delivery_id,
+    }